@@ -21,6 +21,15 @@ Sample usage:
         grammar = ":example",
         testdata = ":testdata/example.textproto",
     )
+
+The rewrites of large textproto tests can be checked in parallel, and sharded,
+by the Python runner of //nisaba/scripts/utils:textproto_runner instead:
+
+    py_grm_textproto_test(
+        name = "example_test",
+        grammar = ":example",
+        shard_count = 4,
+    )
 """
 
 load("//third_party/bazel_rules/rules_cc/cc:cc_test.bzl", "cc_test")
@@ -114,3 +123,63 @@ def grm_textproto_test(
         ] + extra_deps,
         **kwds
     )
+
+def py_grm_textproto_test(
+        name,
+        grammar = None,
+        textproto = None,
+        token_type = "byte",
+        size = "small",
+        mode = "exact",
+        num_workers = None,
+        **kwds):
+    """Generates a textproto test for the specified grammar, run from Python.
+
+    The test has the same arguments and checks as `grm_textproto_test`, but the
+    rewrites are checked by a pool of worker processes, and split between the
+    shards of the test if `shard_count` is set. A report of the time spent on
+    each list of rules is printed to the test log.
+
+    Args:
+       name: The BUILD rule name. (Ordinarily this has the _test suffix.)
+       grammar: The rule defining the compiled grammar. If not specified,
+          {current_package}:{name} is used.
+      textproto: The test textproto. If not specified,
+          testdata:{name}.textproto is used.
+      size: Blaze test size.
+      mode: The rewrite mode (one of: "exact", "subset", "top", "one_top").
+      token_type: Token type (one of: "byte", "utf8").
+      num_workers: Number of the worker processes of the test. By default, the
+          number of cores, at most four; see `parallel.NumWorkers`.
+      **kwds: Attributes passed to the underlying py_test rule.
+    """
+    basename = name[:-5] if name.endswith("_test") else name
+    far_path, far_target = _GetFarParams(basename, grammar)
+    textproto_path, textproto_target = _GetTextprotoParams(basename, textproto)
+
+    args = [
+        "--far_path=" + far_path,
+        "--textproto_path=" + textproto_path,
+        "--token_type=" + token_type,
+        "--mode=" + mode,
+    ]
+    if num_workers != None:
+        args.append("--num_workers=%d" % num_workers)
+
+    # The runner is shared by all the tests, from its common location.
+    runner = "//nisaba/scripts/utils:textproto_runner.py"
+    native.py_test(
+        name = name,
+        size = size,
+        srcs = [runner],
+        main = runner,
+        python_version = "PY3",
+        srcs_version = "PY3",
+        args = args,
+        data = [
+            far_target,
+            textproto_target,
+        ],
+        deps = ["//nisaba/scripts/utils:textproto_runner_lib"],
+        **kwds
+    )
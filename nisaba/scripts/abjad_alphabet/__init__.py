@@ -17,10 +17,12 @@
 # TODO: This library currently only supports `byte` tokens. Consider
 # supporting `utf8` tokens too.
 
-import functools
+from collections.abc import Iterable
+from concurrent import futures
 import pathlib
 import re
 import string
+from typing import Union
 
 import pynini
 from nisaba.scripts.abjad_alphabet import util as u
@@ -34,28 +36,87 @@ class _FarStore(object):
   This class is intended to be used as a singleton instance (_FARS).
   FAR files are loaded only when first accessed via the corresponding property
   (e.g., _FARS.nfc). Subsequent accesses use the cached instance, preventing
-  redundant FAR file loading.
+  redundant FAR file loading. Accesses from concurrent threads are safe: each
+  FAR file is still loaded only once.
   """
 
-  @functools.cached_property
+  def __init__(self) -> None:
+    self._fars = far.SingleFlight()
+
+  def _Far(self, name: str) -> far.Far:
+    # A single Far object per archive, even under concurrent threads.
+    return self._fars.Get(name, lambda: far.Far(u.FAR_DIR / f'{name}.far'))
+
+  @property
   def reversible_roman(self) -> far.Far:
-    return far.Far(u.FAR_DIR / 'reversible_roman.far')
+    return self._Far('reversible_roman')
 
-  @functools.cached_property
+  @property
   def nfc(self) -> far.Far:
-    return far.Far(u.FAR_DIR / 'nfc.far')
+    return self._Far('nfc')
 
-  @functools.cached_property
+  @property
   def reading_norm(self) -> far.Far:
-    return far.Far(u.FAR_DIR / 'reading_norm.far')
+    return self._Far('reading_norm')
 
-  @functools.cached_property
+  @property
   def visual_norm(self) -> far.Far:
-    return far.Far(u.FAR_DIR / 'visual_norm.far')
+    return self._Far('visual_norm')
+
+  def Preload(self, tags: Iterable[str], rules: Iterable[str],
+              sequential_rules: bool = False) -> list[far.LoadTime]:
+    """Loads the rules of the tags from the listed FARs; see `Preload`."""
+    tags = [tag.upper() for tag in tags]
+    times = []
+    for far_name in rules:
+      if far_name == 'reversible_roman':
+        rule_names = ['TO_ARAB']
+      elif far_name == 'nfc':
+        rule_names = ['ARAB']
+      elif far_name in ('reading_norm', 'visual_norm'):
+        rule_names = tags
+      else:
+        raise ValueError(f'Unknown FAR: {far_name}')
+      # Not all the tags have all the rules.
+      times.extend(getattr(self, far_name).Preload(
+          rule_names, sequential_rules, skip_missing=True))
+    return times
 
 
 _FARS = _FarStore()
 
+# FARs of the rules returned by the functions below.
+PRELOAD_FARS = ('reversible_roman', 'nfc', 'reading_norm', 'visual_norm')
+
+
+def Preload(
+    tags: Iterable[str] = u.LANGS,
+    rules: Iterable[str] = PRELOAD_FARS,
+    sequential_rules: bool = False,
+    background: bool = False,
+) -> Union[list[far.LoadTime], futures.Future]:
+  """Loads the rules ahead of their first use, such as at server startup.
+
+  Otherwise, the FARs and the rules are loaded on their first use, whose
+  latency then includes the loading time.
+
+  Args:
+    tags: Language or script tags of the rules to be loaded.
+    rules: FARs of the rules to be loaded, out of `PRELOAD_FARS`.
+    sequential_rules: Whether to also prepare the rules for the left-to-right
+      application used by `Normalizer`.
+    background: Whether to load the rules on a background thread.
+
+  Returns:
+    The time taken to load each FAR and rule. If loading in the background,
+    a future of these times instead.
+  """
+  tags = list(tags)
+  rules = list(rules)
+  if background:
+    return far.RunInBackground(_FARS.Preload, tags, rules, sequential_rules)
+  return _FARS.Preload(tags, rules, sequential_rules)
+
 
 def ToReversibleRoman() -> far.Far.FstWrapper:
   fst = u.open_fst_from_far('reversible_roman', 'FROM_ARAB', 'byte')
@@ -88,8 +149,10 @@ class Normalizer(object):
 
   def __init__(self, tag: str = 'ur', ignore: str = string.whitespace) -> None:
     try:
-      self._nfc = Nfc()
-      self._visual_norm = VisualNorm(tag)
+      # Both FSTs are functional, so they are applied by a left-to-right walk
+      # instead of composing each word with them.
+      self._nfc = _FARS.nfc.SequentialFst('ARAB')
+      self._visual_norm = _FARS.visual_norm.SequentialFst(tag.upper())
     except KeyError as error:
       raise TagError(f'Unsupported language/script: {tag}') from error
     else:
@@ -100,5 +163,22 @@ class Normalizer(object):
     return self._visual_norm.ApplyOnText(self._nfc.ApplyOnText(word))
 
   def ApplyOnText(self, line: str) -> str:
-    """Normalize a line formed of words."""
-    return self.accept_pat.sub(lambda m: self.ApplyOnWord(m.group(0)), line)
+    """Normalize a line formed of words.
+
+    All the words of the line are normalized together as a batch, where each
+    distinct word is normalized only once. As with `ApplyOnWord`, the first
+    word in the line that cannot be normalized raises the error.
+
+    Args:
+      line: Line of words separated by the ignored characters.
+
+    Returns:
+      The line with each of its words normalized.
+    """
+    words = list(dict.fromkeys(self.accept_pat.findall(line)))
+    norm_words = {}
+    for word, nfc_word in zip(words, self._nfc.ApplyOnTexts(words)):
+      if isinstance(nfc_word, far.FstInputError):
+        raise nfc_word
+      norm_words[word] = self._visual_norm.ApplyOnText(nfc_word)
+    return self.accept_pat.sub(lambda m: norm_words[m.group(0)], line)
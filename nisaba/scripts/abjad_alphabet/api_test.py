@@ -40,6 +40,11 @@ class ApiTest(absltest.TestCase):
   def testNormalizingAcceptor_ApplyOnText(self):
     self.assertEqual('آپ آپ\n', self._normalizer.ApplyOnText('آ​پ آپ\n'))
 
+  def testPreload(self):
+    times = api.Preload(['ur'], ['nfc', 'visual_norm'])
+    self.assertEqual([None, 'ARAB', None, 'UR'],
+                     [load_time.rule for load_time in times])
+
   def testNormalizer_TagError(self):
     with self.assertRaises(api.TagError):
       api.Normalizer('zz')  # Invalid tag.
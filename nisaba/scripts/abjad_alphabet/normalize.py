@@ -0,0 +1,63 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Normalizes a text file with `abjad_alphabet.Normalizer`.
+
+The lines are normalized in blocks over a pool of worker processes and are
+written in their input order.
+
+```sh
+bazel-bin/nisaba/scripts/abjad_alphabet/normalize \
+  --tag=ur --policy=passthrough < input.txt > output.txt
+```
+"""
+
+from collections.abc import Sequence
+
+from absl import app
+from absl import flags
+from absl import logging
+from nisaba.scripts import abjad_alphabet
+from nisaba.scripts.utils import normalize_stream
+
+_INPUT = flags.DEFINE_string(
+    'input', '-', 'Input text file, or `-` for the standard input.')
+_OUTPUT = flags.DEFINE_string(
+    'output', '-', 'Output text file, or `-` for the standard output.')
+_TAG = flags.DEFINE_string('tag', 'ur', 'Language or script tag.')
+_POLICY = flags.DEFINE_enum(
+    'policy', 'reject', normalize_stream.POLICIES,
+    'Handling of the ill-formed words: fail on the first one, remove them from '
+    'their lines, or keep them as they are.')
+_NUM_WORKERS = flags.DEFINE_integer(
+    'num_workers', None, 'Number of worker processes; all the cores if unset.')
+_BLOCK_SIZE = flags.DEFINE_integer(
+    'block_size', 1000, 'Number of lines sent to a worker at once.')
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  stats = normalize_stream.NormalizeFile(
+      abjad_alphabet.Normalizer, (_TAG.value,), _INPUT.value,
+      _OUTPUT.value, _POLICY.value, _NUM_WORKERS.value, _BLOCK_SIZE.value)
+  logging.info(
+      'Normalized %d lines (%d words, %d ill-formed) in %.2fs: '
+      '%.0f lines/sec, %.0f words/sec.', stats.lines, stats.words,
+      stats.ill_formed_words, stats.seconds, stats.lines_per_second,
+      stats.words_per_second)
+
+
+if __name__ == '__main__':
+  app.run(main)
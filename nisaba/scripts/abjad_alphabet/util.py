@@ -33,6 +33,10 @@ LANGS = ('ar', 'azb', 'bal', 'ckb', 'fa', 'ks', 'ms', 'pa', 'prs', 'ps', 'sd',
 def sigma_from_common_data_files() -> pynini.Fst:
   """Computes sigma from any abjad / alphabet romanizer.
 
+  The characters of the data files and the FSA of each token type are memoized
+  by `derive_chars` and `derive_sigma`, so the sigma is built once per token
+  type by the generators.
+
   Returns:
     pynini.Fst: An unweighted FSA that accepts this finite sigma language.
   """
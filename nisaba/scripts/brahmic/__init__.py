@@ -14,10 +14,12 @@
 
 """Python APIs for Brahmic grammars."""
 
-import functools
+from collections.abc import Iterable
+from concurrent import futures
 import pathlib
 import re
 import string
+from typing import Union
 
 import pynini
 from nisaba.scripts.brahmic import util as u
@@ -36,31 +38,88 @@ class _FarStore(object):
   This class is intended to be used as a singleton instance (_FARS).
   FAR files are loaded only when first accessed via the corresponding property
   (e.g., _FARS.iso) or method (e.g., _FARS.Natural('lang')). Subsequent accesses
-  use the cached instance, preventing redundant FAR file loading.
+  use the cached instance, preventing redundant FAR file loading. Accesses from
+  concurrent threads are safe: each FAR file is still loaded only once.
   """
 
   def __init__(self) -> None:
     self._natural = {}
+    self._fars = far.SingleFlight()
 
-  @functools.cached_property
+  def _Far(self, name: str) -> far.Far:
+    # A single Far object per archive, even under concurrent threads.
+    return self._fars.Get(name, lambda: far.Far(u.FAR_DIR / f'{name}.far'))
+
+  @property
   def iso(self) -> far.Far:
-    return far.Far(u.FAR_DIR / 'iso.far')
+    return self._Far('iso')
 
-  @functools.cached_property
+  @property
   def nfc(self) -> far.Far:
-    return far.Far(u.FAR_DIR / 'nfc.far')
+    return self._Far('nfc')
 
-  @functools.cached_property
+  @property
   def visual_norm(self) -> far.Far:
-    return far.Far(u.FAR_DIR / 'visual_norm.far')
+    return self._Far('visual_norm')
 
-  @functools.cached_property
+  @property
   def wellformed(self) -> far.Far:
-    return far.Far(u.FAR_DIR / 'wellformed.far')
+    return self._Far('wellformed')
+
+  def Preload(self, scripts: Iterable[str], rules: Iterable[str],
+              sequential_rules: bool = False) -> list[far.LoadTime]:
+    """Loads the rules of the scripts from the listed FARs; see `Preload`."""
+    scripts = [script.upper() for script in scripts]
+    times = []
+    for far_name in rules:
+      if far_name == 'iso':
+        rule_names = ['FROM_BRAHMIC'] + [f'TO_{script}' for script in scripts]
+      elif far_name == 'nfc':
+        rule_names = ['BRAHMIC']
+      elif far_name in ('visual_norm', 'wellformed'):
+        rule_names = scripts
+      else:
+        raise ValueError(f'Unknown FAR: {far_name}')
+      # Not all the scripts have all the rules.
+      times.extend(getattr(self, far_name).Preload(
+          rule_names, sequential_rules, skip_missing=True))
+    return times
 
 
 _FARS = _FarStore()
 
+# FARs of the rules returned by the functions below.
+PRELOAD_FARS = ('iso', 'nfc', 'visual_norm', 'wellformed')
+
+
+def Preload(
+    scripts: Iterable[str] = SCRIPTS,
+    rules: Iterable[str] = PRELOAD_FARS,
+    sequential_rules: bool = False,
+    background: bool = False,
+) -> Union[list[far.LoadTime], futures.Future]:
+  """Loads the rules ahead of their first use, such as at server startup.
+
+  Otherwise, the FARs and the rules are loaded on their first use, whose
+  latency then includes the loading time.
+
+  Args:
+    scripts: ISO 15924 script tags of the rules to be loaded.
+    rules: FARs of the rules to be loaded, out of `PRELOAD_FARS`.
+    sequential_rules: Whether to also prepare the rules for the left-to-right
+      application used by `NormalizingAcceptor`.
+    background: Whether to load the rules on a background thread.
+
+  Returns:
+    The time taken to load each FAR and rule. If loading in the background,
+    a future of these times instead.
+  """
+  scripts = list(scripts)
+  rules = list(rules)
+  if background:
+    return far.RunInBackground(_FARS.Preload, scripts, rules, sequential_rules)
+  return _FARS.Preload(scripts, rules, sequential_rules)
+
 
 def ToIso() -> far.Far.FstWrapper:
   return _FARS.iso.Fst('FROM_BRAHMIC')
@@ -95,8 +154,10 @@ class NormalizingAcceptor(object):
 
   def __init__(self, script: str, ignore: str = string.whitespace) -> None:
     try:
-      self._visual_norm = VisualNorm(script)
-      self._wellformed = WellFormed(script)
+      # Both FSTs are functional, so the words are normalized and accepted by
+      # a left-to-right walk instead of composing each word with them.
+      self._visual_norm = _FARS.visual_norm.SequentialFst(script.upper())
+      self._wellformed = _FARS.wellformed.SequentialFst(script.upper())
     except KeyError as e:
       raise ScriptError('Unsupported language script: {}'.format(e)) from e
     else:
@@ -110,5 +171,24 @@ class NormalizingAcceptor(object):
     return norm_word
 
   def ApplyOnText(self, line: str) -> str:
-    """Normalize or reject a line of formed of words."""
-    return self.accept_pat.sub(lambda m: self.ApplyOnWord(m.group(0)), line)
+    """Normalize or reject a line of formed of words.
+
+    All the words of the line are normalized together as a batch, where each
+    distinct word is normalized only once. As with `ApplyOnWord`, the first
+    word in the line that cannot be normalized raises the error.
+
+    Args:
+      line: Line of words separated by the ignored characters.
+
+    Returns:
+      The line with each of its words normalized.
+    """
+    words = list(dict.fromkeys(self.accept_pat.findall(line)))
+    norm_words = {}
+    for word, norm_word in zip(words, self._visual_norm.ApplyOnTexts(words)):
+      if isinstance(norm_word, far.FstInputError):
+        raise norm_word
+      if not self._wellformed.AcceptText(norm_word):
+        raise IllFormedError
+      norm_words[word] = norm_word
+    return self.accept_pat.sub(lambda m: norm_words[m.group(0)], line)
@@ -74,6 +74,15 @@ class BrahmicTest(absltest.TestCase):
       # Unacceptable ascii punctuations
       self._norm_acceptor_deva.ApplyOnText('एेरावत, एेरावत:\n')
 
+  def testPreload(self):
+    times = brahmic.Preload(['Deva'], ['iso', 'wellformed'],
+                            background=True).result()
+    self.assertEqual(
+        [None, 'FROM_BRAHMIC', 'TO_DEVA', None, 'DEVA'],
+        [load_time.rule for load_time in times])
+    with self.assertRaises(ValueError):
+      brahmic.Preload(['Deva'], ['xyzz'])
+
   def testNormalizingAcceptor_ScriptError(self):
     with self.assertRaises(brahmic.ScriptError):
       brahmic.NormalizingAcceptor('Xyzz')  # Invalid script tag.
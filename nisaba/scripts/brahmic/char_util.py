@@ -15,7 +15,7 @@
 """Acyclic acceptor accepting characters from Brahmic scripts."""
 
 from collections.abc import Iterable
-
+import pathlib
 import unicodedata
 
 import pynini
@@ -25,26 +25,26 @@ import nisaba.scripts.utils.char as uc
 import nisaba.scripts.utils.rewrite as ur
 
 
+_INPUT_SIDE_FILES = (
+    "accept", "coda", "consonant", "dead_consonant", "standalone",
+    "subjoined_consonant", "virama", "vowel", "vowel_length_sign", "vowel_sign",
+)
+_BOTH_SIDES_FILES = ("nfc", "reading_norm", "visual_rewrite")
+
+
+def script_chars_files(script: str) -> list[pathlib.Path]:
+  """Returns the files of the characters in a script."""
+  return [u.SCRIPT_DIR / script / f"{name}.tsv"
+          for name in _INPUT_SIDE_FILES + _BOTH_SIDES_FILES]
+
+
 def script_chars(script: str) -> set[str]:
   """Creates the set of characters in a script."""
   return uc.derive_chars(
-      input_side=[
-          u.SCRIPT_DIR / script / "accept.tsv",
-          u.SCRIPT_DIR / script / "coda.tsv",
-          u.SCRIPT_DIR / script / "consonant.tsv",
-          u.SCRIPT_DIR / script / "dead_consonant.tsv",
-          u.SCRIPT_DIR / script / "standalone.tsv",
-          u.SCRIPT_DIR / script / "subjoined_consonant.tsv",
-          u.SCRIPT_DIR / script / "virama.tsv",
-          u.SCRIPT_DIR / script / "vowel.tsv",
-          u.SCRIPT_DIR / script / "vowel_length_sign.tsv",
-          u.SCRIPT_DIR / script / "vowel_sign.tsv",
-      ],
-      both_sides=[
-          u.SCRIPT_DIR / script / "nfc.tsv",
-          u.SCRIPT_DIR / script / "reading_norm.tsv",
-          u.SCRIPT_DIR / script / "visual_rewrite.tsv",
-      ])
+      input_side=[u.SCRIPT_DIR / script / f"{name}.tsv"
+                  for name in _INPUT_SIDE_FILES],
+      both_sides=[u.SCRIPT_DIR / script / f"{name}.tsv"
+                  for name in _BOTH_SIDES_FILES])
 
 
 def consonants(script: str) -> set[str]:
@@ -44,15 +44,20 @@ bazel-bin/nisaba/interim/grm2/thrax/rewrite-tester \
 ```
 """
 
+import functools
 import os
 
 import pynini as p
 from pynini.export import multi_grm
 from pynini.lib import pynutil as pu
 from nisaba.scripts.brahmic import util as u
+from nisaba.scripts.utils import build_cache
 from nisaba.scripts.utils import file as f
+from nisaba.scripts.utils import parallel
 from nisaba.scripts.utils import rewrite as rw
 
+_TOKEN_TYPES = ('byte', 'utf8')
+
 
 def brahmic_to_iso(
     consonant_file: os.PathLike[str],
@@ -139,9 +144,9 @@ def brahmic_to_iso(
   return p.optimize(convert_to_iso.star)
 
 
-def _script_fsts(script: str, token_type: str) -> tuple[p.Fst, p.Fst]:
-  """Creates FSTs to convert between script and ISO."""
-  from_script = brahmic_to_iso(
+def _script_files(script: str) -> list[os.PathLike[str]]:
+  """Returns the files of the script, in the order of `brahmic_to_iso`."""
+  return [
       u.SCRIPT_DIR / script / 'consonant.tsv',
       u.SCRIPT_DIR / script / 'inherent_vowel.tsv',
       u.SCRIPT_DIR / script / 'vowel_sign.tsv',
@@ -152,7 +157,12 @@ def _script_fsts(script: str, token_type: str) -> tuple[p.Fst, p.Fst]:
       u.SCRIPT_DIR / script / 'standalone.tsv',
       u.SCRIPT_DIR / script / 'subjoined_consonant.tsv',
       u.SCRIPT_DIR / script / 'virama.tsv',
-  )
+  ]
+
+
+def _script_fsts(script: str, token_type: str) -> tuple[p.Fst, p.Fst]:
+  """Creates FSTs to convert between script and ISO."""
+  from_script = brahmic_to_iso(*_script_files(script))
   to_script = p.invert(from_script)
 
   # TODO: Ideally, this should be Visual-Normalized with NFC. However,
@@ -171,27 +181,79 @@ def _script_fsts(script: str, token_type: str) -> tuple[p.Fst, p.Fst]:
   return (from_nfced_script, to_nfced_script)
 
 
+def _from_brahmic(token_type: str) -> p.Fst:
+  """Creates the FST to convert any of the scripts to ISO."""
+  from_script_fsts = [_script_fsts(script, token_type)[0]
+                      for script in u.SCRIPTS]
+  sigma_fsts = [u.OpenSigma(script, token_type) for script in u.SCRIPTS]
+  return rw.Rewrite(
+      p.union(*from_script_fsts).optimize(),
+      sigma=p.union(*sigma_fsts).optimize()
+  )
+
+
+def _common_files(token_type: str) -> list[os.PathLike[str]]:
+  """Returns the files all the FSTs of the token type are built from."""
+  return [
+      u.SCRIPT_DIR / 'symbol.tsv',
+      f.FarPath(u.FAR_DIR, 'nfc', token_type),
+      f.FarPath(u.FAR_DIR, 'sigma', token_type),
+  ]
+
+
+def _build_script(task: tuple[str, str]) -> tuple[p.Fst, p.Fst]:
+  """Builds the FSTs of a script and token type in a worker process."""
+  script, token_type = task
+  with p.default_token_type(token_type):
+    return build_cache.CachedFsts(
+        functools.partial(_script_fsts, script, token_type),
+        ('brahmic.iso', script, token_type),
+        _script_files(script) + _common_files(token_type))
+
+
+def _build_from_brahmic(token_type: str) -> p.Fst:
+  """Builds the FST converting all the scripts in a worker process.
+
+  The FSTs of the scripts are built again in the worker, as they are much
+  faster to build than their union, and sending them to the worker would
+  pickle them.
+
+  Args:
+    token_type: Token type of the FST.
+
+  Returns:
+    FROM_BRAHMIC FST.
+  """
+  with p.default_token_type(token_type):
+    files = _common_files(token_type)
+    for script in u.SCRIPTS:
+      files += _script_files(script)
+    return build_cache.CachedFst(
+        functools.partial(_from_brahmic, token_type),
+        ('brahmic.iso', 'FROM_BRAHMIC', token_type), files)
+
+
 def generator_main(exporter_map: multi_grm.ExporterMapping):
   """Generate FSTs for ISO conversion of various Brahmic scripts."""
-  for token_type in ('byte', 'utf8'):
-    with p.default_token_type(token_type):
-      exporter = exporter_map[token_type]
-      from_script_fsts = []
-      sigma_fsts = []
-      for script in u.SCRIPTS:
-        sigma = u.OpenSigma(script, token_type)
-        sigma_fsts += [sigma]
-        from_script, to_script = _script_fsts(script, token_type)
-        from_script_fsts += [from_script]
-        script = script.upper()
-        exporter[f'FROM_{script}'] = from_script
-        exporter[f'TO_{script}'] = to_script
-      # TODO: The utf8 version of `FROM_BRAHMIC` transducer is
-      # failing to rewrite any native script inputs.
-      exporter['FROM_BRAHMIC'] = rw.Rewrite(
-          p.union(*from_script_fsts).optimize(),
-          sigma=p.union(*sigma_fsts).optimize()
-      )
+  # The FSTs of each script and token type are built independently in worker
+  # processes. They are exported in a fixed order, so the FARs do not depend
+  # on the number of workers.
+  tasks = [(script, token_type)
+           for token_type in _TOKEN_TYPES for script in u.SCRIPTS]
+  script_fsts = dict(zip(tasks, parallel.OrderedMap(
+      _build_script, tasks, parallel.NumWorkers(len(tasks)))))
+  # TODO: The utf8 version of `FROM_BRAHMIC` transducer is
+  # failing to rewrite any native script inputs.
+  from_brahmic_fsts = parallel.OrderedMap(
+      _build_from_brahmic, _TOKEN_TYPES,
+      parallel.NumWorkers(len(_TOKEN_TYPES)))
+  for token_type, from_brahmic in zip(_TOKEN_TYPES, from_brahmic_fsts):
+    exporter = exporter_map[token_type]
+    for script in u.SCRIPTS:
+      from_script, to_script = script_fsts[script, token_type]
+      exporter[f'FROM_{script.upper()}'] = from_script
+      exporter[f'TO_{script.upper()}'] = to_script
+    exporter['FROM_BRAHMIC'] = from_brahmic
 
 
 if __name__ == '__main__':
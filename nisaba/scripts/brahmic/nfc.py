@@ -27,31 +27,54 @@ bazel-bin/nisaba/interim/grm2/thrax/rewrite-tester \
 ```
 """
 
+from typing import Optional
+
 import pynini
 from pynini.export import multi_grm
 import nisaba.scripts.brahmic.util as u
+from nisaba.scripts.utils import parallel
 import nisaba.scripts.utils.rule as r
 
+_TOKEN_TYPES = ('byte', 'utf8')
+
+
+def _build_fst(task: tuple[str, Optional[str]]) -> pynini.Fst:
+  """Builds the FST of a token type and script in a worker process.
+
+  Args:
+    task: Token type and script, or None for the pan-brahmic FST.
+
+  Returns:
+    NFC FST.
+  """
+  token_type, script = task
+  scripts = u.SCRIPTS if script is None else [script]
+  with pynini.default_token_type(token_type):
+    rules = []
+    for script in scripts:
+      rules += r.rules_from_string_file(u.SCRIPT_DIR / script / 'nfc.tsv')
+    sigma = pynini.union(
+        *[u.OpenSigma(script, token_type) for script in scripts])
+    return r.fst_from_rules(rules, sigma)
+
 
 def generator_main(exporter_map: multi_grm.ExporterMapping):
   """Generates FSTs for NFC normalizing Brahmic scripts."""
-  for token_type in ('byte', 'utf8'):
-    with pynini.default_token_type(token_type):
-      exporter = exporter_map[token_type]
-      all_rules = []
-      all_sigmas = []
-      for script in u.SCRIPTS:
-        sigma = u.OpenSigma(script, token_type)
-        rules = list(
-            r.rules_from_string_file(u.SCRIPT_DIR / script / 'nfc.tsv'))
-        fst = r.fst_from_rules(rules, sigma)
-        exporter[script.upper()] = fst
-        all_rules += rules
-        all_sigmas += [sigma]
-      # Exports the pan-brahmic NFC FST.
-      brahmic_sigma = pynini.union(*all_sigmas)
-      brahmic_fst = r.fst_from_rules(all_rules, brahmic_sigma)
-      exporter['BRAHMIC'] = brahmic_fst
+  # The FSTs are built in worker processes and exported in a fixed order, so
+  # the FARs do not depend on the number of workers. The pan-brahmic FSTs
+  # are the slowest to build, so they are queued first.
+  tasks = [(token_type, None) for token_type in _TOKEN_TYPES] + [
+      (token_type, script)
+      for token_type in _TOKEN_TYPES for script in u.SCRIPTS
+  ]
+  fsts = dict(zip(tasks, parallel.OrderedMap(
+      _build_fst, tasks, parallel.NumWorkers(len(tasks)))))
+  for token_type in _TOKEN_TYPES:
+    exporter = exporter_map[token_type]
+    for script in u.SCRIPTS:
+      exporter[script.upper()] = fsts[token_type, script]
+    # Exports the pan-brahmic NFC FST.
+    exporter['BRAHMIC'] = fsts[token_type, None]
 
 
 if __name__ == '__main__':
@@ -0,0 +1,77 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Benchmarks the words/sec of normalizing a corpus with NormalizingAcceptor.
+
+Compares the line-level batched normalization against normalizing each word
+by composing it with the visual norm and the well-formedness FSTs.
+
+```sh
+bazel run -c opt //nisaba/scripts/brahmic:normalizer_benchmark -- \
+  --corpus=/tmp/hi_sentences.txt --script=Deva
+```
+"""
+
+from collections.abc import Sequence
+
+from absl import app
+from absl import flags
+from nisaba.scripts import brahmic
+from nisaba.scripts.utils import benchmark
+
+_CORPUS = flags.DEFINE_string(
+    'corpus', None, 'Text file with one sentence per line.', required=True)
+_SCRIPT = flags.DEFINE_string('script', 'Deva', 'ISO 15924 script tag.')
+_REPEATS = flags.DEFINE_integer(
+    'repeats', 1, 'Number of passes over the corpus.')
+
+
+class _PerWordAcceptor:
+  """Normalizes each word by composing it with the FSTs."""
+
+  def __init__(self, script: str) -> None:
+    self._visual_norm = brahmic.VisualNorm(script)
+    self._wellformed = brahmic.WellFormed(script)
+    self._accept_pat = brahmic.NormalizingAcceptor(script).accept_pat
+
+  def _ApplyOnWord(self, word: str) -> str:
+    norm_word = self._visual_norm.ApplyOnText(word)
+    if not self._wellformed.AcceptText(norm_word):
+      raise brahmic.IllFormedError
+    return norm_word
+
+  def ApplyOnText(self, line: str) -> str:
+    return self._accept_pat.sub(lambda m: self._ApplyOnWord(m.group(0)), line)
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  lines = benchmark.ReadLines(_CORPUS.value)
+  acceptor = brahmic.NormalizingAcceptor(_SCRIPT.value)
+  num_words = sum(len(acceptor.accept_pat.findall(line)) for line in lines)
+  rows = []
+  for name, apply_fn in (
+      ('per_word', _PerWordAcceptor(_SCRIPT.value).ApplyOnText),
+      ('line', acceptor.ApplyOnText)):
+    timing = benchmark.TimeApply(apply_fn, lines, _REPEATS.value)
+    words_per_second = num_words * _REPEATS.value / timing.seconds
+    rows.append((name, timing.seconds, timing.errors, words_per_second))
+  print(benchmark.FormatTable(
+      ('mode', 'seconds', 'rejected_lines', 'words_per_sec'), rows))
+  print(f'Speedup: {rows[1][3] / rows[0][3]:.2f}x')
+
+
+if __name__ == '__main__':
+  app.run(main)
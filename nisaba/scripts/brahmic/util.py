@@ -14,6 +14,7 @@
 
 """Utility functions and definitions used in this package."""
 
+import functools
 import os
 import pathlib
 
@@ -47,12 +48,24 @@ def OpenFstFromBrahmicFarSafe(far_name: str, fst_name: str, token_type: str,
   return uf.OpenFstFromFarSafe(FAR_DIR, far_name, token_type, fst_name, default)
 
 
+@functools.lru_cache(maxsize=None)
+def _Utf8SigmaFsts() -> dict[str, pynini.Fst]:
+  # The sigma FAR is read once, as several FSTs of a generator are built over
+  # the sigma of each script.
+  with uf.OpenFar(FAR_DIR, "sigma", "utf8") as far:
+    return {name: fst for name, fst in far}
+
+
 def OpenSigma(script: str, token_type: str) -> pynini.Fst:
   # Returns the byte FSA if token_type is 'byte', otherwise opens the sigma FAR.
   if token_type == "byte":
     return byte.BYTE
   elif token_type == "utf8":
-    return OpenFstFromBrahmicFar("sigma", script, token_type)
+    sigma = _Utf8SigmaFsts().get(script.upper())
+    if sigma is None:
+      raise KeyError(f"No sigma of the script: {script}")
+    # The callers may modify their sigma in place.
+    return sigma.copy()
   else:
     raise ValueError(f"Received invalid token_type: {token_type}")
 
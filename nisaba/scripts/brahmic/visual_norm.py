@@ -34,6 +34,7 @@ from pynini.export import grm
 from pynini.lib import pynutil
 import nisaba.scripts.brahmic.char_util as cu
 import nisaba.scripts.brahmic.util as u
+from nisaba.scripts.utils import build_cache
 from nisaba.scripts.utils import rule
 import nisaba.scripts.utils.char as uc
 import nisaba.scripts.utils.file as uf
@@ -103,14 +104,25 @@ def generator_main(exporter: grm.Exporter):
 
   with pynini.default_token_type(token_type):  # pytype: disable=wrong-arg-types
     sigma = u.OpenSigma(script, token_type)
-    dedup = cu.dedup_marks_fst(script, sigma)
-    nfc = open_nfc(script, token_type)
-    script_fst = ur.ComposeFsts(
-        [nfc, dedup] + core_visual_norm_fsts(
-            script_dir / 'visual_rewrite.tsv',
+
+    def _script_fst() -> pynini.Fst:
+      dedup = cu.dedup_marks_fst(script, sigma)
+      nfc = open_nfc(script, token_type)
+      return ur.ComposeFsts(
+          [nfc, dedup] + core_visual_norm_fsts(
+              script_dir / 'visual_rewrite.tsv',
+              script_dir / 'preserve.tsv',
+              script_dir / 'consonant.tsv',
+              sigma))
+
+    # The script FST is shared by the builds of the languages of the script.
+    script_fst = build_cache.CachedFst(
+        _script_fst, ('brahmic.visual_norm', script, token_type),
+        cu.script_chars_files(script) + [
             script_dir / 'preserve.tsv',
-            script_dir / 'consonant.tsv',
-            sigma))
+            uf.FarPath(u.FAR_DIR, 'nfc', token_type),
+            uf.FarPath(u.FAR_DIR, 'sigma', token_type),
+        ])
 
     if not lang:
       exporter[script.upper()] = script_fst
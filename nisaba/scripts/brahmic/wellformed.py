@@ -27,12 +27,15 @@ bazel-bin/nisaba/interim/grm2/thrax/rewrite-tester \
 ```
 """
 
+import functools
 import os
 
 import pynini
 from pynini.export import multi_grm
 import nisaba.scripts.brahmic.util as u
+from nisaba.scripts.utils import build_cache
 import nisaba.scripts.utils.file as uf
+from nisaba.scripts.utils import parallel
 
 
 def _input_string_file(filename: os.PathLike[str],
@@ -123,25 +126,44 @@ def accept_well_formed(script_config_file: os.PathLike[str],
   return uf.StarSafe(pynini.union(akshara, standalone, accept)).optimize()
 
 
+def _script_files(script: str) -> list[os.PathLike[str]]:
+  """Returns the files of the script, in the order of `accept_well_formed`."""
+  return [
+      u.SCRIPT_DIR / script / 'script_config.textproto',
+      u.SCRIPT_DIR / script / 'consonant.tsv',
+      u.SCRIPT_DIR / script / 'dead_consonant.tsv',
+      u.SCRIPT_DIR / script / 'subjoined_consonant.tsv',
+      u.SCRIPT_DIR / script / 'vowel_sign.tsv',
+      u.SCRIPT_DIR / script / 'vowel.tsv',
+      u.SCRIPT_DIR / script / 'vowel_length_sign.tsv',
+      u.SCRIPT_DIR / script / 'coda.tsv',
+      u.SCRIPT_DIR / script / 'standalone.tsv',
+      u.SCRIPT_DIR / script / 'virama.tsv',
+      u.SCRIPT_DIR / script / 'accept.tsv',
+      u.SCRIPT_DIR / script / 'preserve.tsv',
+  ]
+
+
+def _build_script(task: tuple[str, str]) -> pynini.Fst:
+  """Builds the FSA of a script and token type in a worker process."""
+  script, token_type = task
+  files = _script_files(script)
+  with pynini.default_token_type(token_type):
+    return build_cache.CachedFst(
+        functools.partial(accept_well_formed, *files),
+        ('brahmic.wellformed', script, token_type), files)
+
+
 def generator_main(exporter_map: multi_grm.ExporterMapping):
   """Generate unweighted FSAs accepting the language of each Brahmic script."""
-  for token_type in ('byte', 'utf8'):
-    with pynini.default_token_type(token_type):
-      exporter = exporter_map[token_type]
-      for script in u.SCRIPTS:
-        exporter[script.upper()] = accept_well_formed(
-            u.SCRIPT_DIR / script / 'script_config.textproto',
-            u.SCRIPT_DIR / script / 'consonant.tsv',
-            u.SCRIPT_DIR / script / 'dead_consonant.tsv',
-            u.SCRIPT_DIR / script / 'subjoined_consonant.tsv',
-            u.SCRIPT_DIR / script / 'vowel_sign.tsv',
-            u.SCRIPT_DIR / script / 'vowel.tsv',
-            u.SCRIPT_DIR / script / 'vowel_length_sign.tsv',
-            u.SCRIPT_DIR / script / 'coda.tsv',
-            u.SCRIPT_DIR / script / 'standalone.tsv',
-            u.SCRIPT_DIR / script / 'virama.tsv',
-            u.SCRIPT_DIR / script / 'accept.tsv',
-            u.SCRIPT_DIR / script / 'preserve.tsv')
+  # The FSAs are built in worker processes and exported in a fixed order, so
+  # the FARs do not depend on the number of workers.
+  tasks = [(script, token_type)
+           for token_type in ('byte', 'utf8') for script in u.SCRIPTS]
+  fsts = parallel.OrderedMap(
+      _build_script, tasks, parallel.NumWorkers(len(tasks)))
+  for (script, token_type), fst in zip(tasks, fsts):
+    exporter_map[token_type][script.upper()] = fst
 
 
 if __name__ == '__main__':
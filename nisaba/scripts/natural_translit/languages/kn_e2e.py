@@ -18,6 +18,7 @@
 import pynini as pyn
 from pynini.export import multi_grm
 from nisaba.scripts.natural_translit.language_params import kn
+from nisaba.scripts.utils import build_cache
 
 
 def generator_main(exporter_map: multi_grm.ExporterMapping):
@@ -26,9 +27,15 @@ def generator_main(exporter_map: multi_grm.ExporterMapping):
     with pyn.default_token_type(token_type):
 
       exporter = exporter_map[token_type]
-      exporter['ISO_TO_PSAF'] = kn.iso_to_psaf().compose()
-      exporter['ISO_TO_PSAC'] = kn.iso_to_psac().compose()
-      exporter['ISO_TO_IPA'] = kn.iso_to_ipa().compose()
+      exporter['ISO_TO_PSAF'] = build_cache.CachedFst(
+          lambda: kn.iso_to_psaf().compose(),
+          ('kn_e2e', 'ISO_TO_PSAF', token_type))
+      exporter['ISO_TO_PSAC'] = build_cache.CachedFst(
+          lambda: kn.iso_to_psac().compose(),
+          ('kn_e2e', 'ISO_TO_PSAC', token_type))
+      exporter['ISO_TO_IPA'] = build_cache.CachedFst(
+          lambda: kn.iso_to_ipa().compose(),
+          ('kn_e2e', 'ISO_TO_IPA', token_type))
 
 
 if __name__ == '__main__':
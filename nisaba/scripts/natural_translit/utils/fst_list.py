@@ -21,6 +21,8 @@ from typing import Any
 
 import pynini as pyn
 from nisaba.scripts.natural_translit.utils import type_op as ty
+from nisaba.scripts.utils import build_profile
+from nisaba.scripts.utils import cascade
 from nisaba.scripts.utils import rewrite
 
 
@@ -120,6 +122,13 @@ class FstList(ty.IterableThing):
       final_fst = final_fst + fst
     return final_fst
 
+  @build_profile.Profiled
   def compose(self) -> pyn.Fst:
-    """Composes all fsts in the list."""
-    return rewrite.ComposeFsts(self)
+    """Composes all fsts in the list, from left to right."""
+    # The first fst typically restricts the input of the grammar, which keeps
+    # the intermediate compositions small.
+    return rewrite.ComposeFsts(self, planner='sequential')
+
+  def cascade(self) -> cascade.Cascade:
+    """Cascade of the fsts, applied one after another without composing."""
+    return cascade.Cascade(self)
@@ -0,0 +1,105 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Aho-Corasick automaton for finding many patterns in strings at once.
+
+Finding which of n patterns occur in each of n strings by pairwise substring
+checks takes quadratic time. The automaton instead matches all the patterns
+in a single left-to-right pass over each string, in time linear in the length
+of the string plus the number of the matches.
+"""
+
+import collections
+from collections.abc import Iterable
+
+
+class Automaton:
+  """Aho-Corasick automaton over a sequence of patterns.
+
+  The patterns are identified by their index in the sequence. The empty
+  pattern occurs in any string.
+  """
+
+  def __init__(self, patterns: Iterable[str]) -> None:
+    # Trie transitions, failure links, the indices of the patterns ending at
+    # each node, and the indices of the patterns passing through each node.
+    self._goto: list[dict[str, int]] = [{}]
+    self._fail = [0]
+    self._outputs: list[list[int]] = [[]]
+    self._prefix_of: list[list[int]] = [[]]
+    for index, pattern in enumerate(patterns):
+      node = 0
+      for char in pattern:
+        next_node = self._goto[node].get(char)
+        if next_node is None:
+          next_node = len(self._goto)
+          self._goto[node][char] = next_node
+          self._goto.append({})
+          self._fail.append(0)
+          self._outputs.append([])
+          self._prefix_of.append([])
+        node = next_node
+        self._prefix_of[node].append(index)
+      self._outputs[node].append(index)
+    # Output links: the nearest node on the failure chain with an output.
+    self._output_link = [0] * len(self._goto)
+    queue = collections.deque(self._goto[0].values())
+    while queue:
+      node = queue.popleft()
+      for char, child in self._goto[node].items():
+        fail = self._fail[node]
+        while fail and char not in self._goto[fail]:
+          fail = self._fail[fail]
+        self._fail[child] = self._goto[fail].get(char, 0)
+        fail = self._fail[child]
+        self._output_link[child] = fail if self._outputs[fail] else (
+            self._output_link[fail])
+        queue.append(child)
+
+  def _step(self, node: int, char: str) -> int:
+    while node and char not in self._goto[node]:
+      node = self._fail[node]
+    return self._goto[node].get(char, 0)
+
+  def find_all(self, text: str) -> set[int]:
+    """Returns the indices of the patterns which are substrings of the text."""
+    found = set(self._outputs[0])
+    node = 0
+    for char in text:
+      node = self._step(node, char)
+      match = node if self._outputs[node] else self._output_link[node]
+      while match and not found.issuperset(self._outputs[match]):
+        found.update(self._outputs[match])
+        match = self._output_link[match]
+    return found
+
+  def find_overlapping(self, text: str) -> set[int]:
+    """Returns the indices of the patterns starting with a suffix of the text.
+
+    Only the non-empty suffixes are considered, so that a pattern is found iff
+    it overlaps with the end of the text, as in `xy` and `yz`.
+
+    Args:
+      text: String whose suffixes are looked up.
+    """
+    node = 0
+    for char in text:
+      node = self._step(node, char)
+    # The failure chain visits all the suffixes of the text which are prefixes
+    # of some patterns, from the longest to the shortest.
+    found = set()
+    while node:
+      found.update(self._prefix_of[node])
+      node = self._fail[node]
+    return found
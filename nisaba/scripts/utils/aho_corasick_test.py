@@ -0,0 +1,64 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.aho_corasick."""
+
+import random
+
+from absl.testing import absltest
+from nisaba.scripts.utils import aho_corasick
+
+
+class AhoCorasickTest(absltest.TestCase):
+
+  def test_find_all(self):
+    patterns = ['he', 'she', 'his', 'hers', 'e', 'he']
+    automaton = aho_corasick.Automaton(patterns)
+    self.assertEqual({0, 1, 4, 5}, automaton.find_all('ushe'))
+    self.assertEqual({0, 3, 4, 5}, automaton.find_all('hers'))
+    self.assertEqual(set(), automaton.find_all('xyz'))
+    self.assertEqual({0}, aho_corasick.Automaton(['']).find_all('abc'))
+
+  def test_find_all_matches_substring_checks(self):
+    rand = random.Random(0)
+    patterns = [''.join(rand.choices('abc', k=rand.randint(1, 4)))
+                for _ in range(50)]
+    automaton = aho_corasick.Automaton(patterns)
+    for _ in range(200):
+      text = ''.join(rand.choices('abc', k=rand.randint(0, 10)))
+      self.assertEqual(
+          {i for i, pattern in enumerate(patterns) if pattern in text},
+          automaton.find_all(text))
+
+  def test_find_overlapping(self):
+    automaton = aho_corasick.Automaton(['yz', 'xyw', 'zz', 'a'])
+    self.assertEqual({0, 1}, automaton.find_overlapping('axy'))
+    self.assertEqual({0, 2}, automaton.find_overlapping('yz'))
+    self.assertEqual(set(), automaton.find_overlapping(''))
+
+  def test_find_overlapping_matches_brute_force(self):
+    rand = random.Random(1)
+    patterns = [''.join(rand.choices('abc', k=rand.randint(1, 4)))
+                for _ in range(50)]
+    automaton = aho_corasick.Automaton(patterns)
+    for _ in range(200):
+      text = ''.join(rand.choices('abc', k=rand.randint(0, 6)))
+      self.assertEqual(
+          {i for i, pattern in enumerate(patterns)
+           if any(pattern.startswith(text[k:]) for k in range(len(text)))},
+          automaton.find_overlapping(text))
+
+
+if __name__ == '__main__':
+  absltest.main()
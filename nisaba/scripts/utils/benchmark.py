@@ -0,0 +1,93 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for benchmarking the grammar APIs."""
+
+from collections.abc import Callable, Iterable, Sequence
+import os
+import time
+from typing import Any, NamedTuple, Union
+
+
+class Timing(NamedTuple):
+  """Wall time taken to apply a function on a number of items."""
+  seconds: float
+  items: int
+  errors: int
+
+  @property
+  def items_per_second(self) -> float:
+    return self.items / self.seconds if self.seconds else float('inf')
+
+
+def TimeApply(apply_fn: Callable[[Any], Any], inputs: Iterable[Any],
+              repeats: int = 1) -> Timing:
+  """Times applying a function on each input.
+
+  Args:
+    apply_fn: Function to be applied on each input.
+    inputs: Inputs of the function.
+    repeats: Number of times the inputs are iterated over.
+
+  Returns:
+    Timing of all the applications, where the inputs raising ValueError, such
+    as the ones rejected by the grammars, are counted as errors.
+  """
+  inputs = list(inputs)
+  errors = 0
+  start = time.perf_counter()
+  for _ in range(repeats):
+    for item in inputs:
+      try:
+        apply_fn(item)
+      except ValueError:
+        errors += 1
+  return Timing(time.perf_counter() - start, len(inputs) * repeats, errors)
+
+
+class Memory(NamedTuple):
+  """Memory of a process in kB, as reported by Linux."""
+  # Resident set size: all the memory pages of the process in RAM.
+  rss: int
+  # Proportional set size: the shared pages count as a share of their size.
+  pss: int
+  # Pages which are not shared with any other process.
+  private: int
+
+
+def ProcessMemory(pid: Union[int, str] = 'self') -> Memory:
+  """Returns the memory of a process; only available on Linux."""
+  values = {}
+  with open(f'/proc/{pid}/smaps_rollup', encoding='utf8') as f:
+    for line in f:
+      name, _, value = line.partition(':')
+      if value.strip().endswith('kB'):
+        values[name] = int(value.split()[0])
+  return Memory(values['Rss'], values['Pss'],
+                values['Private_Clean'] + values['Private_Dirty'])
+
+
+def ReadLines(path: os.PathLike[str]) -> list[str]:
+  with open(path, encoding='utf8') as f:
+    return [line.rstrip('\n') for line in f]
+
+
+def FormatTable(header: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+  """Formats the rows as a tab separated table."""
+  lines = ['\t'.join(header)]
+  for row in rows:
+    lines.append('\t'.join(
+        f'{value:.2f}' if isinstance(value, float) else str(value)
+        for value in row))
+  return '\n'.join(lines)
@@ -0,0 +1,146 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Content-addressed on-disk cache of the FSTs built by the grammar generators.
+
+The generators rebuild the FSTs of every script even when only the data of
+one script changed. With this cache, an FST is stored under a key hashing:
+
+  * the contents of the data files it is built from,
+  * the sources of the loaded `nisaba` modules and the version of Pynini,
+  * the other parameters of the build, such as the script and token type,
+
+so that only the FSTs whose inputs changed are rebuilt.
+
+The cache is disabled by default. It is enabled by setting the environment
+variable `NISABA_BUILD_CACHE_DIR` to a directory, which Bazel has to pass to
+the sandboxed generators, e.g.:
+
+```sh
+bazel build --action_env=NISABA_BUILD_CACHE_DIR=/tmp/nisaba_cache \
+  --sandbox_writable_path=/tmp/nisaba_cache //nisaba/scripts/brahmic:iso
+```
+"""
+
+from collections.abc import Callable, Iterable, Sequence
+import hashlib
+import os
+import pathlib
+import sys
+import tempfile
+from typing import Optional
+
+import pynini
+from nisaba.scripts.utils import build_profile
+import nisaba.scripts.utils.file as uf
+
+_CACHE_DIR_ENV = 'NISABA_BUILD_CACHE_DIR'
+
+# Digests of the sources of the loaded modules, by their names.
+_SOURCES_DIGESTS: dict[tuple[str, ...], str] = {}
+
+
+def CacheDir() -> Optional[pathlib.Path]:
+  """Returns the cache directory, or None if the cache is disabled."""
+  cache_dir = os.environ.get(_CACHE_DIR_ENV)
+  return pathlib.Path(cache_dir) if cache_dir else None
+
+
+def _SourcesDigest() -> str:
+  """Returns the digest of the sources of the generator and `nisaba` modules."""
+  modules = tuple(sorted(
+      name for name, module in sys.modules.items()
+      if (name == '__main__' or name.startswith('nisaba.')) and
+      os.path.isfile(getattr(module, '__file__', None) or '')))
+  if modules not in _SOURCES_DIGESTS:
+    digest = hashlib.sha256(pynini.__version__.encode('utf8'))
+    for name in modules:
+      digest.update(name.encode('utf8'))
+      digest.update(pathlib.Path(sys.modules[name].__file__).read_bytes())
+    _SOURCES_DIGESTS[modules] = digest.hexdigest()
+  return _SOURCES_DIGESTS[modules]
+
+
+def Key(parts: Sequence[str], files: Iterable[os.PathLike[str]] = ()) -> str:
+  """Returns the cache key of an FST build.
+
+  Args:
+    parts: Parameters of the build, such as the name of the FST and the token
+      type.
+    files: Data files the FSTs are built from, relative to the runfiles
+      directory. The files which do not exist are hashed as such.
+  """
+  digest = hashlib.sha256(_SourcesDigest().encode('utf8'))
+  for part in parts:
+    digest.update(b'\0' + part.encode('utf8'))
+  for file in files:
+    digest.update(b'\0' + os.fspath(file).encode('utf8'))
+    if uf.IsFileExist(file):
+      digest.update(hashlib.sha256(
+          uf.AsResourcePath(file).read_bytes()).digest())
+  return digest.hexdigest()
+
+
+@build_profile.Profiled
+def CachedFsts(build_fn: Callable[[], Sequence[pynini.Fst]],
+               parts: Sequence[str],
+               files: Iterable[os.PathLike[str]] = ()) -> list[pynini.Fst]:
+  """Returns the FSTs built by the function, from the cache if possible.
+
+  Args:
+    build_fn: Function building the FSTs.
+    parts: Parameters of the build; see `Key`.
+    files: Data files the FSTs are built from; see `Key`.
+
+  Returns:
+    The FSTs, as built by the function or as read from the cache.
+
+  Raises:
+    ValueError: If the function builds no FSTs.
+  """
+  cache_dir = CacheDir()
+  if cache_dir is not None:
+    path = cache_dir / f'{Key(parts, files)}.far'
+    if path.exists():
+      with pynini.Far(os.fspath(path), 'r') as far:
+        return [fst for _, fst in far]
+  fsts = list(build_fn())
+  if not fsts:
+    raise ValueError(f'No FSTs built for the cache key parts: {list(parts)}')
+  if cache_dir is None:
+    return fsts
+  cache_dir.mkdir(parents=True, exist_ok=True)
+  # Concurrent builds may write the same entry, so it is written to a
+  # temporary file first and then renamed atomically.
+  fd, temp_path = tempfile.mkstemp(suffix='.far', dir=cache_dir)
+  os.close(fd)
+  try:
+    with pynini.Far(temp_path, 'w', arc_type=fsts[0].arc_type()) as far:
+      for index, fst in enumerate(fsts):
+        far[f'{index:03d}'] = fst
+    os.replace(temp_path, path)
+  finally:
+    if os.path.exists(temp_path):
+      os.remove(temp_path)
+  return fsts
+
+
+def CachedFst(build_fn: Callable[[], pynini.Fst],
+              parts: Sequence[str],
+              files: Iterable[os.PathLike[str]] = ()) -> pynini.Fst:
+  """Returns the FST built by the function, from the cache if possible.
+
+  See `CachedFsts`.
+  """
+  return CachedFsts(lambda: [build_fn()], parts, files)[0]
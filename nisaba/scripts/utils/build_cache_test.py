@@ -0,0 +1,82 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.build_cache."""
+
+import os
+import pathlib
+import tempfile
+from unittest import mock
+
+from absl.testing import absltest
+import pynini
+from nisaba.scripts.utils import build_cache
+
+
+class BuildCacheTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    self._dir = pathlib.Path(temp_dir.name)
+    self._data_file = self._dir / 'data.tsv'
+    self._data_file.write_text('a\tb\n')
+    self._num_builds = 0
+
+  def _Build(self) -> list[pynini.Fst]:
+    self._num_builds += 1
+    return [pynini.cross('a', 'b'), pynini.accep('c', weight=1)]
+
+  def _Cached(self, token_type: str = 'byte') -> list[pynini.Fst]:
+    return build_cache.CachedFsts(self._Build, ('test', token_type),
+                                  [self._data_file, self._dir / 'missing'])
+
+  def test_disabled(self):
+    with mock.patch.dict(os.environ, {build_cache._CACHE_DIR_ENV: ''}):
+      self._Cached()
+      self._Cached()
+    self.assertEqual(2, self._num_builds)
+
+  def test_cached(self):
+    cache_dir = self._dir / 'cache'
+    with mock.patch.dict(os.environ,
+                         {build_cache._CACHE_DIR_ENV: os.fspath(cache_dir)}):
+      built = self._Cached()
+      cached = self._Cached()
+      self.assertEqual(1, self._num_builds)
+      self.assertLen(cached, 2)
+      for built_fst, cached_fst in zip(built, cached):
+        self.assertTrue(pynini.equal(built_fst, cached_fst))
+      self.assertLen(list(cache_dir.iterdir()), 1)
+
+      # A change of the parameters or of the data rebuilds the FSTs.
+      self._Cached('utf8')
+      self.assertEqual(2, self._num_builds)
+      self._data_file.write_text('a\tc\n')
+      self._Cached()
+      self.assertEqual(3, self._num_builds)
+      self.assertTrue(pynini.equal(
+          pynini.accep('c', weight=1),
+          build_cache.CachedFst(lambda: self._Build()[1], ('single',))))
+
+  def test_no_fsts(self):
+    for cache_dir in ('', os.fspath(self._dir / 'cache')):
+      with mock.patch.dict(os.environ, {build_cache._CACHE_DIR_ENV: cache_dir}):
+        with self.assertRaisesRegex(ValueError, 'No FSTs built'):
+          build_cache.CachedFsts(lambda: [], ('empty',))
+
+
+if __name__ == '__main__':
+  absltest.main()
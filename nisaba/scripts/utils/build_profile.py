@@ -0,0 +1,250 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Opt-in profiling of the FST operations of the grammar builds.
+
+The operations decorated with `Profiled`, such as `rewrite.Rewrite`, the steps
+of `rewrite.ComposeFsts` and the rule-set FSTs of `rule.fst_from_rules`, are
+recorded with:
+
+  * the first caller outside of the profiled modules, e.g. the line of the
+    generator building the FST, and the stack of the enclosing operations,
+  * the wall time, with and without the enclosed operations,
+  * the peak resident memory of the process, and how much the operation
+    raised it,
+  * the numbers of states and arcs of the input and output FSTs.
+
+The profiling is disabled by default. It is enabled by setting the environment
+variable `NISABA_BUILD_PROFILE_DIR` to a directory, where each process of a
+build appends its records to `<program>.<pid>.tsv`. For a Bazel build:
+
+```sh
+bazel build --action_env=NISABA_BUILD_PROFILE_DIR=/tmp/nisaba_profile \
+  --sandbox_writable_path=/tmp/nisaba_profile //nisaba/scripts/brahmic:iso
+bazel run //nisaba/scripts/utils:build_profile_report -- \
+  --profile_dir=/tmp/nisaba_profile --folded=/tmp/iso.folded
+```
+
+The `.folded` stacks can be rendered by flamegraph.pl or speedscope.
+"""
+
+import collections
+from collections.abc import Callable, Iterable, Iterator
+import contextlib
+import functools
+import os
+import pathlib
+import resource
+import sys
+import time
+from typing import Any, NamedTuple, Optional, TextIO, TypeVar
+
+import pynini
+
+_PROFILE_DIR_ENV = 'NISABA_BUILD_PROFILE_DIR'
+
+_F = TypeVar('_F', bound=Callable[..., Any])
+
+
+class Record(NamedTuple):
+  """Profile of an operation."""
+  caller: str
+  # Caller and enclosing operations, outermost first, separated by `;`.
+  stack: str
+  operation: str
+  seconds: float
+  # Time outside of the enclosed profiled operations.
+  self_seconds: float
+  peak_rss_kb: int
+  peak_rss_growth_kb: int
+  input_states: int
+  input_arcs: int
+  output_states: int
+  output_arcs: int
+
+  @classmethod
+  def FromRow(cls, row: list[str]) -> 'Record':
+    return cls(*(
+        field_type(value)
+        for field_type, value in zip(cls.__annotations__.values(), row)))
+
+
+class _Stage:
+  """Operation in progress."""
+
+  def __init__(self, operation: str, caller: str) -> None:
+    self.operation = operation
+    self.caller = caller
+    self.child_seconds = 0.0
+
+
+# Operations in progress, innermost last.
+_STAGES: list[_Stage] = []
+
+# Source files of the profiled functions, skipped when looking for callers.
+_PROFILED_FILES = {__file__, contextlib.__file__}
+
+# Report of this process, and its path.
+_REPORT: Optional[TextIO] = None
+_REPORT_PATH: Optional[pathlib.Path] = None
+
+
+def ProfileDir() -> Optional[pathlib.Path]:
+  """Returns the profile directory, or None if the profiling is disabled."""
+  profile_dir = os.environ.get(_PROFILE_DIR_ENV)
+  return pathlib.Path(profile_dir) if profile_dir else None
+
+
+def _Caller() -> str:
+  """Returns the first frame outside of the profiled modules."""
+  frame = sys._getframe(1)  # pylint: disable=protected-access
+  while frame.f_back and frame.f_code.co_filename in _PROFILED_FILES:
+    frame = frame.f_back
+  code = frame.f_code
+  return f'{os.path.basename(code.co_filename)}:{frame.f_lineno}:{code.co_name}'
+
+
+def _Fsts(values: Iterable[Any]) -> Iterator[pynini.Fst]:
+  """Yields the FSTs among the values and in their collections."""
+  for value in values:
+    if isinstance(value, pynini.Fst):
+      yield value
+    elif isinstance(value, Iterable) and not isinstance(
+        value, (str, bytes, Iterator)):
+      # Iterators are not consumed, as the operation reads them.
+      yield from (item for item in value if isinstance(item, pynini.Fst))
+
+
+def _Size(fsts: Iterable[pynini.Fst]) -> tuple[int, int]:
+  """Returns the total numbers of states and arcs of the FSTs."""
+  num_states = num_arcs = 0
+  for fst in fsts:
+    num_states += fst.num_states()
+    num_arcs += sum(fst.num_arcs(state) for state in fst.states())
+  return num_states, num_arcs
+
+
+def _PeakRssKb() -> int:
+  # In kB on Linux.
+  return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _Write(record: Record) -> None:
+  """Appends the record to the report of this process."""
+  global _REPORT, _REPORT_PATH
+  program = pathlib.Path(sys.argv[0]).stem if sys.argv[0] else 'python'
+  # Forked worker processes have their own reports.
+  path = ProfileDir() / f'{program}.{os.getpid()}.tsv'
+  if path != _REPORT_PATH:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _REPORT = open(path, 'a', encoding='utf8')
+    _REPORT_PATH = path
+    if not _REPORT.tell():
+      _REPORT.write('\t'.join(Record._fields) + '\n')
+  _REPORT.write('\t'.join(
+      f'{value:.6f}' if isinstance(value, float) else str(value)
+      for value in record) + '\n')
+  # Pool workers may be terminated without running any exit handlers.
+  _REPORT.flush()
+
+
+class _Output:
+  """Setter of the output of an operation."""
+
+  def __init__(self) -> None:
+    self.value = None
+
+  def Set(self, value: Any) -> None:
+    self.value = value
+
+
+@contextlib.contextmanager
+def Operation(name: str, inputs: Iterable[Any] = ()) -> Iterator[_Output]:
+  """Profiles the enclosed operation, if the profiling is enabled.
+
+  Args:
+    name: Name of the operation.
+    inputs: Inputs of the operation; the FSTs among them, or in their lists,
+      are counted.
+
+  Yields:
+    An object whose `Set` method sets the output of the operation, which is
+    counted as well if it is an FST or a collection of FSTs.
+  """
+  output = _Output()
+  if ProfileDir() is None:
+    yield output
+    return
+  stage = _Stage(name, _STAGES[0].caller if _STAGES else _Caller())
+  input_states, input_arcs = _Size(_Fsts(inputs))
+  peak_rss = _PeakRssKb()
+  _STAGES.append(stage)
+  start = time.perf_counter()
+  try:
+    yield output
+  finally:
+    seconds = time.perf_counter() - start
+    _STAGES.pop()
+    if _STAGES:
+      _STAGES[-1].child_seconds += seconds
+  output_states, output_arcs = _Size(_Fsts([output.value]))
+  new_peak_rss = _PeakRssKb()
+  _Write(Record(
+      stage.caller, ';'.join([stage.caller] + [s.operation for s in _STAGES]),
+      name, seconds, seconds - stage.child_seconds, new_peak_rss,
+      new_peak_rss - peak_rss, input_states, input_arcs, output_states,
+      output_arcs))
+
+
+def Profiled(fn: _F) -> _F:
+  """Decorates a function to be profiled as an operation; see `Operation`."""
+  _PROFILED_FILES.add(fn.__code__.co_filename)
+  name = fn.__qualname__.replace('<locals>.', '')
+
+  @functools.wraps(fn)
+  def _Profiled(*args, **kwargs):
+    if ProfileDir() is None:
+      return fn(*args, **kwargs)
+    with Operation(name, list(args) + list(kwargs.values())) as output:
+      output.Set(fn(*args, **kwargs))
+    return output.value
+
+  return _Profiled
+
+
+def ReadRecords(profile_dir: os.PathLike[str]) -> list[Record]:
+  """Returns the records of all the reports in the directory."""
+  records = []
+  for path in sorted(pathlib.Path(profile_dir).glob('*.tsv')):
+    with path.open(encoding='utf8') as f:
+      next(f, None)
+      records += [Record.FromRow(line.rstrip('\n').split('\t')) for line in f]
+  return records
+
+
+def FoldedStacks(records: Iterable[Record]) -> list[str]:
+  """Returns the self times of the stacks in the flamegraph folded format.
+
+  Args:
+    records: Records of the operations.
+
+  Returns:
+    Lines of the stacks, including the operations, and their total self times
+    in microseconds, sorted by stack.
+  """
+  micros = collections.Counter()
+  for record in records:
+    micros[f'{record.stack};{record.operation}'] += round(
+        record.self_seconds * 1e6)
+  return [f'{stack} {value}' for stack, value in sorted(micros.items())]
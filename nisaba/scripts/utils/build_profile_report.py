@@ -0,0 +1,75 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Reports the costliest FST operations of profiled grammar builds.
+
+The records written by `build_profile` are aggregated by caller and
+operation, and sorted by their total time. See `build_profile` for the
+profiling of a build.
+
+```sh
+bazel run //nisaba/scripts/utils:build_profile_report -- \
+  --profile_dir=/tmp/nisaba_profile --folded=/tmp/iso.folded
+```
+"""
+
+import collections
+from collections.abc import Sequence
+
+from absl import app
+from absl import flags
+from nisaba.scripts.utils import benchmark
+from nisaba.scripts.utils import build_profile
+
+_PROFILE_DIR = flags.DEFINE_string(
+    'profile_dir', None, 'Directory of the profiles of the build.',
+    required=True)
+_FOLDED = flags.DEFINE_string(
+    'folded', None, 'Output path of the stacks in the flamegraph folded '
+    'format, if any.')
+_TOP = flags.DEFINE_integer(
+    'top', 50, 'Number of the costliest operations to report.')
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  records = build_profile.ReadRecords(_PROFILE_DIR.value)
+  groups = collections.defaultdict(list)
+  for record in records:
+    groups[record.caller, record.operation].append(record)
+  rows = []
+  for (caller, operation), group in groups.items():
+    rows.append((
+        caller, operation, len(group),
+        sum(record.seconds for record in group),
+        sum(record.self_seconds for record in group),
+        max(record.peak_rss_kb for record in group) // 1024,
+        sum(record.peak_rss_growth_kb for record in group) // 1024,
+        max(record.input_states for record in group),
+        max(record.output_states for record in group),
+        max(record.output_arcs for record in group)))
+  rows.sort(key=lambda row: row[3], reverse=True)
+  print(benchmark.FormatTable(
+      ('caller', 'operation', 'calls', 'seconds', 'self_seconds',
+       'peak_rss_mb', 'peak_rss_growth_mb', 'max_input_states',
+       'max_output_states', 'max_output_arcs'), rows[:_TOP.value]))
+  if _FOLDED.value:
+    with open(_FOLDED.value, 'w', encoding='utf8') as f:
+      for line in build_profile.FoldedStacks(records):
+        f.write(line + '\n')
+
+
+if __name__ == '__main__':
+  app.run(main)
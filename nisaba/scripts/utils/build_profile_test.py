@@ -0,0 +1,74 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.build_profile."""
+
+import os
+import pathlib
+import tempfile
+from unittest import mock
+
+from absl.testing import absltest
+import pynini
+from nisaba.scripts.utils import build_profile
+from nisaba.scripts.utils import rewrite
+
+
+class BuildProfileTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    self._dir = pathlib.Path(temp_dir.name)
+    self._fsts = [rewrite.Rewrite(pynini.cross('a', 'b')),
+                  rewrite.Rewrite(pynini.cross('b', 'c'))]
+
+  def test_disabled(self):
+    with mock.patch.dict(os.environ, {build_profile._PROFILE_DIR_ENV: ''}):
+      rewrite.ComposeFsts(self._fsts)
+    self.assertEmpty(list(self._dir.iterdir()))
+
+  def test_records(self):
+    with mock.patch.dict(os.environ,
+                         {build_profile._PROFILE_DIR_ENV: str(self._dir)}):
+      composed = rewrite.ComposeFsts(self._fsts)
+    self.assertEqual('c', pynini.shortestpath('a' @ composed).string())
+    records = build_profile.ReadRecords(self._dir)
+    # The inner operations are written first.
+    self.assertEqual(['ComposeFsts._Compose', 'ComposeFsts'],
+                     [record.operation for record in records])
+    compose_step, compose = records
+    self.assertStartsWith(compose.caller, 'build_profile_test.py:')
+    self.assertEqual(compose.caller, compose.stack)
+    self.assertEqual(f'{compose.caller};ComposeFsts', compose_step.stack)
+    self.assertLessEqual(compose_step.seconds, compose.seconds)
+    self.assertAlmostEqual(compose.seconds - compose_step.seconds,
+                           compose.self_seconds, places=5)
+    self.assertEqual(sum(fst.num_states() for fst in self._fsts),
+                     compose.input_states)
+    self.assertEqual(composed.num_states(), compose.output_states)
+    self.assertEqual(
+        sum(composed.num_arcs(state) for state in composed.states()),
+        compose.output_arcs)
+    self.assertGreater(compose.peak_rss_kb, 0)
+
+    folded = build_profile.FoldedStacks(records)
+    self.assertLen(folded, 2)
+    self.assertStartsWith(folded[1],
+                          f'{compose.caller};ComposeFsts;ComposeFsts._Compose ')
+
+
+if __name__ == '__main__':
+  absltest.main()
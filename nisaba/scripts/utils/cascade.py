@@ -0,0 +1,135 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cascades of FSTs applied one after another at runtime.
+
+Composing a long cascade into a single FST can take much longer to build, and
+be much larger, than its components. A `Cascade` keeps the components instead
+and applies them on each input in turn, so that only the lattices of the input
+are built. The result is the same as that of the composed FST.
+
+A cascade is exported to a FAR as one rule per component, named by
+`StageName`, and loaded back with `far.Far.Cascade`.
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import Protocol
+
+import pynini
+
+# Infix of the FAR rule names of the components of a cascade.
+_STAGE_INFIX = '.STAGE'
+
+
+class Exporter(Protocol):
+  """FAR exporter, such as `pynini.export.grm.Exporter`.
+
+  The exporter module is not imported here, as it defines command-line flags
+  which would clash with the flags of the binaries using the cascades.
+  """
+
+  def __setitem__(self, name: str, fst: pynini.Fst) -> None:
+    ...
+
+
+class Cascade:
+  """FSTs applied one after another on the lattice of each input."""
+
+  def __init__(self, fsts: Iterable[pynini.Fst]) -> None:
+    """Prepares the FSTs for their application.
+
+    Args:
+      fsts: FSTs in the order of their application.
+
+    Raises:
+      ValueError: If there are no FSTs.
+    """
+    # Composition needs the FSTs to be sorted on their input labels, as in
+    # `far.Far.FstWrapper`.
+    self._fsts = [
+        fst if fst.properties(pynini.I_LABEL_SORTED, True) else
+        fst.copy().arcsort('ilabel') for fst in fsts
+    ]
+    if not self._fsts:
+      raise ValueError('A cascade needs at least one FST.')
+
+  @property
+  def fsts(self) -> list[pynini.Fst]:
+    return list(self._fsts)
+
+  def Lattice(self, text: pynini.FstLike) -> pynini.Fst:
+    """Returns the output lattice of the cascade on the input.
+
+    Args:
+      text: Input string, compiled with the default token type, or FST.
+
+    Returns:
+      An acceptor of the outputs, which is empty if the input is rejected.
+    """
+    lattice = text
+    for fst in self._fsts:
+      lattice = pynini.compose(lattice, fst)
+      if lattice.start() == pynini.NO_STATE_ID:
+        break
+      # Only the outputs are needed by the next component.
+      lattice = lattice.project('output').rmepsilon()
+    return lattice
+
+  def ApplyOnText(self, text: pynini.FstLike) -> str:
+    """Returns the output of the shortest path of the cascade on the input.
+
+    Args:
+      text: Input string, compiled with the default token type, or FST.
+
+    Raises:
+      pynini.FstOpError: If the input is rejected.
+    """
+    return pynini.shortestpath(self.Lattice(text)).string()
+
+  def AcceptText(self, text: pynini.FstLike) -> bool:
+    """Returns whether the cascade accepts the input."""
+    return self.Lattice(text).start() != pynini.NO_STATE_ID
+
+
+def StageName(rule_name: str, index: int) -> str:
+  """Returns the FAR rule name of a component of a cascade."""
+  return f'{rule_name}{_STAGE_INFIX}{index:03d}'
+
+
+def StageNames(far_rule_names: Iterable[str], rule_name: str) -> list[str]:
+  """Returns the FAR rule names of the components of a cascade, in order.
+
+  Args:
+    far_rule_names: Names of all the rules in the FAR.
+    rule_name: Name of the cascade.
+  """
+  prefix = f'{rule_name}{_STAGE_INFIX}'
+  # The indices are only padded to three digits, so they are compared as
+  # numbers for the cascades of more stages.
+  return sorted((name for name in far_rule_names
+                 if name.startswith(prefix) and name[len(prefix):].isdigit()),
+                key=lambda name: int(name[len(prefix):]))
+
+
+def Export(exporter: Exporter, rule_name: str,
+           fsts: Sequence[pynini.Fst]) -> None:
+  """Exports the components of a cascade as FAR rules.
+
+  Args:
+    exporter: FAR exporter.
+    rule_name: Name of the cascade.
+    fsts: FSTs in the order of their application.
+  """
+  for index, fst in enumerate(fsts):
+    exporter[StageName(rule_name, index)] = fst
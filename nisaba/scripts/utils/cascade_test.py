@@ -0,0 +1,86 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.cascade."""
+
+import os
+import tempfile
+
+from absl.testing import absltest
+import pynini
+from nisaba.scripts.utils import cascade
+from nisaba.scripts.utils import far
+from nisaba.scripts.utils import rewrite
+
+
+class CascadeTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._fsts = [
+        rewrite.Rewrite(pynini.cross('a', 'b')),
+        rewrite.Rewrite(pynini.cross('bb', 'c')),
+        rewrite.Rewrite(pynini.cross('c', 'dd') |
+                        pynini.cross('c', 'e') + pynini.accep('', weight=1)),
+    ]
+
+  def test_apply_on_text(self):
+    composed = rewrite.ComposeFsts(self._fsts)
+    fst_cascade = cascade.Cascade(self._fsts)
+    for text in ('', 'abc', 'aab', 'xyz'):
+      self.assertEqual(pynini.shortestpath(text @ composed).string(),
+                       fst_cascade.ApplyOnText(text))
+
+  def test_rejects(self):
+    fst_cascade = cascade.Cascade(
+        [pynini.cross('a', 'b'), pynini.cross('b', 'c')])
+    self.assertTrue(fst_cascade.AcceptText('a'))
+    self.assertFalse(fst_cascade.AcceptText('b'))
+    with self.assertRaises(pynini.FstOpError):
+      fst_cascade.ApplyOnText('b')
+    with self.assertRaisesRegex(ValueError, 'at least one FST'):
+      cascade.Cascade([])
+
+  def test_stage_names(self):
+    names = [cascade.StageName('RULE', index) for index in (10, 2, 0, 1)]
+    self.assertEqual(['RULE.STAGE000', 'RULE.STAGE001', 'RULE.STAGE002',
+                      'RULE.STAGE010'],
+                     cascade.StageNames(names + ['RULE', 'RULE_2.STAGE000'],
+                                        'RULE'))
+    names = [cascade.StageName('RULE', index) for index in (1000, 999, 2)]
+    self.assertEqual(['RULE.STAGE002', 'RULE.STAGE999', 'RULE.STAGE1000'],
+                     cascade.StageNames(names, 'RULE'))
+
+  def test_far_cascade(self):
+    exporter = {}
+    cascade.Export(exporter, 'RULE', self._fsts)
+    exporter['OTHER'] = pynini.accep('a')
+    with tempfile.TemporaryDirectory() as temp_dir:
+      path = os.path.join(temp_dir, 'cascade.far')
+      with pynini.Far(path, 'w') as writer:
+        for name in sorted(exporter):
+          writer[name] = exporter[name]
+      fst_far = far.Far(path)
+      wrapper = fst_far.Cascade('RULE')
+      self.assertIs(wrapper, fst_far.Cascade('RULE'))
+      self.assertEqual('dd', wrapper.ApplyOnText('ab'))
+      self.assertTrue(wrapper.AcceptText('ab'))
+      with self.assertRaises(far.FstInputError):
+        far.Far.CascadeWrapper([pynini.cross('a', 'b')]).ApplyOnText('b')
+      with self.assertRaises(KeyError):
+        fst_far.Cascade('OTHER')
+
+
+if __name__ == '__main__':
+  absltest.main()
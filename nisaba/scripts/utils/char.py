@@ -15,11 +15,11 @@
 """Acyclic acceptor accepting characters from Brahmic scripts."""
 
 from collections.abc import Iterable
+import functools
 import os
 import pathlib
 
 import pynini
-import pathlib
 import nisaba.scripts.utils.file as uf
 
 ZWNJ = "\u200C"  # Zero Width Non-Joiner
@@ -27,6 +27,19 @@ ZWJ = "\u200D"  # Zero Width Joiner
 ZWS = "\u200B"  # Zero Width Space
 
 
+def _parse_chars(path: pathlib.Path, relevant_fields: int) -> frozenset[str]:
+  """Parses the characters under some selection from a file path."""
+  chars = set()
+  with path.open("rt", encoding="utf8") as f:
+    for line in f:
+      if line.startswith("#"):
+        continue
+      fields = line.strip().split("\t")[0:relevant_fields]
+      for field in fields:
+        chars.update(field)
+  return frozenset(chars)
+
+
 def _read_string_file_chars_to_set(
     files: Iterable[os.PathLike[str]], relevant_fields: int
 ) -> set[str]:
@@ -42,13 +55,10 @@ def _read_string_file_chars_to_set(
   """
   chars = set()
   for fname in files:
-    with pathlib.Path(uf.AsResourcePath(pathlib.Path(fname))).open("rt", encoding="utf8") as f:
-      for line in f:
-        if line.startswith("#"):
-          continue
-        fields = line.strip().split("\t")[0:relevant_fields]
-        for field in fields:
-          chars.update(field)
+    # The characters of each file are parsed once per process.
+    chars.update(uf.CachedParse(
+        fname, f"chars:{relevant_fields}",
+        lambda path: _parse_chars(path, relevant_fields)))
   return chars
 
 
@@ -75,17 +85,39 @@ def derive_chars(
   return all_chars
 
 
+@functools.lru_cache(maxsize=None)
+def _sigma(chars: frozenset[str], token_type: str) -> pynini.Fst:
+  """Builds the minimal unweighted FSA over the characters."""
+  if token_type == "byte":
+    # A character is a sequence of bytes, and the minimization of their union
+    # shares the common prefixes and suffixes of the sequences.
+    sigma = pynini.union(*[pynini.accep(char) for char in sorted(chars)])
+    return sigma.optimize()
+  # A character is a single label, so the FSA is one arc per character from
+  # the start state to the final state, built without any compilation or
+  # optimization of the string map.
+  sigma = pynini.Fst()
+  start = sigma.add_state()
+  final = sigma.add_state()
+  sigma.set_start(start)
+  sigma.set_final(final)
+  one = pynini.Weight.one(sigma.weight_type())
+  for label in sorted(ord(char) for char in chars):
+    sigma.add_arc(start, pynini.Arc(label, label, one, final))
+  return sigma
+
+
 def derive_sigma(chars: set[str]) -> pynini.Fst:
   """Creates an unweighted FSA over the given set of characters and joiners.
 
+  The FSA is built for the default token type, and memoized.
+
   Args:
     chars: Set of all characters.
 
   Returns:
     pynini.Fst: An unweighted FSA that accepts this finite sigma language.
   """
-
-  sigma = pynini.string_map(zip(chars))
-  sigma.project("output")  # Project in-place
-  sigma.union(ZWNJ, ZWJ, ZWS)
-  return sigma.optimize()
+  sigma = _sigma(frozenset(chars) | {ZWNJ, ZWJ, ZWS}, uf.DefaultTokenType())
+  # The callers may modify their sigma in place.
+  return sigma.copy()
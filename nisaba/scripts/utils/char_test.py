@@ -0,0 +1,64 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.char."""
+
+import pathlib
+import tempfile
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import pynini
+import nisaba.scripts.utils.char as uc
+
+_CHARS = {"a", "b", "é", "क", "ख", "ि"}
+
+
+class CharTest(parameterized.TestCase):
+
+  def test_derive_chars(self):
+    with tempfile.TemporaryDirectory() as temp_dir:
+      both_sides = pathlib.Path(temp_dir) / "both_sides.tsv"
+      both_sides.write_text("# comment\nab\tc\td\n", encoding="utf8")
+      input_side = pathlib.Path(temp_dir) / "input_side.tsv"
+      input_side.write_text("e\tf\n", encoding="utf8")
+      chars = uc.derive_chars(both_sides=[both_sides], input_side=[input_side])
+      self.assertEqual(chars, {"a", "b", "c", "e"})
+      # The result is a new set each time, even though the files are memoized.
+      chars.add("z")
+      self.assertEqual(
+          uc.derive_chars(both_sides=[both_sides], input_side=[input_side]),
+          {"a", "b", "c", "e"})
+
+  @parameterized.parameters("byte", "utf8")
+  def test_derive_sigma(self, token_type: str):
+    with pynini.default_token_type(token_type):
+      expected = pynini.string_map(
+          zip(_CHARS | {uc.ZWNJ, uc.ZWJ, uc.ZWS})).optimize()
+      sigma = uc.derive_sigma(_CHARS)
+      self.assertTrue(pynini.equivalent(sigma, expected))
+      self.assertEqual(sigma.num_states(), expected.num_states())
+      # The memoized FSA is not modified by its callers.
+      sigma.union("x")
+      self.assertNotIn("x", uc.derive_sigma(_CHARS).paths().ostrings())
+
+  def test_derive_sigma_utf8_size(self):
+    with pynini.default_token_type("utf8"):
+      sigma = uc.derive_sigma(_CHARS)
+    self.assertEqual(sigma.num_states(), 2)
+    self.assertEqual(sigma.num_arcs(sigma.start()), len(_CHARS) + 3)
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -14,31 +14,268 @@
 
 """Library to load a .far file and transduce a string with an FST from that."""
 
+import collections
+from collections.abc import Callable, Hashable, Iterable
+from concurrent import futures
 import os
+import sys
+import threading
+import time
+from typing import Any, NamedTuple, Optional, Union
 import warnings
 
 import pynini
-import functools
 import nisaba.scripts.utils.file as uf
+from nisaba.scripts.utils import cascade
+from nisaba.scripts.utils import metrics
+from nisaba.scripts.utils import sequential
 
 
 class FstInputError(ValueError):
   pass
 
 
+class CacheStats(NamedTuple):
+  """Counters of a ResultCache, used for sizing it."""
+  hits: int
+  misses: int
+  evictions: int
+  entries: int
+  bytes: int
+
+
+class ResultCache:
+  """Least recently used cache of FST application results.
+
+  The cache is bounded both by the number of entries and by an approximate
+  number of bytes used by the cached strings. Least recently used entries are
+  evicted once either of the bounds is exceeded.
+  """
+
+  def __init__(self, max_entries: int, max_bytes: int) -> None:
+    if max_entries <= 0 or max_bytes <= 0:
+      raise ValueError('Cache bounds should be positive: '
+                       f'max_entries={max_entries}, max_bytes={max_bytes}')
+    self.max_entries = max_entries
+    self.max_bytes = max_bytes
+    self._entries = collections.OrderedDict()
+    self._lock = threading.Lock()
+    self._bytes = 0
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+
+  @staticmethod
+  def _Size(key: tuple[Hashable, ...], value: Any) -> int:
+    return sys.getsizeof(key[-1]) + sys.getsizeof(value)
+
+  def Get(self, key: tuple[Hashable, ...]) -> tuple[bool, Any]:
+    """Returns whether the key is found, along with its value if so."""
+    with self._lock:
+      if key not in self._entries:
+        self._misses += 1
+        return False, None
+      self._hits += 1
+      self._entries.move_to_end(key)
+      return True, self._entries[key]
+
+  def Put(self, key: tuple[Hashable, ...], value: Any) -> None:
+    """Caches the value, evicting the least recently used entries as needed."""
+    size = self._Size(key, value)
+    if size > self.max_bytes:
+      return
+    with self._lock:
+      if key in self._entries:
+        self._bytes -= self._Size(key, self._entries.pop(key))
+      self._entries[key] = value
+      self._bytes += size
+      while (len(self._entries) > self.max_entries or
+             self._bytes > self.max_bytes):
+        old_key, old_value = self._entries.popitem(last=False)
+        self._bytes -= self._Size(old_key, old_value)
+        self._evictions += 1
+
+  def Clear(self) -> None:
+    """Removes all the entries; the counters are kept."""
+    with self._lock:
+      self._entries.clear()
+      self._bytes = 0
+
+  def Stats(self) -> CacheStats:
+    with self._lock:
+      return CacheStats(hits=self._hits, misses=self._misses,
+                        evictions=self._evictions, entries=len(self._entries),
+                        bytes=self._bytes)
+
+
+# Process-wide cache of FST application results; disabled by default.
+_RESULT_CACHE: Optional[ResultCache] = None
+
+
+def EnableResultCache(max_entries: int = 100_000,
+                      max_bytes: int = 64 * 1024 * 1024) -> ResultCache:
+  """Enables caching the results of the FSTs retrieved from Far objects.
+
+  Natural language texts follow Zipf's law, so a small number of frequent
+  words make up most of the tokens. Caching the results for those words
+  avoids composing them with the FST over and over again. The entries are
+  keyed by the FAR path, the rule name and the input string.
+
+  Args:
+    max_entries: Maximum number of the cached results.
+    max_bytes: Maximum approximate size of the cached strings in bytes.
+
+  Returns:
+    The newly enabled cache, which replaces any previously enabled cache. Its
+    counters can be used to size the cache.
+  """
+  global _RESULT_CACHE
+  _RESULT_CACHE = ResultCache(max_entries, max_bytes)
+  return _RESULT_CACHE
+
+
+def DisableResultCache() -> None:
+  global _RESULT_CACHE
+  _RESULT_CACHE = None
+
+
+# Process-wide registry of the per-rule counters; disabled by default.
+_METRICS: Optional[metrics.Registry] = None
+
+
+def EnableMetrics(
+    registry: Optional[metrics.Registry] = None) -> metrics.Registry:
+  """Enables recording the calls of the FSTs retrieved from Far objects.
+
+  The number of calls and errors, the latency and the input and output
+  lengths are recorded per FAR, rule and operation. Dump them with
+  `FormatTable` or `ToJson` of the returned registry.
+
+  Args:
+    registry: Registry recording the calls; a new one by default. A subclass
+      overriding `Record` can forward the calls to a monitoring system.
+
+  Returns:
+    The enabled registry, which replaces any previously enabled registry.
+  """
+  global _METRICS
+  _METRICS = registry if registry is not None else metrics.Registry()
+  return _METRICS
+
+
+def DisableMetrics() -> None:
+  global _METRICS
+  _METRICS = None
+
+
+class LoadTime(NamedTuple):
+  """Wall time taken to load a FAR archive or one of its rules."""
+  far: str
+  # The rule name, or None for loading the archive itself.
+  rule: Optional[str]
+  seconds: float
+
+
+def RunInBackground(fn: Callable[..., Any], *args: Any,
+                    **kwargs: Any) -> futures.Future:
+  """Runs the function, such as a preload, on a background thread."""
+  executor = futures.ThreadPoolExecutor(max_workers=1,
+                                        thread_name_prefix='nisaba_preload')
+  future = executor.submit(fn, *args, **kwargs)
+  # The thread exits once the function returns.
+  executor.shutdown(wait=False)
+  return future
+
+
+class SingleFlight:
+  """Computes the value of each key once, even under concurrent threads.
+
+  The threads requesting a key whose value is being computed wait for that
+  computation instead of starting their own. The values of the different keys
+  are computed concurrently. A failed computation is not cached, so the next
+  request for its key computes it again.
+  """
+
+  def __init__(self) -> None:
+    self._values = {}
+    self._key_locks = {}
+    self._lock = threading.Lock()
+
+  def Get(self, key: Hashable, compute_fn: Callable[[], Any]) -> Any:
+    try:
+      return self._values[key]
+    except KeyError:
+      pass
+    with self._lock:
+      key_lock = self._key_locks.setdefault(key, threading.Lock())
+    with key_lock:
+      if key not in self._values:
+        self._values[key] = compute_fn()
+      return self._values[key]
+
+
 class Far:
   """Far object created from a .far file.
 
   This .far file is usually generated in the runfiles directory and provided through the data
   field of the BUILD target as a resource.
+
+  A Far object is thread-safe: it loads the archive and each of its rules only
+  once, even when they are first requested by concurrent threads. The returned
+  FST wrappers can be applied from any number of threads too.
   """
 
   class FstWrapper:
     """An FST object wrapper retrieved from a Far object."""
 
-    def __init__(self, fst: pynini.Fst) -> None:
+    def __init__(self, fst: pynini.Fst,
+                 cache_key: Optional[tuple[str, str]] = None) -> None:
+      """Wraps the FST.
+
+      Args:
+        fst: FST to be wrapped.
+        cache_key: The FAR path and the rule name of the FST; results are only
+          cached and calls are only recorded for the FSTs with a cache key.
+          See `EnableResultCache` and `EnableMetrics`.
+      """
+      self._cache_key = cache_key
+      # Composition needs the FST to be sorted on its input labels; otherwise
+      # the arcs are sorted again on every single call. Sorting once here is
+      # shared by all the subsequent applications of the FST.
+      if not fst.properties(pynini.I_LABEL_SORTED, True):
+        fst = fst.copy().arcsort('ilabel')
       self._fst = fst
 
+    def _MaybeCached(self, operation: str, text: str,
+                     apply_fn: Callable[[str], Any]) -> Any:
+      """Applies the function on text through the result cache, if enabled."""
+      cache = _RESULT_CACHE
+      if cache is None or self._cache_key is None:
+        return apply_fn(text)
+      key = (*self._cache_key, operation, text)
+      found, result = cache.Get(key)
+      if not found:
+        result = apply_fn(text)
+        cache.Put(key, result)
+      return result
+
+    def _MaybeRecorded(self, operation: str, text: str,
+                       apply_fn: Callable[[str], Any]) -> Any:
+      """Applies the function on text, recording the call if enabled."""
+      registry = _METRICS
+      if registry is None or self._cache_key is None:
+        return self._MaybeCached(operation, text, apply_fn)
+      start = time.perf_counter()
+      try:
+        result = self._MaybeCached(operation, text, apply_fn)
+      except FstInputError:
+        registry.Record(*self._cache_key, operation,
+                        time.perf_counter() - start, len(text), error=True)
+        raise
+      registry.Record(*self._cache_key, operation, time.perf_counter() - start,
+                      len(text), len(result) if isinstance(result, str) else 0)
+      return result
+
     def ApplyOnText(self, text: str) -> str:
       """Transduce the given string using the FST.
 
@@ -54,6 +291,9 @@ class Far:
       This operation involves pre-composing the input string with the FST and
       then finding the shortest path to output a resultant string.
       """
+      return self._MaybeRecorded('apply', text, self._ApplyOnText)
+
+    def _ApplyOnText(self, text: str) -> str:
       try:
         # Square brackets and backslash carry special meaning in Pynini.
         # So they need to be escaped for unmanaged strings.
@@ -62,6 +302,32 @@ class Far:
         raise FstInputError(
             f'{error} on the string (between quotes): `{text}`') from error
 
+    def ApplyOnTexts(
+        self, texts: Iterable[str]) -> list[Union[str, FstInputError]]:
+      """Transduce a batch of strings using the FST.
+
+      Args:
+        texts: Input strings to be transduced.
+
+      Returns:
+        Transduced string outputs in the order of the inputs. An input that
+        cannot be transduced does not abort the batch; instead, its
+        FstInputError is returned in place of its output.
+
+      Each distinct input string is transduced only once per batch, which
+      amortizes the cost of the frequent strings in natural language texts.
+      """
+      outputs = {}
+      results = []
+      for text in texts:
+        if text not in outputs:
+          try:
+            outputs[text] = self.ApplyOnText(text)
+          except FstInputError as error:
+            outputs[text] = error
+        results.append(outputs[text])
+      return results
+
     def AcceptText(self, text: str) -> bool:
       """Accept or reject the given string using the FST.
 
@@ -79,21 +345,219 @@ class Far:
       """
       if not self._fst.properties(pynini.ACCEPTOR, True):
         warnings.warn('Underlying WFST is not an acceptor.', RuntimeWarning)
-      lattice = text @ self._fst
+      return self._MaybeRecorded('accept', text, self._AcceptText)
+
+    def _AcceptText(self, text: str) -> bool:
+      # The input is escaped as in `ApplyOnText`.
+      lattice = pynini.escape(text) @ self._fst
       return lattice.start() != pynini.NO_STATE_ID
 
+  class SequentialFstWrapper(FstWrapper):
+    """An FST object wrapper applying the FST by a left-to-right walk.
+
+    The FST is applied as a subsequential transducer, which is determinized on
+    the fly, so no FST is built for an input string. Inputs that cannot be
+    handled that way, such as the ones rejected by the FST, the ones reaching
+    tied paths with different outputs or the ones needing too many
+    determinized states, fall back to composition. The outputs are the same as
+    those of `FstWrapper`.
+    """
+
+    def __init__(self, fst: pynini.Fst,
+                 cache_key: Optional[tuple[str, str]] = None,
+                 token_type: str = 'byte') -> None:
+      """Wraps the FST.
+
+      Args:
+        fst: FST over the tropical semiring to be wrapped.
+        cache_key: See `FstWrapper`.
+        token_type: Token type of the FST labels: `byte` or `utf8`.
+
+      Raises:
+        ValueError: If the FST cannot be applied as a sequential transducer.
+      """
+      super().__init__(fst, cache_key)
+      if token_type not in ('byte', 'utf8'):
+        raise ValueError(f'Unsupported token type: {token_type}')
+      self._token_type = token_type
+      try:
+        self._transducer = sequential.SequentialTransducer(self._fst)
+      except sequential.FallbackError as error:
+        raise ValueError(str(error)) from error
+
+    def _ApplyOnText(self, text: str) -> str:
+      try:
+        if self._token_type == 'byte':
+          labels = self._transducer.Apply(text.encode('utf8'))
+          if labels is not None:
+            return bytes(labels).decode('utf8')
+        else:
+          labels = self._transducer.Apply(map(ord, text))
+          if labels is not None:
+            return ''.join(map(chr, labels))
+      except (sequential.FallbackError, ValueError):
+        # Byte labels above 255 or outputs that are not valid UTF-8 are left
+        # to composition as well.
+        pass
+      # Composition raises the appropriate error if the input is rejected.
+      with pynini.default_token_type(self._token_type):
+        return super()._ApplyOnText(text)
+
+    def _AcceptText(self, text: str) -> bool:
+      labels = (text.encode('utf8') if self._token_type == 'byte' else
+                map(ord, text))
+      try:
+        return self._transducer.Apply(labels) is not None
+      except sequential.FallbackError:
+        pass
+      with pynini.default_token_type(self._token_type):
+        return super()._AcceptText(text)
+
+  class CascadeWrapper(FstWrapper):
+    """A wrapper of the FSTs of a cascade, applied one after another.
+
+    The outputs are the same as those of `FstWrapper` on the composition of
+    the FSTs, without building the composition; see `cascade.Cascade`.
+    """
+
+    def __init__(self, fsts: Iterable[pynini.Fst],
+                 cache_key: Optional[tuple[str, str]] = None) -> None:
+      """Wraps the FSTs.
+
+      Args:
+        fsts: FSTs in the order of their application.
+        cache_key: See `FstWrapper`.
+      """
+      self._cache_key = cache_key
+      self._cascade = cascade.Cascade(fsts)
+
+    def _ApplyOnText(self, text: str) -> str:
+      try:
+        return self._cascade.ApplyOnText(pynini.escape(text))
+      except pynini.FstOpError as error:
+        raise FstInputError(
+            f'{error} on the string (between quotes): `{text}`') from error
+
+    def AcceptText(self, text: str) -> bool:
+      """Accept or reject the given string using the FSTs of the cascade."""
+      return self._MaybeRecorded(
+          'accept', text,
+          lambda text: self._cascade.AcceptText(pynini.escape(text)))
+
   def __init__(self, path_to_far: os.PathLike[str]) -> None:
     # This member variable can be used for debugging info.
     self.path_to_far = path_to_far
+    # The archive reader is stateful: looking up a rule moves its position.
+    self._reader_lock = threading.Lock()
+    # The archive and the FST wrappers, loaded on their first use.
+    self._loaded = SingleFlight()
 
-  # NOTE: Due to a pytype inconvenience with memoize.Memoize, this users of this
-  # and the following function actually have no type information checked
-  # ().
-  @functools.lru_cache(maxsize=None)
   def _LoadFar(self) -> pynini.Far:
-    return pynini.Far(uf.AsResourcePath(self.path_to_far))
+    return self._loaded.Get(
+        'far', lambda: pynini.Far(uf.AsResourcePath(self.path_to_far)))
 
-  @functools.lru_cache(maxsize=None)
-  def Fst(self, rule_name: str) -> 'FstWrapper':
+  def _ReadFst(self, rule_name: str) -> pynini.Fst:
+    far = self._LoadFar()
+    with self._reader_lock:
+      return far[rule_name]
+
+  def RuleNames(self) -> list[str]:
+    """Returns the names of the rules in the archive."""
     far = self._LoadFar()
-    return self.FstWrapper(far[rule_name])
+    names = []
+    with self._reader_lock:
+      far.reset()
+      while not far.done():
+        names.append(far.get_key())
+        far.next()
+      far.reset()
+    return names
+
+  def Fst(self, rule_name: str) -> 'FstWrapper':
+    return self._loaded.Get(('fst', rule_name), lambda: self.FstWrapper(
+        self._ReadFst(rule_name), (os.fspath(self.path_to_far), rule_name)))
+
+  def SequentialFst(self, rule_name: str,
+                    token_type: str = 'byte') -> 'FstWrapper':
+    """Returns the FST to be applied by a left-to-right walk, if possible.
+
+    This is suitable for the functional rules applied on many inputs. If the
+    FST cannot be applied that way, a plain `FstWrapper` is returned.
+
+    Args:
+      rule_name: Name of the FST in the FAR.
+      token_type: Token type of the FST labels: `byte` or `utf8`.
+    """
+    return self._loaded.Get(
+        ('sequential', rule_name, token_type),
+        lambda: self._LoadSequentialFst(rule_name, token_type))
+
+  def _LoadSequentialFst(self, rule_name: str,
+                         token_type: str) -> 'FstWrapper':
+    fst = self._ReadFst(rule_name)
+    cache_key = (os.fspath(self.path_to_far), rule_name)
+    try:
+      return self.SequentialFstWrapper(fst, cache_key, token_type)
+    except ValueError:
+      return self.FstWrapper(fst, cache_key)
+
+  def Cascade(self, rule_name: str) -> 'CascadeWrapper':
+    """Returns the cascade exported by `cascade.Export` under the rule name.
+
+    Args:
+      rule_name: Name of the cascade.
+
+    Raises:
+      KeyError: If the cascade is not in the archive.
+    """
+    return self._loaded.Get(('cascade', rule_name),
+                            lambda: self._LoadCascade(rule_name))
+
+  def _LoadCascade(self, rule_name: str) -> 'CascadeWrapper':
+    stage_names = cascade.StageNames(self.RuleNames(), rule_name)
+    if not stage_names:
+      raise KeyError(f'No cascade in the archive: {rule_name}')
+    return self.CascadeWrapper(
+        [self._ReadFst(stage_name) for stage_name in stage_names],
+        (os.fspath(self.path_to_far), rule_name))
+
+  def Preload(self,
+              rule_names: Optional[Iterable[str]] = None,
+              sequential_rules: bool = False,
+              token_type: str = 'byte',
+              skip_missing: bool = False) -> list[LoadTime]:
+    """Loads the archive and the rules ahead of their first use.
+
+    The loaded rules are the ones later returned by `Fst`, so their first
+    application does not pay for loading them.
+
+    Args:
+      rule_names: Rules to be loaded; all the rules of the archive by default.
+      sequential_rules: Whether to also prepare the rules returned by
+        `SequentialFst`.
+      token_type: Token type of the sequential rules: `byte` or `utf8`.
+      skip_missing: Whether to skip the rules which are not in the archive.
+
+    Returns:
+      The time taken to load the archive, followed by the time taken to load
+      each rule.
+
+    Raises:
+      KeyError: If a rule is not in the archive, unless skipped.
+    """
+    path = os.fspath(self.path_to_far)
+    start = time.perf_counter()
+    self._LoadFar()
+    times = [LoadTime(path, None, time.perf_counter() - start)]
+    if rule_names is None:
+      rule_names = self.RuleNames()
+    elif skip_missing:
+      available = set(self.RuleNames())
+      rule_names = [name for name in rule_names if name in available]
+    for rule_name in rule_names:
+      start = time.perf_counter()
+      self.Fst(rule_name)
+      if sequential_rules:
+        self.SequentialFst(rule_name, token_type)
+      times.append(LoadTime(path, rule_name, time.perf_counter() - start))
+    return times
@@ -0,0 +1,197 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Size and speed of the rules of the FARs, and their regressions.
+
+Each rule of a FAR is measured by its numbers of states and arcs, its size
+when serialized, the time to read it from the FAR, and the time to apply it on
+a sample corpus. The sample of a rule is the inputs of the textproto tests of
+the FAR whose first rule is that one.
+
+The measurements are stored as TSV files, so that a build can be compared with
+the baseline of an earlier one.
+"""
+
+import collections
+from collections.abc import Iterable, Sequence
+import csv
+import os
+import time
+from typing import NamedTuple
+
+from google.protobuf import text_format
+import pynini
+from nisaba.interim.testing import testdata_pb2
+from nisaba.scripts.utils import benchmark
+from nisaba.scripts.utils import far as far_lib
+import nisaba.scripts.utils.file as uf
+
+
+class Measurement(NamedTuple):
+  """Size and speed of a rule of a FAR."""
+  far: str
+  rule: str
+  token_type: str
+  far_bytes: int
+  states: int
+  arcs: int
+  fst_bytes: int
+  load_ms: float
+  samples: int
+  # Mean time to apply the rule on a sample input; NaN without samples.
+  apply_us: float
+
+
+class Regression(NamedTuple):
+  """Metric of a rule worse than in the baseline."""
+  far: str
+  rule: str
+  metric: str
+  baseline: float
+  current: float
+
+  @property
+  def ratio(self) -> float:
+    return self.current / self.baseline if self.baseline else float('inf')
+
+
+# Metrics of the size, which are deterministic, and of the speed.
+SIZE_METRICS = ('far_bytes', 'states', 'arcs', 'fst_bytes')
+TIME_METRICS = ('load_ms', 'apply_us')
+
+# Differences of the time metrics within the timer noise, which are ignored.
+_TIME_NOISE = {'load_ms': 0.1, 'apply_us': 5.0}
+
+
+def TokenType(far_path: os.PathLike[str]) -> str:
+  """Returns the token type of a FAR from its name, e.g. `iso_utf8.far`."""
+  return 'utf8' if os.fspath(far_path).endswith('_utf8.far') else 'byte'
+
+
+def ReadSamples(
+    textproto_paths: Iterable[os.PathLike[str]]) -> dict[str, list[str]]:
+  """Returns the inputs of the textproto tests, by their first rule."""
+  samples = collections.defaultdict(list)
+  for path in textproto_paths:
+    rewrites = text_format.Parse(
+        uf.AsResourcePath(path).read_text(encoding='utf8'),
+        testdata_pb2.Rewrites())
+    for rewrite in rewrites.rewrite:
+      if rewrite.rule:
+        samples[rewrite.rule[0]].append(rewrite.input)
+  return samples
+
+
+def MeasureFar(far_path: os.PathLike[str],
+               textproto_paths: Sequence[os.PathLike[str]] = (),
+               repeats: int = 10) -> list[Measurement]:
+  """Measures the rules of a FAR.
+
+  Args:
+    far_path: Path of the FAR, relative to the runfiles directory or absolute.
+    textproto_paths: Textproto tests of the FAR, for the samples of the rules.
+    repeats: Number of the loads of each rule and of the passes over its
+      samples.
+
+  Returns:
+    The measurements of the rules, in the order of the FAR.
+  """
+  resource_path = uf.AsResourcePath(far_path)
+  far_bytes = resource_path.stat().st_size
+  token_type = TokenType(far_path)
+  samples = ReadSamples(textproto_paths)
+  measurements = []
+  far = pynini.Far(os.fspath(resource_path))
+  for rule_name in far_lib.Far(resource_path).RuleNames():
+    # The minimum times over the repeats are the least affected by the noise
+    # of the machine.
+    load_seconds = []
+    for _ in range(repeats):
+      start = time.perf_counter()
+      fst = far[rule_name]
+      load_seconds.append(time.perf_counter() - start)
+    inputs = samples.get(rule_name, [])
+    apply_us = float('nan')
+    if inputs:
+      wrapper = far_lib.Far.FstWrapper(fst)
+      with pynini.default_token_type(token_type):
+        apply_us = min(
+            benchmark.TimeApply(wrapper.ApplyOnText, inputs).seconds
+            for _ in range(repeats)) / len(inputs) * 1e6
+    measurements.append(Measurement(
+        os.fspath(far_path), rule_name, token_type, far_bytes,
+        fst.num_states(), sum(fst.num_arcs(state) for state in fst.states()),
+        len(fst.write_to_string()), min(load_seconds) * 1e3, len(inputs),
+        apply_us))
+  far.close()
+  return measurements
+
+
+def WriteTsv(path: os.PathLike[str],
+             measurements: Iterable[Measurement]) -> None:
+  with open(path, 'w', encoding='utf8', newline='') as f:
+    writer = csv.writer(f, delimiter='\t', lineterminator='\n')
+    writer.writerow(Measurement._fields)
+    writer.writerows(measurements)
+
+
+def ReadTsv(path: os.PathLike[str]) -> list[Measurement]:
+  with open(path, encoding='utf8', newline='') as f:
+    reader = csv.reader(f, delimiter='\t')
+    next(reader)
+    return [
+        Measurement(*(
+            field_type(value) for field_type, value in zip(
+                Measurement.__annotations__.values(), row)))
+        for row in reader
+    ]
+
+
+def Compare(baseline: Iterable[Measurement],
+            current: Iterable[Measurement],
+            max_size_increase: float = 0.05,
+            max_slowdown: float = 1.0) -> tuple[list[Regression], list[str]]:
+  """Compares the measurements of the rules with their baseline.
+
+  Args:
+    baseline: Measurements of the baseline.
+    current: Measurements of the build to be checked.
+    max_size_increase: Maximum relative increase of the size metrics.
+    max_slowdown: Maximum relative increase of the time metrics, which are
+      noisier and depend on the machine.
+
+  Returns:
+    The regressions, and the `FAR:RULE` names of the rules of the baseline
+    which are missing from the build.
+  """
+  current = {(m.far, m.rule): m for m in current}
+  regressions = []
+  missing = []
+  for base in baseline:
+    measurement = current.get((base.far, base.rule))
+    if measurement is None:
+      missing.append(f'{base.far}:{base.rule}')
+      continue
+    for metrics, max_increase in ((SIZE_METRICS, max_size_increase),
+                                  (TIME_METRICS, max_slowdown)):
+      for metric in metrics:
+        base_value = getattr(base, metric)
+        value = getattr(measurement, metric)
+        # The comparisons with NaN, for the rules without samples, are false.
+        if (value > base_value * (1 + max_increase) and
+            value - base_value > _TIME_NOISE.get(metric, 0)):
+          regressions.append(
+              Regression(base.far, base.rule, metric, base_value, value))
+  return regressions, missing
+
@@ -0,0 +1,111 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.far_benchmark."""
+
+import math
+import os
+import pathlib
+import tempfile
+
+from absl.testing import absltest
+import pynini
+from nisaba.scripts.utils import far_benchmark
+
+_TEXTPROTO = """
+rewrite {
+  rule: "AB"
+  input: "aa"
+  output: "bb"
+}
+rewrite {
+  rule: "AB"
+  rule: "OTHER"
+  input: "a"
+  output: "b"
+}
+rewrite {
+  rule: "OTHER"
+  input: "a"
+  output: "a"
+}
+"""
+
+
+class FarBenchmarkTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    self._dir = pathlib.Path(temp_dir.name)
+    self._far_path = self._dir / 'test_utf8.far'
+    self._fsts = {
+        'AB': pynini.cdrewrite(pynini.cross('a', 'b'), '', '',
+                               pynini.union('a', 'b').star).optimize(),
+        'UNUSED': pynini.accep('c'),
+    }
+    with pynini.Far(os.fspath(self._far_path), 'w') as far:
+      for name, fst in self._fsts.items():
+        far[name] = fst
+    self._textproto_path = self._dir / 'test.textproto'
+    self._textproto_path.write_text(_TEXTPROTO, encoding='utf8')
+
+  def test_read_samples(self):
+    self.assertEqual({'AB': ['aa', 'a'], 'OTHER': ['a']},
+                     far_benchmark.ReadSamples([self._textproto_path]))
+
+  def test_measure_far(self):
+    measurements = far_benchmark.MeasureFar(
+        self._far_path, [self._textproto_path], repeats=2)
+    self.assertEqual(['AB', 'UNUSED'], [m.rule for m in measurements])
+    ab, unused = measurements
+    self.assertEqual('utf8', ab.token_type)
+    self.assertEqual(self._far_path.stat().st_size, ab.far_bytes)
+    self.assertEqual(self._fsts['AB'].num_states(), ab.states)
+    self.assertEqual(len(self._fsts['AB'].write_to_string()), ab.fst_bytes)
+    self.assertEqual(2, ab.samples)
+    self.assertGreater(ab.apply_us, 0)
+    self.assertEqual(0, unused.samples)
+    self.assertTrue(math.isnan(unused.apply_us))
+
+    tsv_path = self._dir / 'baseline.tsv'
+    far_benchmark.WriteTsv(tsv_path, measurements)
+    read = far_benchmark.ReadTsv(tsv_path)
+    self.assertEqual(measurements[0], read[0])
+    self.assertEqual(measurements[1][:-1], read[1][:-1])
+    self.assertTrue(math.isnan(read[1].apply_us))
+
+  def test_compare(self):
+    base = far_benchmark.Measurement(
+        'x.far', 'AB', 'byte', 1000, 10, 20, 300, 1.0, 2, 50.0)
+    unsampled = base._replace(rule='UNUSED', samples=0, apply_us=float('nan'))
+    current = [
+        base._replace(states=11, arcs=30, load_ms=1.05, apply_us=200.0),
+        unsampled._replace(apply_us=float('nan')),
+    ]
+    regressions, missing = far_benchmark.Compare(
+        [base, unsampled, base._replace(rule='GONE')], current,
+        max_size_increase=0.05, max_slowdown=1.0)
+    # The load time is worse, but within the noise of the timer.
+    self.assertEqual([('AB', 'states', 10, 11), ('AB', 'arcs', 20, 30),
+                      ('AB', 'apply_us', 50.0, 200.0)],
+                     [(r.rule, r.metric, r.baseline, r.current)
+                      for r in regressions])
+    self.assertEqual(1.5, regressions[1].ratio)
+    self.assertEqual(['x.far:GONE'], missing)
+
+
+if __name__ == '__main__':
+  absltest.main()
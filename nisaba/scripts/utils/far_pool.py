@@ -0,0 +1,178 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Transduction of large corpora by FAR rules over a pool of processes.
+
+The FSTs are not sent to the worker processes. Instead, each worker loads the
+rules once from their FAR paths and rule names when it starts, and the input
+lines are then sent to the workers in blocks. Applied on a line, the rules
+form a cascade: the output of a rule is the input of the next one. The rules
+are applied by composition, or optionally by the left-to-right walk of
+`far.Far.SequentialFst`.
+
+Where the worker processes are forked, the rules can rather be preloaded in
+the parent process: the forked workers then start without loading anything,
+and share the memory pages of the FSTs with the parent copy-on-write. The FSTs
+are only read by the workers, so these pages stay shared; whereas with the
+rules loaded by each worker, every worker holds its own copy of the FSTs.
+"""
+
+import collections
+from collections.abc import Iterable, Iterator, Sequence
+import functools
+import multiprocessing
+import os
+from typing import Optional, Union
+
+import pynini
+from nisaba.scripts.utils import far
+from nisaba.scripts.utils import normalize_stream
+from nisaba.scripts.utils import parallel
+
+# FAR path and name of a rule in the FAR.
+Rule = tuple[Union[str, os.PathLike[str]], str]
+
+# Rules, token type and whether the rules are walked left-to-right, of a
+# cascade.
+_CascadeKey = tuple[tuple[Rule, ...], str, bool]
+
+# Cascades loaded in this process, inherited by the forked worker processes.
+_CASCADES: dict[_CascadeKey, list[far.Far.FstWrapper]] = {}
+
+
+def LoadRules(rules: Sequence[Rule], token_type: str = 'byte',
+              sequential: bool = False) -> list[far.Far.FstWrapper]:
+  """Loads the rules.
+
+  Args:
+    rules: FAR paths and rule names.
+    token_type: Token type of the rules: `byte` or `utf8`.
+    sequential: Whether the rules are applied by a left-to-right walk where
+      possible, see `far.Far.SequentialFst`, rather than by composition.
+
+  Returns:
+    The wrappers of the rules, in order.
+  """
+  fars = {}
+  wrappers = []
+  for far_path, rule_name in rules:
+    if far_path not in fars:
+      fars[far_path] = far.Far(far_path)
+    if sequential:
+      wrappers.append(fars[far_path].SequentialFst(rule_name, token_type))
+    else:
+      wrappers.append(fars[far_path].Fst(rule_name))
+  return wrappers
+
+
+def _LoadCascade(key: _CascadeKey) -> None:
+  if key not in _CASCADES:
+    _CASCADES[key] = LoadRules(*key)
+
+
+def ApplyCascade(
+    wrappers: Sequence[far.Far.FstWrapper],
+    lines: Sequence[str]) -> list[Union[str, far.FstInputError]]:
+  """Applies the rules in turn on a batch of lines.
+
+  Args:
+    wrappers: Rules to be applied, in order.
+    lines: Input lines.
+
+  Returns:
+    The output of the last rule for each line, or the error of the first rule
+    that cannot transduce it.
+  """
+  outputs = list(lines)
+  for wrapper in wrappers:
+    pending = [i for i, output in enumerate(outputs) if isinstance(output, str)]
+    for i, output in zip(
+        pending, wrapper.ApplyOnTexts(outputs[i] for i in pending)):
+      outputs[i] = output
+  return outputs
+
+
+def _TransduceBlock(
+    key: _CascadeKey,
+    lines: Sequence[str]) -> list[Union[str, far.FstInputError]]:
+  _, token_type, _ = key
+  # The lines are compiled in the token type of the rules for composition.
+  with pynini.default_token_type(token_type):
+    return ApplyCascade(_CASCADES[key], lines)
+
+
+def TransduceLines(
+    rules: Sequence[Rule],
+    lines: Iterable[str],
+    policy: str = 'reject',
+    token_type: str = 'byte',
+    num_workers: Optional[int] = None,
+    block_size: int = 1000,
+    preload: bool = True,
+    sequential: bool = False,
+) -> Iterator[str]:
+  """Transduces the lines by the rules in worker processes, in order.
+
+  Args:
+    rules: FAR paths and rule names of the cascade, in the order of their
+      application. The FAR paths are resolved as in `far.Far`.
+    lines: Input lines without their line breaks.
+    policy: One of `normalize_stream.POLICIES`, for the lines which cannot be
+      transduced: fail on the first one, write an empty line, or write the
+      input line as it is.
+    token_type: Token type of the rules: `byte` or `utf8`.
+    num_workers: Number of worker processes; all the cores by default.
+    block_size: Number of lines sent to a worker at once.
+    preload: Whether to load the rules in this process before forking the
+      workers, which then share them. Ignored if the workers are not forked.
+      The rules are kept loaded in this process for the subsequent calls.
+    sequential: Whether the rules are applied by a left-to-right walk where
+      possible, see `far.Far.SequentialFst`, rather than by composition.
+
+  Yields:
+    The transduced lines, in the order of the input lines.
+
+  Raises:
+    FstInputError: If the policy is `reject` and a line cannot be transduced.
+  """
+  if policy not in normalize_stream.POLICIES:
+    raise ValueError(f'Unknown policy: {policy}')
+  key = (tuple((os.fspath(path), name) for path, name in rules), token_type,
+         sequential)
+  initializer = _LoadCascade
+  if preload and multiprocessing.get_start_method() == 'fork':
+    _LoadCascade(key)
+    initializer = None
+  # The blocks sent to the workers, until their outputs are received.
+  blocks = collections.deque()
+
+  def _ReadBlocks() -> Iterator[list[str]]:
+    for block in parallel.ReadBlocks(lines, block_size):
+      blocks.append(block)
+      yield block
+
+  line_number = 0
+  for outputs in parallel.OrderedMap(
+      functools.partial(_TransduceBlock, key), _ReadBlocks(), num_workers,
+      initializer, (key,)):
+    for line, output in zip(blocks.popleft(), outputs):
+      line_number += 1
+      if isinstance(output, str):
+        yield output
+      elif policy == 'reject':
+        raise far.FstInputError(f'Line {line_number}: {output}')
+      elif policy == 'skip':
+        yield ''
+      else:
+        yield line
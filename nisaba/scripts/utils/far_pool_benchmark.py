@@ -0,0 +1,87 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Benchmarks the memory and the startup time of the corpus transducer.
+
+Compares the workers loading their own copies of the rules with the workers
+forked after the rules are preloaded in the parent process. The memory is
+the total proportional set size (PSS) of the parent and the workers, where
+the pages shared by several processes are only counted once overall. Only
+available on Linux.
+
+```sh
+bazel run -c opt //nisaba/scripts/utils:far_pool_benchmark -- \
+  --rule=$PWD/bazel-bin/nisaba/scripts/brahmic/visual_norm.far:DEVA \
+  --corpus=/tmp/hi_sentences.txt --num_workers=8
+```
+"""
+
+from collections.abc import Sequence
+import multiprocessing
+import time
+
+from absl import app
+from absl import flags
+from nisaba.scripts.utils import benchmark
+from nisaba.scripts.utils import far_pool
+
+_RULES = flags.DEFINE_multi_string(
+    'rule', None, 'Rule of the cascade as `FAR_PATH:RULE_NAME`.',
+    required=True)
+_CORPUS = flags.DEFINE_string(
+    'corpus', None, 'Text file with one sentence per line.', required=True)
+_NUM_WORKERS = flags.DEFINE_integer('num_workers', 4,
+                                    'Number of worker processes.')
+_BLOCK_SIZE = flags.DEFINE_integer(
+    'block_size', 100, 'Number of lines sent to a worker at once.')
+
+
+def _Run(rules: Sequence[far_pool.Rule], lines: Sequence[str],
+         preload: bool) -> tuple[float, float, int, int]:
+  """Returns the times to the first and the last lines, and the memory."""
+  start = time.perf_counter()
+  first_line_seconds = 0.0
+  memory = (0, 0)
+  for num_lines, _ in enumerate(far_pool.TransduceLines(
+      rules, lines, 'passthrough', num_workers=_NUM_WORKERS.value,
+      block_size=_BLOCK_SIZE.value, preload=preload), start=1):
+    if num_lines == 1:
+      first_line_seconds = time.perf_counter() - start
+    if num_lines == len(lines):
+      # The workers are still alive until the last line is consumed.
+      usages = [benchmark.ProcessMemory()] + [
+          benchmark.ProcessMemory(child.pid)
+          for child in multiprocessing.active_children()]
+      memory = (sum(usage.pss for usage in usages),
+                sum(usage.private for usage in usages))
+  return first_line_seconds, time.perf_counter() - start, *memory
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  rules = [tuple(rule.rsplit(':', 1)) for rule in _RULES.value]
+  lines = benchmark.ReadLines(_CORPUS.value)
+  rows = []
+  # The workers loading their own rules run first: once preloaded, the rules
+  # stay loaded in this process and would be inherited by any forked worker.
+  for name, preload in (('per_worker', False), ('preloaded', True)):
+    rows.append((name, *_Run(rules, lines, preload)))
+  print(benchmark.FormatTable(
+      ('mode', 'first_line_sec', 'total_sec', 'total_pss_kb',
+       'total_private_kb'), rows))
+
+
+if __name__ == '__main__':
+  app.run(main)
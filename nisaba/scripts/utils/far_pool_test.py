@@ -0,0 +1,101 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.far_pool."""
+
+import os
+import pathlib
+import tempfile
+
+import pynini
+from absl.testing import absltest
+from nisaba.scripts.utils import far
+from nisaba.scripts.utils import far_pool
+
+_LINES = ['ab', 'x', 'ba b', '', 'bb']
+
+_BRAHMIC_DIR = pathlib.Path('com_google_nisaba/nisaba/scripts/brahmic/')
+
+
+class FarPoolTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    tmp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(tmp_dir.cleanup)
+    self._far_path = os.path.join(tmp_dir.name, 'test.far')
+    with pynini.Far(self._far_path, mode='w') as archive:
+      archive['A_TO_B'] = pynini.union(pynini.cross('a', 'b'), 'b', ' ').star
+      archive['B_TO_C'] = pynini.union(pynini.cross('b', 'c'), ' ').star
+    self._rules = [(self._far_path, 'A_TO_B'), (self._far_path, 'B_TO_C')]
+
+  def testPassthrough(self):
+    for num_workers in (1, 2):
+      with self.subTest(num_workers=num_workers):
+        self.assertEqual(['cc', 'x', 'cc c', '', 'cc'], list(
+            far_pool.TransduceLines(self._rules, _LINES, 'passthrough',
+                                    num_workers=num_workers, block_size=2)))
+
+  def testSkip(self):
+    self.assertEqual(['cc', '', 'cc c', '', 'cc'], list(
+        far_pool.TransduceLines(self._rules, _LINES, 'skip', num_workers=1)))
+
+  def testReject(self):
+    outputs = []
+    with self.assertRaisesRegex(far.FstInputError, 'Line 2: '):
+      for line in far_pool.TransduceLines(self._rules, _LINES, 'reject',
+                                          num_workers=2, block_size=1):
+        outputs.append(line)
+    self.assertEqual(['cc'], outputs)
+
+  def testPreload(self):
+    for preload in (False, True):
+      with self.subTest(preload=preload):
+        self.assertEqual(['cc', 'x', 'cc c', '', 'cc'], list(
+            far_pool.TransduceLines(self._rules, _LINES, 'passthrough',
+                                    num_workers=2, preload=preload)))
+
+  def testLoadError(self):
+    # The errors of the workers loading the rules are raised, rather than
+    # waiting for the workers forever.
+    for rules, error in (([(self._far_path, 'MISSING')], KeyError),
+                         ([(self._far_path + '.missing', 'A_TO_B')], OSError)):
+      for num_workers in (1, 2):
+        with self.subTest(rules=rules, num_workers=num_workers):
+          with self.assertRaises(error):
+            list(far_pool.TransduceLines(rules, _LINES, num_workers=num_workers,
+                                         preload=False))
+
+  def testFromBrahmic(self):
+    # The nukta consonants of Gurmukhi have tied romanizations, which the walk
+    # leaves to composition.
+    iso_far = _BRAHMIC_DIR / 'iso.far'
+    fst = far.Far(iso_far).Fst('FROM_BRAHMIC')
+    lines = ['ਕ਼ਮ ਸ਼ਹਿਰ', 'ਜ਼ਮੀਨ ਫ਼ਲ', 'नमस्ते भारत', 'abc', 'ਖ਼ਬਰ ਗ਼ਜ਼ਲ']
+    expected = [fst.ApplyOnText(line) for line in lines]
+    for sequential in (False, True):
+      with self.subTest(sequential=sequential):
+        self.assertEqual(expected, list(far_pool.TransduceLines(
+            [(iso_far, 'FROM_BRAHMIC')], lines, num_workers=2, block_size=2,
+            sequential=sequential)))
+
+  def testWorkersPreserveOrder(self):
+    lines = ['a' * (n % 7) + ' b' for n in range(300)]
+    expected = [line.replace('a', 'c').replace('b', 'c') for line in lines]
+    self.assertEqual(expected, list(far_pool.TransduceLines(
+        self._rules, lines, num_workers=3, block_size=7)))
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,112 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Checks the size and speed of the built FARs against a baseline.
+
+The rules of the FARs are measured with `far_benchmark`. The suite of the
+shipped FARs and their textproto tests is in `far_regression.flags`. To store
+a baseline and check a later build against it:
+
+```sh
+bazel build -c opt //nisaba/scripts/brahmic/... \
+  //nisaba/scripts/abjad_alphabet/... //nisaba/scripts/natural_translit/...
+bazel run -c opt //nisaba/scripts/utils:far_regression -- --root=$PWD \
+  --flagfile=$PWD/nisaba/scripts/utils/far_regression.flags \
+  --output=/tmp/far_baseline.tsv
+# After the changes:
+bazel run -c opt //nisaba/scripts/utils:far_regression -- --root=$PWD \
+  --flagfile=$PWD/nisaba/scripts/utils/far_regression.flags \
+  --baseline=/tmp/far_baseline.tsv
+```
+
+The program fails if a metric of a rule exceeds its baseline by more than the
+thresholds, or if a rule of the baseline is missing.
+"""
+
+from collections.abc import Sequence
+import math
+import os
+import sys
+
+from absl import app
+from absl import flags
+from nisaba.scripts.utils import benchmark
+from nisaba.scripts.utils import far_benchmark
+
+_FARS = flags.DEFINE_multi_string(
+    'far', None, 'FAR to be measured as `FAR_PATH[:TEXTPROTO_PATH,...]`, '
+    'with the textproto tests of the FAR providing the samples of its rules.',
+    required=True)
+_ROOT = flags.DEFINE_string(
+    'root', None, 'Directory of the relative paths, such as the workspace; '
+    'the runfiles directory if unset.')
+_REPEATS = flags.DEFINE_integer(
+    'repeats', 10,
+    'Number of the loads of each rule and of the passes over its samples.')
+_OUTPUT = flags.DEFINE_string(
+    'output', None, 'Path of the TSV of the measurements, e.g. a new baseline.')
+_BASELINE = flags.DEFINE_string(
+    'baseline', None, 'Path of the TSV of the baseline measurements.')
+_MAX_SIZE_INCREASE = flags.DEFINE_float(
+    'max_size_increase', 0.05,
+    'Maximum relative increase of the numbers of states and arcs and of the '
+    'sizes of the FARs and of the rules.')
+_MAX_SLOWDOWN = flags.DEFINE_float(
+    'max_slowdown', 1.0,
+    'Maximum relative increase of the load and apply times.')
+
+
+def _Path(path: str) -> str:
+  return os.path.join(_ROOT.value, path) if _ROOT.value else path
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  measurements = []
+  for spec in _FARS.value:
+    far_path, _, textprotos = spec.partition(':')
+    textproto_paths = [_Path(path) for path in textprotos.split(',') if path]
+    # The FARs are named by their paths relative to the root, so that the
+    # baselines of different workspaces can be compared.
+    measurements += [
+        measurement._replace(far=far_path)
+        for measurement in far_benchmark.MeasureFar(
+            _Path(far_path), textproto_paths, _REPEATS.value)
+    ]
+  print(benchmark.FormatTable(
+      far_benchmark.Measurement._fields,
+      (['n/a' if isinstance(value, float) and math.isnan(value) else value
+        for value in measurement] for measurement in measurements)))
+  if _OUTPUT.value:
+    far_benchmark.WriteTsv(_OUTPUT.value, measurements)
+  if not _BASELINE.value:
+    return
+  regressions, missing = far_benchmark.Compare(
+      far_benchmark.ReadTsv(_BASELINE.value), measurements,
+      _MAX_SIZE_INCREASE.value, _MAX_SLOWDOWN.value)
+  if regressions:
+    print('\nRegressions:')
+    print(benchmark.FormatTable(
+        ('far', 'rule', 'metric', 'baseline', 'current', 'ratio'),
+        (regression + (regression.ratio,) for regression in regressions)))
+  if missing:
+    print('\nMissing rules:')
+    print('\n'.join(missing))
+  if regressions or missing:
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+  app.run(main)
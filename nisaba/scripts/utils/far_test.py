@@ -14,8 +14,12 @@
 
 """Tests for FAR API."""
 
+from concurrent import futures
 import pathlib
+import threading
+from unittest import mock
 
+import pynini
 from absl.testing import absltest
 from nisaba.scripts.utils import far
 
@@ -34,6 +38,124 @@ class FarTest(absltest.TestCase):
                      self._brahmic_fst.ApplyOnText(
                          '5-[(1-phenylcyclohexyl)amino]pentanoic acid'))
 
+  def testApplyOnTexts(self):
+    self.assertEqual(['kˑlaba', 'abc', 'kˑlaba'],
+                     self._brahmic_fst.ApplyOnTexts(['क़्लब', 'abc', 'क़्लब']))
+    self.assertEmpty(self._brahmic_fst.ApplyOnTexts([]))
+
+  def testApplyOnTextsReportsErrorsPerItem(self):
+    fst = far.Far.FstWrapper(pynini.cross('a', 'b'))
+    outputs = fst.ApplyOnTexts(['a', 'c', 'a'])
+    self.assertEqual('b', outputs[0])
+    self.assertIsInstance(outputs[1], far.FstInputError)
+    self.assertEqual('b', outputs[2])
+
+  def testSequentialFst(self):
+    sequential_fst = far.Far(_BRAHMIC_DIR / 'iso.far').SequentialFst(
+        'FROM_BRAHMIC')
+    for text in ('क़्लब', 'abc', '5-[(1-phenylcyclohexyl)amino]'):
+      self.assertEqual(self._brahmic_fst.ApplyOnText(text),
+                       sequential_fst.ApplyOnText(text))
+
+  def testSequentialFstWrapperRejects(self):
+    fst = far.Far.SequentialFstWrapper(pynini.cross('a', 'b').plus)
+    self.assertEqual('bb', fst.ApplyOnText('aa'))
+    with self.assertRaises(far.FstInputError):
+      fst.ApplyOnText('ac')
+
+  def testSequentialFstTies(self):
+    # The nukta consonants of Gurmukhi have tied romanizations with different
+    # outputs, which are left to composition.
+    iso_far = far.Far(_BRAHMIC_DIR / 'iso.far')
+    sequential_fst = iso_far.SequentialFst('FROM_BRAHMIC')
+    for consonant in 'ਕਖਗਜਫਲਸ':
+      for text in (consonant + '਼', consonant + '਼ਮ', 'ਮ' + consonant + '਼'):
+        self.assertEqual(self._brahmic_fst.ApplyOnText(text),
+                         sequential_fst.ApplyOnText(text))
+
+  def testAcceptTextEscapes(self):
+    accep = pynini.accep(pynini.escape('[a]')).plus
+    for fst in (far.Far.FstWrapper(accep),
+                far.Far.SequentialFstWrapper(accep)):
+      self.assertTrue(fst.AcceptText('[a][a]'))
+      self.assertFalse(fst.AcceptText('[a]b'))
+      self.assertFalse(fst.AcceptText('['))
+
+  def testSequentialFstWrapperAcceptText(self):
+    wellformed_far = far.Far(_BRAHMIC_DIR / 'wellformed.far')
+    for text in ('कल', 'क्ि', 'abc'):
+      self.assertEqual(wellformed_far.Fst('DEVA').AcceptText(text),
+                       wellformed_far.SequentialFst('DEVA').AcceptText(text))
+
+  def testPreload(self):
+    iso_far = far.Far(_BRAHMIC_DIR / 'iso.far')
+    times = iso_far.Preload(['FROM_BRAHMIC', 'TO_DEVA'])
+    self.assertEqual([None, 'FROM_BRAHMIC', 'TO_DEVA'],
+                     [load_time.rule for load_time in times])
+    self.assertIn('TO_DEVA', iso_far.RuleNames())
+    with self.assertRaises(KeyError):
+      iso_far.Preload(['TO_XYZZ'])
+    times = iso_far.Preload(['TO_XYZZ'], skip_missing=True)
+    self.assertEqual([None], [load_time.rule for load_time in times])
+
+  def testConcurrentLoadingIsSingleFlight(self):
+    iso_far = far.Far(_BRAHMIC_DIR / 'iso.far')
+    num_threads = 16
+    barrier = threading.Barrier(num_threads)
+
+    def _GetFst(rule_name):
+      barrier.wait()
+      return iso_far.Fst(rule_name)
+
+    with mock.patch.object(far.pynini, 'Far', wraps=pynini.Far) as load_far:
+      with futures.ThreadPoolExecutor(num_threads) as executor:
+        wrappers = list(executor.map(
+            _GetFst, ['FROM_BRAHMIC', 'TO_DEVA'] * (num_threads // 2)))
+    load_far.assert_called_once()
+    self.assertLen({id(wrapper) for wrapper in wrappers}, 2)
+
+  def testConcurrentApplyOnText(self):
+    iso_far = far.Far(_BRAHMIC_DIR / 'iso.far')
+    texts = ['क़्लब', 'abc', 'नमस्ते', 'भारत', 'कमल'] * 200
+    expected = [self._brahmic_fst.ApplyOnText(text) for text in texts]
+    for fst in (iso_far.Fst('FROM_BRAHMIC'),
+                iso_far.SequentialFst('FROM_BRAHMIC')):
+      with futures.ThreadPoolExecutor(16) as executor:
+        self.assertEqual(expected, list(executor.map(fst.ApplyOnText, texts)))
+
+  def testMetrics(self):
+    registry = far.EnableMetrics()
+    self.addCleanup(far.DisableMetrics)
+    fst = far.Far(_BRAHMIC_DIR / 'iso.far').Fst('FROM_BRAHMIC')
+    fst.ApplyOnTexts(['क़्लब', 'abc', 'क़्लब'])
+    with self.assertRaises(far.FstInputError):
+      far.Far.FstWrapper(pynini.accep('a'), ('a.far', 'A')).ApplyOnText('b')
+    apply_stats = {(rule_stats.rule, rule_stats.operation): rule_stats
+                   for rule_stats in registry.Snapshot()}
+    self.assertEqual(2, apply_stats['FROM_BRAHMIC', 'apply'].calls)
+    self.assertEqual(0, apply_stats['FROM_BRAHMIC', 'apply'].errors)
+    self.assertEqual(1, apply_stats['A', 'apply'].errors)
+
+  def testResultCache(self):
+    cache = far.EnableResultCache(max_entries=10)
+    self.addCleanup(far.DisableResultCache)
+    fst = far.Far(_BRAHMIC_DIR / 'iso.far').Fst('FROM_BRAHMIC')
+    self.assertEqual('kˑlaba', fst.ApplyOnText('क़्लब'))
+    self.assertEqual('kˑlaba', fst.ApplyOnText('क़्लब'))
+    stats = cache.Stats()
+    self.assertEqual(1, stats.hits)
+    self.assertEqual(1, stats.misses)
+    self.assertEqual(1, stats.entries)
+
+  def testResultCacheEviction(self):
+    cache = far.ResultCache(max_entries=2, max_bytes=1024)
+    for text in ('a', 'b', 'c'):
+      cache.Put(('far', 'RULE', 'apply', text), text.upper())
+    self.assertEqual((False, None), cache.Get(('far', 'RULE', 'apply', 'a')))
+    self.assertEqual((True, 'C'), cache.Get(('far', 'RULE', 'apply', 'c')))
+    self.assertEqual(1, cache.Stats().evictions)
+    self.assertEqual(2, cache.Stats().entries)
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -14,9 +14,11 @@
 
 """File access functions used in this package."""
 
+from collections.abc import Callable
 import errno
 import os
 import pathlib
+from typing import Any, TypeVar
 
 import pynini
 from rules_python.python.runfiles import runfiles
@@ -25,6 +27,12 @@ EMPTY: pynini.Fst = pynini.intersect(
     pynini.accep("a"), pynini.accep("b")).optimize()
 EPSILON: pynini.Fst = pynini.accep("").optimize()
 
+_T = TypeVar("_T")
+
+# Parsed data files, by the kind of the parse and the resolved path and
+# modification time of the file.
+_PARSED_FILES: dict[tuple[str, str, int], Any] = {}
+
 
 def AsResourcePath(filename: os.PathLike[str]) -> os.PathLike[str]:
   filename = os.fspath(filename)
@@ -47,10 +55,41 @@ def OnEmpty(fst, return_if_empty=EMPTY):
   return return_if_empty if fst.start() == pynini.NO_STATE_ID else fst
 
 
+def DefaultTokenType() -> str:
+  """Returns the default token type of the string compilation, byte or utf8."""
+  # Pynini has no getter of the default token type, but a multi-byte character
+  # is compiled into a single arc only in utf8 mode.
+  return "utf8" if pynini.accep("\u200C").num_states() == 2 else "byte"
+
+
+def CachedParse(filename: os.PathLike[str], kind: str,
+                parse_fn: Callable[[pathlib.Path], _T]) -> _T:
+  """Returns the parse of a resource file, parsing it once per process.
+
+  The same data files are read by many FST builds of a generator, e.g. once
+  per script and token type, so their parses are cached until the files are
+  modified.
+
+  Args:
+    filename: Path of the file, relative to the runfiles directory.
+    kind: Kind of the parse, distinguishing the parses of the same file.
+    parse_fn: Function parsing the file at the given absolute path. Its result
+      is shared by the callers, so it should not be modified.
+  """
+  path = pathlib.Path(AsResourcePath(filename)).resolve()
+  key = (kind, os.fspath(path), path.stat().st_mtime_ns)
+  if key not in _PARSED_FILES:
+    _PARSED_FILES[key] = parse_fn(path)
+  return _PARSED_FILES[key]
+
+
 def StringFile(filename: os.PathLike[str],
                return_if_empty: pynini.Fst = EMPTY) -> pynini.Fst:
   """Reads FST from `filename`. If FST is empty returns `return_if_empty`."""
-  return OnEmpty(pynini.string_file(AsResourcePath(filename)), return_if_empty)
+  fst = CachedParse(filename, f"string_file:{DefaultTokenType()}",
+                    pynini.string_file)
+  # The callers may modify their FST in place.
+  return OnEmpty(fst.copy(), return_if_empty)
 
 
 def QuesSafe(fst: pynini.Fst) -> pynini.Fst:
@@ -63,12 +102,19 @@ def StarSafe(fst: pynini.Fst) -> pynini.Fst:
   return OnEmpty(fst, EPSILON).star
 
 
+def FarPath(
+    far_dir: pathlib.Path, far_name: str, token_type: str
+) -> pathlib.Path:
+  """Returns the path of the FAR generated for the token type."""
+  tt_suffix = {"byte": "", "utf8": "_utf8"}[token_type]
+  return far_dir / f"{far_name}{tt_suffix}.far"
+
+
 def OpenFar(
     far_dir: pathlib.Path, far_name: str, token_type: str
 ) -> pynini.Far:
-  tt_suffix = {"byte": "", "utf8": "_utf8"}[token_type]
-  far_path = far_dir / f"{far_name}{tt_suffix}.far"
-  return pynini.Far(AsResourcePath(far_path), "r")
+  return pynini.Far(AsResourcePath(FarPath(far_dir, far_name, token_type)),
+                    "r")
 
 
 def OpenFstFromFar(
@@ -82,8 +128,7 @@ def OpenFstFromFarSafe(
     far_dir: pathlib.Path, far_name: str, token_type: str, fst_name: str,
     default: pynini.Fst) -> pynini.Fst:
   """Returns FST from a given FAR; returns default if FST is not found."""
-  tt_suffix = {"byte": "", "utf8": "_utf8"}[token_type]
-  far_path = far_dir / f"{far_name}{tt_suffix}.far"
+  far_path = FarPath(far_dir, far_name, token_type)
   if not IsFileExist(far_path):
     return default
   with pynini.Far(AsResourcePath(far_path), "r") as far:
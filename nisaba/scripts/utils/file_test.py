@@ -0,0 +1,70 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.file."""
+
+import os
+import pathlib
+import tempfile
+
+from absl.testing import absltest
+import pynini
+import nisaba.scripts.utils.file as uf
+
+
+class FileTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    self._path = pathlib.Path(temp_dir.name) / 'data.tsv'
+    self._path.write_text('a\tb\n', encoding='utf8')
+    self._num_parses = 0
+
+  def _Parse(self, path: pathlib.Path) -> str:
+    self._num_parses += 1
+    return path.read_text(encoding='utf8')
+
+  def testCachedParse(self):
+    self.assertEqual(uf.CachedParse(self._path, 'text', self._Parse), 'a\tb\n')
+    self.assertEqual(uf.CachedParse(self._path, 'text', self._Parse), 'a\tb\n')
+    self.assertEqual(self._num_parses, 1)
+    # The file is parsed again by another kind of parse, or once modified.
+    uf.CachedParse(self._path, 'other', self._Parse)
+    self.assertEqual(self._num_parses, 2)
+    self._path.write_text('c\td\n', encoding='utf8')
+    stat = self._path.stat()
+    os.utime(self._path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    self.assertEqual(uf.CachedParse(self._path, 'text', self._Parse), 'c\td\n')
+    self.assertEqual(self._num_parses, 3)
+
+  def testStringFile(self):
+    for token_type in ('byte', 'utf8'):
+      with pynini.default_token_type(token_type):
+        self.assertEqual(uf.DefaultTokenType(), token_type)
+        fst = uf.StringFile(self._path)
+        self.assertTrue(pynini.equal(fst, pynini.cross('a', 'b')))
+        # The cached FST is not modified by its callers.
+        fst.union('c')
+        self.assertTrue(
+            pynini.equal(uf.StringFile(self._path), pynini.cross('a', 'b')))
+
+  def testStringFileEmpty(self):
+    self._path.write_text('', encoding='utf8')
+    self.assertIs(uf.StringFile(self._path, uf.EPSILON), uf.EPSILON)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,57 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.metrics."""
+
+import json
+
+from absl.testing import absltest
+from nisaba.scripts.utils import metrics
+
+
+class MetricsTest(absltest.TestCase):
+
+  def testSnapshot(self):
+    registry = metrics.Registry()
+    for n in range(1, 101):
+      registry.Record('a.far', 'RULE', 'apply', n / 1000, 4, 6)
+    registry.Record('a.far', 'RULE', 'apply', 0.5, 4, error=True)
+    registry.Record('a.far', 'RULE', 'accept', 0.0, 2)
+    apply_stats, accept_stats = registry.Snapshot()
+    self.assertEqual(('RULE', 'apply', 101, 1),
+                     (apply_stats.rule, apply_stats.operation,
+                      apply_stats.calls, apply_stats.errors))
+    self.assertAlmostEqual(5550.0, apply_stats.total_ms)
+    self.assertAlmostEqual(50.0, apply_stats.p50_ms, delta=2.5)
+    self.assertAlmostEqual(90.0, apply_stats.p90_ms, delta=4.5)
+    self.assertAlmostEqual(4.0, apply_stats.mean_input_length)
+    self.assertAlmostEqual(6.0, apply_stats.mean_output_length)
+    self.assertEqual(('accept', 1, 0), (accept_stats.operation,
+                                        accept_stats.calls,
+                                        accept_stats.errors))
+
+  def testDump(self):
+    registry = metrics.Registry()
+    registry.Record('a.far', 'RULE', 'apply', 0.001, 3, 3)
+    self.assertEqual(['RULE'], [rule_stats['rule'] for rule_stats in
+                                json.loads(registry.ToJson())])
+    header, row = registry.FormatTable().split('\n')
+    self.assertTrue(header.startswith('far\trule\toperation\tcalls'))
+    self.assertTrue(row.startswith('a.far\tRULE\tapply\t1\t0\t'))
+    registry.Reset()
+    self.assertEmpty(registry.Snapshot())
+
+
+if __name__ == '__main__':
+  absltest.main()
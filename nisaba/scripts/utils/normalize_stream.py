@@ -0,0 +1,210 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming normalization of text lines over a pool of processes.
+
+The normalizer is any object with the interface of `brahmic.NormalizingAcceptor`
+or `abjad_alphabet.Normalizer`: an `accept_pat` matching the words, and
+`ApplyOnText` / `ApplyOnWord` methods raising ValueError on the words that
+cannot be normalized. The normalizer is built once in each worker process.
+
+The words that cannot be normalized are handled according to a policy:
+
+  reject: Fail on the first line with such a word.
+  skip: Remove the word from the line.
+  passthrough: Keep the word as it is.
+"""
+
+from collections.abc import Callable, Iterable, Iterator, Sequence
+import contextlib
+import sys
+import time
+from typing import Any, NamedTuple, Optional, TextIO
+
+from nisaba.scripts.utils import parallel
+
+POLICIES = ('reject', 'skip', 'passthrough')
+
+
+class StreamStats(NamedTuple):
+  """Counts and wall time of a normalization run."""
+  lines: int
+  words: int
+  ill_formed_words: int
+  seconds: float
+
+  @property
+  def lines_per_second(self) -> float:
+    return self.lines / self.seconds if self.seconds else float('inf')
+
+  @property
+  def words_per_second(self) -> float:
+    return self.words / self.seconds if self.seconds else float('inf')
+
+
+class _BlockResult(NamedTuple):
+  lines: list[str]
+  words: int
+  ill_formed_words: int
+  # The rejected word, if any, in the line following the lines above.
+  rejected: Optional[str]
+
+
+class LineNormalizer:
+  """Normalizes lines applying a policy on the ill-formed words."""
+
+  def __init__(self, normalizer: Any, policy: str = 'reject') -> None:
+    if policy not in POLICIES:
+      raise ValueError(f'Unknown policy: {policy}')
+    self._normalizer = normalizer
+    self._policy = policy
+
+  def ApplyOnBlock(self, lines: Sequence[str]) -> _BlockResult:
+    """Normalizes a block of lines, stopping at a rejected line, if any."""
+    norm_lines = []
+    num_words = 0
+    num_ill_formed = 0
+    for line in lines:
+      words = self._normalizer.accept_pat.findall(line)
+      num_words += len(words)
+      try:
+        norm_lines.append(self._normalizer.ApplyOnText(line))
+        continue
+      except ValueError:
+        pass
+      # Only the lines with an ill-formed word take the per-word path.
+      ill_formed = []
+
+      def _ApplyOnWord(match):
+        try:
+          return self._normalizer.ApplyOnWord(match.group(0))
+        except ValueError:
+          ill_formed.append(match.group(0))
+          return '' if self._policy == 'skip' else match.group(0)
+
+      norm_line = self._normalizer.accept_pat.sub(_ApplyOnWord, line)
+      num_ill_formed += len(ill_formed)
+      if ill_formed and self._policy == 'reject':
+        return _BlockResult(norm_lines, num_words, num_ill_formed,
+                            ill_formed[0])
+      norm_lines.append(norm_line)
+    return _BlockResult(norm_lines, num_words, num_ill_formed, None)
+
+
+# Line normalizer of the worker process.
+_LINE_NORMALIZER: Optional[LineNormalizer] = None
+
+
+def _InitWorker(make_normalizer: Callable[..., Any],
+                normalizer_args: Sequence[Any], policy: str) -> None:
+  global _LINE_NORMALIZER
+  _LINE_NORMALIZER = LineNormalizer(make_normalizer(*normalizer_args), policy)
+
+
+def _ApplyOnBlock(lines: list[str]) -> _BlockResult:
+  return _LINE_NORMALIZER.ApplyOnBlock(lines)
+
+
+def NormalizeLines(
+    make_normalizer: Callable[..., Any],
+    normalizer_args: Sequence[Any],
+    lines: Iterable[str],
+    policy: str = 'reject',
+    num_workers: Optional[int] = None,
+    block_size: int = 1000,
+) -> Iterator[tuple[list[str], int, int]]:
+  """Normalizes the lines in worker processes, preserving their order.
+
+  Args:
+    make_normalizer: Picklable callable building the normalizer, such as the
+      `brahmic.NormalizingAcceptor` class.
+    normalizer_args: Picklable arguments of `make_normalizer`.
+    lines: Lines without their line breaks.
+    policy: One of `POLICIES`.
+    num_workers: Number of worker processes; all the cores by default.
+    block_size: Number of lines sent to a worker at once.
+
+  Yields:
+    Blocks of the normalized lines, along with the numbers of the words and
+    the ill-formed words in each block. With the `reject` policy, the block of
+    a rejected line ends just before it.
+
+  Raises:
+    ValueError: If the policy is `reject` and a line has an ill-formed word.
+  """
+  if policy not in POLICIES:
+    raise ValueError(f'Unknown policy: {policy}')
+  line_offset = 0
+  for result in parallel.OrderedMap(
+      _ApplyOnBlock, parallel.ReadBlocks(lines, block_size), num_workers,
+      _InitWorker, (make_normalizer, normalizer_args, policy)):
+    # The lines before a rejected one are still yielded.
+    yield result.lines, result.words, result.ill_formed_words
+    line_offset += len(result.lines)
+    if result.rejected is not None:
+      raise ValueError(f'Line {line_offset + 1}: Cannot normalize word: '
+                       f'{result.rejected!r}')
+
+
+@contextlib.contextmanager
+def OpenText(path: str, mode: str) -> Iterator[TextIO]:
+  """Opens a UTF-8 text file, where `-` is the standard input/output."""
+  if path == '-':
+    stream = sys.stdin if 'r' in mode else sys.stdout
+    stream.reconfigure(encoding='utf8')
+    yield stream
+  else:
+    with open(path, mode, encoding='utf8') as f:
+      yield f
+
+
+def NormalizeFile(
+    make_normalizer: Callable[..., Any],
+    normalizer_args: Sequence[Any],
+    input_path: str = '-',
+    output_path: str = '-',
+    policy: str = 'reject',
+    num_workers: Optional[int] = None,
+    block_size: int = 1000,
+) -> StreamStats:
+  """Normalizes a text file line by line; see `NormalizeLines`.
+
+  Args:
+    make_normalizer: Picklable callable building the normalizer.
+    normalizer_args: Picklable arguments of `make_normalizer`.
+    input_path: Input file, or `-` for the standard input.
+    output_path: Output file, or `-` for the standard output.
+    policy: One of `POLICIES`.
+    num_workers: Number of worker processes; all the cores by default.
+    block_size: Number of lines sent to a worker at once.
+
+  Returns:
+    Counts and wall time of the run.
+  """
+  num_lines = num_words = num_ill_formed = 0
+  start = time.perf_counter()
+  with OpenText(input_path, 'r') as input_file, OpenText(
+      output_path, 'w') as output_file:
+    lines = (line.rstrip('\n') for line in input_file)
+    for norm_lines, words, ill_formed in NormalizeLines(
+        make_normalizer, normalizer_args, lines, policy, num_workers,
+        block_size):
+      for line in norm_lines:
+        output_file.write(line)
+        output_file.write('\n')
+      num_lines += len(norm_lines)
+      num_words += words
+      num_ill_formed += ill_formed
+  return StreamStats(num_lines, num_words, num_ill_formed,
+                     time.perf_counter() - start)
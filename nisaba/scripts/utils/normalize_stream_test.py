@@ -0,0 +1,106 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.normalize_stream."""
+
+import os
+import re
+import tempfile
+
+from absl.testing import absltest
+from nisaba.scripts.utils import normalize_stream
+
+
+class _UpperCaser:
+  """Upper-cases the words, rejecting the ones with digits."""
+
+  def __init__(self, ignore: str) -> None:
+    self.accept_pat = re.compile(f'[^{re.escape(ignore)}]+')
+
+  def ApplyOnWord(self, word: str) -> str:
+    if any(c.isdigit() for c in word):
+      raise ValueError(word)
+    return word.upper()
+
+  def ApplyOnText(self, line: str) -> str:
+    return self.accept_pat.sub(lambda m: self.ApplyOnWord(m.group(0)), line)
+
+
+def _UnsupportedNormalizer(ignore: str) -> _UpperCaser:
+  raise ValueError(f'Unsupported: {ignore!r}')
+
+
+_LINES = ['ab cd', 'e1 fg', '', 'h 2 i', 'jk']
+
+
+class NormalizeStreamTest(absltest.TestCase):
+
+  def _Normalize(self, lines, policy, num_workers=1, block_size=2):
+    norm_lines = []
+    num_words = num_ill_formed = 0
+    for block, words, ill_formed in normalize_stream.NormalizeLines(
+        _UpperCaser, (' ',), lines, policy, num_workers, block_size):
+      norm_lines.extend(block)
+      num_words += words
+      num_ill_formed += ill_formed
+    return norm_lines, num_words, num_ill_formed
+
+  def testPassthrough(self):
+    self.assertEqual((['AB CD', 'e1 FG', '', 'H 2 I', 'JK'], 8, 2),
+                     self._Normalize(_LINES, 'passthrough'))
+
+  def testSkip(self):
+    self.assertEqual((['AB CD', ' FG', '', 'H  I', 'JK'], 8, 2),
+                     self._Normalize(_LINES, 'skip'))
+
+  def testReject(self):
+    self.assertEqual((['AB CD', 'EF'], 3, 0),
+                     self._Normalize(['ab cd', 'ef'], 'reject'))
+    norm_lines = []
+    with self.assertRaisesRegex(ValueError, "Line 2: .*'e1'"):
+      for block, _, _ in normalize_stream.NormalizeLines(
+          _UpperCaser, (' ',), _LINES, 'reject', 1, 4):
+        norm_lines.extend(block)
+    self.assertEqual(['AB CD'], norm_lines)
+
+  def testWorkersPreserveOrder(self):
+    lines = [f'w{n} x' for n in range(500)]
+    self.assertEqual(self._Normalize(lines, 'skip', num_workers=1),
+                     self._Normalize(lines, 'skip', num_workers=4,
+                                     block_size=3))
+
+  def testNormalizerError(self):
+    for num_workers in (1, 2):
+      with self.subTest(num_workers=num_workers):
+        with self.assertRaisesRegex(ValueError, "Unsupported: ' '"):
+          list(normalize_stream.NormalizeLines(
+              _UnsupportedNormalizer, (' ',), _LINES, 'reject', num_workers))
+
+  def testNormalizeFile(self):
+    tmp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(tmp_dir.cleanup)
+    input_path = os.path.join(tmp_dir.name, 'input.txt')
+    output_path = os.path.join(tmp_dir.name, 'output.txt')
+    with open(input_path, 'w', encoding='utf8') as f:
+      f.write('\n'.join(_LINES) + '\n')
+    stats = normalize_stream.NormalizeFile(
+        _UpperCaser, (' ',), input_path, output_path, 'passthrough',
+        num_workers=2, block_size=1)
+    with open(output_path, encoding='utf8') as f:
+      self.assertEqual('AB CD\ne1 FG\n\nH 2 I\nJK\n', f.read())
+    self.assertEqual((5, 8, 2), stats[:3])
+
+
+if __name__ == '__main__':
+  absltest.main()
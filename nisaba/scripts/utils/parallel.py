@@ -0,0 +1,168 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Order preserving application of a function over a pool of processes.
+
+Pynini objects are not cheaply shared across processes, so the workers are
+expected to build their own grammars once, through the `initializer`, and the
+inputs are sent to them in blocks to amortize the inter-process overhead.
+
+By default, one worker per core is started, but at most four under Bazel,
+which runs several actions and tests at once. The `NISABA_NUM_WORKERS`
+environment variable overrides the default; Bazel passes it to the grammar
+generators with `--action_env`, e.g.:
+
+```sh
+bazel build --action_env=NISABA_NUM_WORKERS=16 //nisaba/scripts/brahmic:all
+```
+"""
+
+import collections
+from collections.abc import Callable, Iterable, Iterator, Sequence
+import functools
+import itertools
+import multiprocessing
+import os
+from typing import Any, Optional, TypeVar
+
+_T = TypeVar('_T')
+_R = TypeVar('_R')
+
+# Environment variable overriding the number of cores, e.g. for the grammar
+# generators run by Bazel, which cannot be passed flags.
+_NUM_WORKERS_ENV = 'NISABA_NUM_WORKERS'
+
+# Environment variables set by Bazel for the binaries and tests it runs.
+_BAZEL_ENVS = ('TEST_SRCDIR', 'RUNFILES_DIR', 'PYTHON_RUNFILES')
+
+# Default maximum number of workers under Bazel, which already runs its actions
+# and tests in parallel, so that they do not each start one worker per core.
+_BAZEL_MAX_WORKERS = 4
+
+# Number of blocks in flight per worker. Bounds the memory used by the inputs
+# that are read ahead and by the results that are not yet consumed.
+_BLOCKS_PER_WORKER = 4
+
+
+def DefaultNumWorkers() -> int:
+  """Returns the number of cores available to this process."""
+  try:
+    return len(os.sched_getaffinity(0))
+  except AttributeError:
+    return os.cpu_count() or 1
+
+
+def NumWorkers(num_tasks: int) -> int:
+  """Returns the number of worker processes for a number of tasks.
+
+  Args:
+    num_tasks: Number of the tasks; no more workers than tasks are started.
+
+  Returns:
+    The value of the `NISABA_NUM_WORKERS` environment variable if set, or else
+    the number of cores available to this process, at most four under Bazel,
+    bounded by the number of tasks.
+  """
+  num_workers = os.environ.get(_NUM_WORKERS_ENV)
+  if num_workers:
+    num_workers = int(num_workers)
+  else:
+    num_workers = DefaultNumWorkers()
+    if any(os.environ.get(env) for env in _BAZEL_ENVS):
+      num_workers = min(num_workers, _BAZEL_MAX_WORKERS)
+  return max(1, min(num_workers, num_tasks))
+
+
+def ReadBlocks(items: Iterable[_T], block_size: int) -> Iterator[list[_T]]:
+  """Splits the items into consecutive blocks of at most `block_size` items."""
+  if block_size < 1:
+    raise ValueError(f'Block size should be positive: {block_size}')
+  items = iter(items)
+  while block := list(itertools.islice(items, block_size)):
+    yield block
+
+
+# Error of the initializer of this worker process, if any.
+_INIT_ERROR: Optional[BaseException] = None
+
+
+def _InitWorker(initializer: Optional[Callable[..., None]],
+                initargs: Sequence[Any]) -> None:
+  """Runs the initializer, keeping its error for the items of the worker.
+
+  A pool replaces the workers whose initializer raises, which would fail in
+  turn, so the error is rather raised on the first item of the worker.
+  """
+  global _INIT_ERROR
+  _INIT_ERROR = None
+  if initializer is None:
+    return
+  try:
+    initializer(*initargs)
+  except Exception as error:  # pylint: disable=broad-except
+    _INIT_ERROR = error
+
+
+def _Apply(fn: Callable[[_T], _R], item: _T) -> _R:
+  if _INIT_ERROR is not None:
+    raise _INIT_ERROR
+  return fn(item)
+
+
+def OrderedMap(
+    fn: Callable[[_T], _R],
+    items: Iterable[_T],
+    num_workers: Optional[int] = None,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Sequence[Any] = (),
+) -> Iterator[_R]:
+  """Applies a function on the items in worker processes, in the input order.
+
+  The items are consumed lazily, so that large inputs can be streamed: only a
+  few items per worker are in flight at any time.
+
+  Args:
+    fn: Picklable function to be applied on each item, typically a module level
+      function using the state set up by `initializer`.
+    items: Inputs of the function; typically blocks from `ReadBlocks`.
+    num_workers: Number of worker processes; all the cores by default. With a
+      single worker, the function is applied in this process.
+    initializer: Picklable function called once in each worker process before
+      any item is processed.
+    initargs: Arguments of the initializer.
+
+  Yields:
+    The results of the function on the items in the order of the items.
+
+  Raises:
+    Exception: The error of the initializer, if it fails, or of the function
+      on an item.
+  """
+  if num_workers is None:
+    num_workers = DefaultNumWorkers()
+  if num_workers <= 1:
+    if initializer is not None:
+      initializer(*initargs)
+    yield from map(fn, items)
+    return
+  apply_fn = functools.partial(_Apply, fn)
+  with multiprocessing.Pool(num_workers, _InitWorker,
+                            (initializer, initargs)) as pool:
+    pending = collections.deque()
+    for item in items:
+      pending.append(pool.apply_async(apply_fn, (item,)))
+      if len(pending) >= num_workers * _BLOCKS_PER_WORKER:
+        yield pending.popleft().get()
+    while pending:
+      yield pending.popleft().get()
@@ -0,0 +1,87 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.parallel."""
+
+import os
+from unittest import mock
+
+from absl.testing import absltest
+from nisaba.scripts.utils import parallel
+
+_OFFSET = 0
+
+
+def _SetOffset(offset: int) -> None:
+  global _OFFSET
+  _OFFSET = offset
+
+
+def _FailToInit(message: str) -> None:
+  raise ValueError(message)
+
+
+def _AddOffset(block: list[int]) -> tuple[int, list[int]]:
+  return os.getpid(), [_OFFSET + n for n in block]
+
+
+class ParallelTest(absltest.TestCase):
+
+  def testReadBlocks(self):
+    self.assertEqual([[0, 1, 2], [3, 4, 5], [6]],
+                     list(parallel.ReadBlocks(range(7), 3)))
+    self.assertEqual([], list(parallel.ReadBlocks([], 3)))
+    with self.assertRaises(ValueError):
+      list(parallel.ReadBlocks(range(7), 0))
+
+  def testNumWorkers(self):
+    with mock.patch.dict(os.environ, {'NISABA_NUM_WORKERS': '3'}):
+      self.assertEqual(3, parallel.NumWorkers(10))
+      self.assertEqual(2, parallel.NumWorkers(2))
+      self.assertEqual(1, parallel.NumWorkers(0))
+    with mock.patch.dict(os.environ, clear=True):
+      self.assertEqual(min(parallel.DefaultNumWorkers(), 10),
+                       parallel.NumWorkers(10))
+      # Bazel runs its actions and tests in parallel.
+      os.environ['TEST_SRCDIR'] = '/runfiles'
+      self.assertEqual(min(parallel.DefaultNumWorkers(), 4),
+                       parallel.NumWorkers(10))
+      self.assertEqual(1, parallel.NumWorkers(1))
+      os.environ['NISABA_NUM_WORKERS'] = '3'
+      self.assertEqual(3, parallel.NumWorkers(10))
+
+  def testOrderedMap(self):
+    blocks = list(parallel.ReadBlocks(range(1000), 7))
+    for num_workers in (1, 3):
+      with self.subTest(num_workers=num_workers):
+        results = list(parallel.OrderedMap(
+            _AddOffset, blocks, num_workers, _SetOffset, (100,)))
+        self.assertEqual(list(range(100, 1100)),
+                         [n for _, block in results for n in block])
+        if num_workers == 1:
+          self.assertEqual({os.getpid()}, {pid for pid, _ in results})
+        else:
+          self.assertNotIn(os.getpid(), {pid for pid, _ in results})
+
+  def testOrderedMapInitializerError(self):
+    blocks = list(parallel.ReadBlocks(range(100), 7))
+    for num_workers in (1, 3):
+      with self.subTest(num_workers=num_workers):
+        with self.assertRaisesRegex(ValueError, 'Bad argument'):
+          list(parallel.OrderedMap(_AddOffset, blocks, num_workers,
+                                   _FailToInit, ('Bad argument',)))
+
+
+if __name__ == '__main__':
+  absltest.main()
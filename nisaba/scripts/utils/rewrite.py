@@ -14,13 +14,28 @@
 
 """CDRewrite related utility functions."""
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
 
 import pynini
 from pynini.lib import byte
+from nisaba.scripts.utils import build_profile
 from nisaba.scripts.utils import file
 
+# Orders in which `ComposeFsts` composes the FSTs:
+#
+#   greedy: Adjacent FSTs with the minimum product of the numbers of states are
+#     composed first.
+#   chain: The order with the minimum estimated cost, as for the multiplication
+#     of a chain of matrices; see `_Estimate`. Suits cascades of rewrites which
+#     are defined over the whole of sigma star.
+#   sequential: From left to right. Suits cascades whose first FST restricts
+#     the input, such as an input string or the grammars in language_params, as
+#     each result is then bounded by the restricted input.
+PLANNERS = ('greedy', 'chain', 'sequential')
+
 
+@build_profile.Profiled
 def Rewrite(rule: pynini.FstLike,
             sigma: pynini.Fst = byte.BYTE,
             left: pynini.FstLike = "",
@@ -28,25 +43,141 @@ def Rewrite(rule: pynini.FstLike,
   return pynini.optimize(pynini.cdrewrite(rule, left, right, sigma.star))
 
 
+class _Estimate(NamedTuple):
+  """Cost model of an FST, or of the composition of a range of FSTs.
+
+  The size is the number of states and arcs. Composing two FSTs explores pairs
+  of their states and arcs, so the cost is the product of their sizes; it is
+  doubled when the epsilon filter is needed, that is, when the output of the
+  left FST and the input of the right FST both have epsilons, and halved when
+  the matching of their labels is deterministic on either side. The cascades
+  of rewrites mostly keep their sizes, so the size of a composition is
+  estimated as the sum of the sizes.
+  """
+  size: float
+  input_epsilons: bool
+  output_epsilons: bool
+  input_deterministic: bool
+  output_deterministic: bool
+
+  @classmethod
+  def FromFst(cls, fst: pynini.Fst) -> "_Estimate":
+    props = fst.properties(
+        pynini.I_EPSILONS | pynini.O_EPSILONS | pynini.I_DETERMINISTIC |
+        pynini.O_DETERMINISTIC, True)
+    return cls(
+        fst.num_states() + sum(fst.num_arcs(state) for state in fst.states()),
+        bool(props & pynini.I_EPSILONS), bool(props & pynini.O_EPSILONS),
+        bool(props & pynini.I_DETERMINISTIC),
+        bool(props & pynini.O_DETERMINISTIC))
+
+  def CompositionCost(self, right: "_Estimate") -> float:
+    cost = self.size * right.size
+    if self.output_epsilons and right.input_epsilons:
+      cost *= 2
+    if self.output_deterministic or right.input_deterministic:
+      cost /= 2
+    return cost
+
+  def Compose(self, right: "_Estimate") -> "_Estimate":
+    return _Estimate(
+        self.size + right.size,
+        self.input_epsilons, right.output_epsilons,
+        self.input_deterministic and right.input_deterministic,
+        self.output_deterministic and right.output_deterministic)
+
+
+def _ChainSplits(estimates: Sequence[_Estimate]) -> dict[tuple[int, int], int]:
+  """Returns the optimal split of each range of the FSTs by dynamic programming.
+
+  Args:
+    estimates: Cost model of each FST.
+
+  Returns:
+    For the FSTs in the range [i, j], with i < j, the index k s.t. the
+    compositions of [i, k] and [k + 1, j] are composed last.
+  """
+  costs = {(i, i): 0.0 for i in range(len(estimates))}
+  range_estimates = {(i, i): estimate for i, estimate in enumerate(estimates)}
+  splits = {}
+  for length in range(2, len(estimates) + 1):
+    for i in range(len(estimates) - length + 1):
+      j = i + length - 1
+      best = None
+      for k in range(i, j):
+        cost = (costs[i, k] + costs[k + 1, j] + range_estimates[
+            i, k].CompositionCost(range_estimates[k + 1, j]))
+        if best is None or cost < best[0]:
+          best = cost, k
+      costs[i, j], k = best
+      splits[i, j] = k
+      range_estimates[i, j] = range_estimates[i, k].Compose(
+          range_estimates[k + 1, j])
+  return splits
+
+
+@build_profile.Profiled
 def ComposeFsts(fsts: Iterable[pynini.Fst],
-                default: pynini.Fst = file.EMPTY) -> pynini.Fst:
-  """Composes together optimized FSTs, ordered by a heuristics for speed."""
+                default: pynini.Fst = file.EMPTY,
+                planner: str = "greedy",
+                defer_optimize: bool = False) -> pynini.Fst:
+  """Composes together optimized FSTs, ordered by a heuristics for speed.
+
+  Args:
+    fsts: FSTs to be composed, in the order of their application.
+    default: Result if there are no FSTs.
+    planner: Order of the compositions; one of `PLANNERS`.
+    defer_optimize: Whether the intermediate compositions are only connected,
+      rather than optimized, with the result optimized once at the end.
+
+  Returns:
+    The composition of the FSTs.
+
+  Raises:
+    ValueError: If the planner is unknown.
+  """
+  if planner not in PLANNERS:
+    raise ValueError(f"Unknown planner: {planner}")
   fsts = list(fsts)
   if not fsts:
     return default
   if len(fsts) == 1:
     return fsts[0]
 
-  # Heuristics for speed:
-  # Adjacent FSTs with minimum number of total states are composed first.
-  # After that first composition, we recurse on that shorter list of FSTs.
-  num_states = [fst.num_states() for fst in fsts]
-  num_states_prod = [a * b for a, b in zip(num_states, num_states[1:])]
-  i = num_states_prod.index(min(num_states_prod))
-  composed = (fsts[i] @ fsts[i+1]).optimize()
-  return ComposeFsts(fsts[:i] + [composed] + fsts[i+2:])
+  @build_profile.Profiled
+  def _Compose(left: pynini.Fst, right: pynini.Fst) -> pynini.Fst:
+    if defer_optimize:
+      return pynini.compose(left, right, connect=True)
+    return (left @ right).optimize()
+
+  if planner == "sequential":
+    composed = fsts[0]
+    for fst in fsts[1:]:
+      composed = _Compose(composed, fst)
+  elif planner == "chain":
+    splits = _ChainSplits([_Estimate.FromFst(fst) for fst in fsts])
+
+    def _ComposeRange(i: int, j: int) -> pynini.Fst:
+      if i == j:
+        return fsts[i]
+      k = splits[i, j]
+      return _Compose(_ComposeRange(i, k), _ComposeRange(k + 1, j))
+
+    composed = _ComposeRange(0, len(fsts) - 1)
+  else:
+    # Adjacent FSTs with minimum number of total states are composed first,
+    # and then the composition takes their place in the list.
+    num_states = [fst.num_states() for fst in fsts]
+    while len(fsts) > 1:
+      num_states_prod = [a * b for a, b in zip(num_states, num_states[1:])]
+      i = num_states_prod.index(min(num_states_prod))
+      fsts[i:i + 2] = [_Compose(fsts[i], fsts[i + 1])]
+      num_states[i:i + 2] = [fsts[i].num_states()]
+    composed = fsts[0]
+  return composed.optimize() if defer_optimize else composed
 
 
+@build_profile.Profiled
 def RewriteAndComposeFsts(fsts: Iterable[pynini.Fst],
                           sigma: pynini.Fst) -> pynini.Fst:
   return ComposeFsts([Rewrite(fst, sigma) for fst in fsts],
@@ -0,0 +1,54 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.rewrite."""
+
+import itertools
+
+from absl.testing import absltest
+import pynini
+from nisaba.scripts.utils import file
+from nisaba.scripts.utils import rewrite
+
+
+class RewriteTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._fsts = [
+        pynini.accep('abc') | pynini.accep('bca'),
+        rewrite.Rewrite(pynini.cross('a', 'b')),
+        rewrite.Rewrite(pynini.cross('bb', 'c')),
+        rewrite.Rewrite(pynini.cross('c', ''), left='b'),
+        rewrite.Rewrite(pynini.cross('b', 'dd')),
+    ]
+
+  def test_ComposeFsts_planners(self):
+    expected = {'cc', 'dddd'}  # abc -> bbc -> cc, bca -> bcb -> bb -> dddd
+    for planner, defer_optimize in itertools.product(rewrite.PLANNERS,
+                                                     (False, True)):
+      with self.subTest(planner=planner, defer_optimize=defer_optimize):
+        fst = rewrite.ComposeFsts(self._fsts, planner=planner,
+                                  defer_optimize=defer_optimize)
+        self.assertSetEqual(expected, set(fst.paths().ostrings()))
+
+  def test_ComposeFsts_default(self):
+    self.assertIs(rewrite.ComposeFsts([], planner='chain'),
+                  file.EMPTY)
+    with self.assertRaisesRegex(ValueError, 'Unknown planner'):
+      rewrite.ComposeFsts(self._fsts, planner='random')
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -30,7 +30,9 @@ are CDRewritten and then are composed together in order.
     As A is a substring of xAy, (1) should be in a rule set strictly before
     the one containing (2).
 
-TODO: Consider additional substring relationships like:
+The following feeding relationships are also supported, on demand, where a
+rule creates the LHS of another one:
+
 1.2 RHS of a rule is substring of LHS of another, as in this example:
     (1) A -> B
     (2) xBy -> C
@@ -46,10 +48,9 @@ TODO: Consider additional substring relationships like:
     As the prefix of the RHS of (1) becomes the suffix of LHS of (2),
     (1) should be applied strictly before (2).
 
-Adding these relationships are prevented by the pynini timeout issue stemming
-from the use of string_map(). Adding these rules can potentially increase the
-number of rule-sets and that in turn could have impact the FAR file sizes.
-So the FAR file size increases need to be monitored with these updates.
+These relationships can increase the number of rule-sets, which in turn could
+impact the FAR file sizes and build times; so the number of rule-sets can be
+bounded. Use `rule_report` to monitor these with the updates to the rules.
 
 2. Cascading rules
 
@@ -59,16 +60,17 @@ rules in feeding order. This is implemented as a sequential composition of
 CDRewrites of the FSTs from each rule.
 """
 
+import collections
 from collections.abc import Iterable, Iterator
-import itertools as it
 import os
-from typing import NamedTuple
+from typing import NamedTuple, Optional
 
-import networkx as nx
 import pandas as pd
 
 import pynini
 import pathlib
+from nisaba.scripts.utils import aho_corasick
+from nisaba.scripts.utils import build_profile
 import nisaba.scripts.utils.file as uf
 import nisaba.scripts.utils.rewrite as ur
 
@@ -78,8 +80,12 @@ RuleSets = list[RuleSet]
 
 
 def rules_from_string_file(file: os.PathLike[str]) -> Iterator[Rule]:
-  """Yields string rules from a text resource with unweighted string maps."""
-  return rules_from_string_path(uf.AsResourcePath(file))
+  """Yields string rules from a text resource with unweighted string maps.
+
+  The rules of each resource are parsed once per process.
+  """
+  return iter(uf.CachedParse(
+      file, 'rules', lambda path: tuple(rules_from_string_path(path))))
 
 
 def rules_from_string_path(file: os.PathLike[str]) -> Iterator[Rule]:
@@ -93,11 +99,171 @@ def rules_from_string_path(file: os.PathLike[str]) -> Iterator[Rule]:
       yield row
 
 
-def _match_lhs_in_lhs(rule_a: Rule, rule_b: Rule) -> bool:
-  return rule_a.lhs in rule_b.lhs
+def _containment_edges(lhss: list[str]) -> list[tuple[int, int]]:
+  """Returns the rule pairs (i, j) s.t. rule j is applied before rule i (1.1).
+
+  Args:
+    lhss: Distinct LHSs of the rules.
+  """
+  automaton = aho_corasick.Automaton(lhss)
+  return [(j, i) for i, lhs in enumerate(lhss)
+          for j in automaton.find_all(lhs) if j != i]
+
+
+def _feeding_edges(rules: list[Rule]) -> list[tuple[int, int]]:
+  """Returns the rule pairs (i, j) s.t. rule j feeds rule i (1.2 - 1.4).
+
+  Args:
+    rules: Rules with distinct LHSs.
+  """
+  edges = []
+  # 1.2: The RHS of rule j is a substring of the LHS of rule i.
+  rhs_automaton = aho_corasick.Automaton(rule.rhs for rule in rules)
+  for i, rule in enumerate(rules):
+    edges.extend((i, j) for j in rhs_automaton.find_all(rule.lhs)
+                 if j != i and rules[j].rhs)
+  # 1.3: A suffix of the RHS of rule j is a prefix of the LHS of rule i.
+  lhs_automaton = aho_corasick.Automaton(rule.lhs for rule in rules)
+  for j, rule in enumerate(rules):
+    edges.extend((i, j) for i in lhs_automaton.find_overlapping(rule.rhs)
+                 if i != j)
+  # 1.4: A prefix of the RHS of rule j is a suffix of the LHS of rule i, that
+  # is, 1.3 on the reversed strings.
+  reversed_lhs_automaton = aho_corasick.Automaton(
+      rule.lhs[::-1] for rule in rules)
+  for j, rule in enumerate(rules):
+    edges.extend(
+        (i, j) for i in reversed_lhs_automaton.find_overlapping(rule.rhs[::-1])
+        if i != j)
+  return edges
+
+
+def _strongly_connected_components(
+    num_nodes: int, edges: list[tuple[int, int]]) -> list[int]:
+  """Returns the component of each node, by Tarjan's algorithm."""
+  successors = [[] for _ in range(num_nodes)]
+  for u, v in edges:
+    successors[u].append(v)
+  index = [-1] * num_nodes
+  low = [0] * num_nodes
+  on_stack = [False] * num_nodes
+  component = [-1] * num_nodes
+  stack = []
+  num_visited = 0
+  num_components = 0
+  for root in range(num_nodes):
+    if index[root] != -1:
+      continue
+    index[root] = low[root] = num_visited
+    num_visited += 1
+    stack.append(root)
+    on_stack[root] = True
+    # Depth-first search without recursion: nodes and their next successor.
+    work = [(root, 0)]
+    while work:
+      node, next_successor = work[-1]
+      if next_successor < len(successors[node]):
+        work[-1] = (node, next_successor + 1)
+        successor = successors[node][next_successor]
+        if index[successor] == -1:
+          index[successor] = low[successor] = num_visited
+          num_visited += 1
+          stack.append(successor)
+          on_stack[successor] = True
+          work.append((successor, 0))
+        elif on_stack[successor]:
+          low[node] = min(low[node], index[successor])
+        continue
+      work.pop()
+      if work:
+        parent = work[-1][0]
+        low[parent] = min(low[parent], low[node])
+      if low[node] == index[node]:
+        while True:
+          member = stack.pop()
+          on_stack[member] = False
+          component[member] = num_components
+          if member == node:
+            break
+        num_components += 1
+  return component
+
+
+def _longest_paths_to_leaves(num_nodes: int,
+                             edges: list[tuple[int, int]]) -> list[int]:
+  """Returns the longest path length from each node to a leaf, by Kahn."""
+  predecessors = [[] for _ in range(num_nodes)]
+  out_degree = [0] * num_nodes
+  for u, v in edges:
+    predecessors[v].append(u)
+    out_degree[u] += 1
+  depth = [0] * num_nodes
+  queue = collections.deque(
+      node for node in range(num_nodes) if not out_degree[node])
+  num_visited = 0
+  while queue:
+    node = queue.popleft()
+    num_visited += 1
+    for predecessor in predecessors[node]:
+      depth[predecessor] = max(depth[predecessor], depth[node] + 1)
+      out_degree[predecessor] -= 1
+      if not out_degree[predecessor]:
+        queue.append(predecessor)
+  if num_visited < num_nodes:
+    raise ValueError('Digraph should be acyclic')
+  return depth
+
+
+def _bounded_depths(num_nodes: int, hard_edges: list[tuple[int, int]],
+                    soft_edges: list[tuple[int, int]],
+                    max_rule_sets: int) -> list[int]:
+  """Returns the rule-sets obeying all the hard edges and some soft edges.
+
+  The soft edges are added one by one to the rule-sets of the hard edges, each
+  one raising the rule-sets of its source and of the rules before it, unless
+  this needs more than `max_rule_sets` rule-sets. The edges closer to the
+  leaves in the unbounded rule-sets are added first, so that the chains of the
+  feeding relations are kept from their start.
 
+  Args:
+    num_nodes: Number of the rules.
+    hard_edges: Substring relations, which are always obeyed.
+    soft_edges: Acyclic feeding relations, obeyed as far as possible.
+    max_rule_sets: Maximum number of rule-sets, unless the hard edges need more.
 
-def partition_unordered(rules: RuleSet) -> list[RuleSet]:
+  Returns:
+    The rule-set of each rule, possibly with some empty rule-sets.
+  """
+  depth = _longest_paths_to_leaves(num_nodes, hard_edges)
+  max_depth = max(max(depth, default=0), max_rule_sets - 1)
+  predecessors = [[] for _ in range(num_nodes)]
+  for u, v in hard_edges:
+    predecessors[v].append(u)
+  unbounded_depth = _longest_paths_to_leaves(num_nodes,
+                                             hard_edges + soft_edges)
+  for u, v in sorted(soft_edges, key=lambda edge: unbounded_depth[edge[1]]):
+    raised = {}
+    if depth[u] <= depth[v]:
+      raised[u] = depth[v] + 1
+      stack = [u]
+      while stack and raised[stack[-1]] <= max_depth:
+        node = stack.pop()
+        for predecessor in predecessors[node]:
+          if raised[node] >= raised.get(predecessor, depth[predecessor]):
+            raised[predecessor] = raised[node] + 1
+            stack.append(predecessor)
+      if stack:
+        continue
+    for node, node_depth in raised.items():
+      depth[node] = node_depth
+    predecessors[v].append(u)
+  return depth
+
+
+@build_profile.Profiled
+def partition_unordered(rules: RuleSet,
+                        feeding: bool = False,
+                        max_rule_sets: Optional[int] = None) -> list[RuleSet]:
   """Ordered partition of unordered rules s.t. no substring relation in a set.
 
   Algorithm: Consider the digraph of rules s.t. two rules have a directed edge
@@ -107,59 +273,116 @@ def partition_unordered(rules: RuleSet) -> list[RuleSet]:
   no rule-nodes remaining in the graph. These rule sets in the order of their
   creation form the desired ordered partition of rules.
 
+  Implementation: The rule-set of a rule is the length of the longest path
+  from it to a leaf. The edges are found by matching all the LHSs in each LHS
+  with an Aho-Corasick automaton, instead of checking every pair of rules.
+  An LHS contains only shorter LHSs, so the path lengths are computed in a
+  single pass over the rules from the longest LHS to the shortest.
+
+  With the feeding relations (1.2 - 1.4), rules may feed each other in a
+  cycle. Within such a cycle, only the LHS substring relation (1.1) is kept,
+  and the rules are otherwise left unordered.
+
   Args:
     rules: String rules representing a set of rewrites.
+    feeding: Whether to also order the rules by the feeding relations.
+    max_rule_sets: Maximum number of rule-sets, reached by obeying only the
+      feeding relations which fit in them, in the order of the rules. The LHS
+      substring relation is always obeyed, even if there are more rule-sets.
 
   Returns:
-    The partition of rules.
-  """
+    The partition of rules. Within a rule-set, the rules are in the order of
+    their first occurrence.
 
-  g = nx.DiGraph()
-  g.add_nodes_from(rules)
-  g.add_edges_from((p1, p2) for p1, p2 in it.product(rules, rules)
-                   if p1 != p2 and _match_lhs_in_lhs(p1, p2))
-  partition = []
-  while g.number_of_nodes() > 0:
-    leaves = [node for node in g.nodes if g.out_degree(node) == 0]
-    if not leaves:
+  Raises:
+    ValueError: If two different rules have the same LHS.
+  """
+  rules = list(dict.fromkeys(rules))
+  lhs_rules = {}
+  for rule in rules:
+    if lhs_rules.setdefault(rule.lhs, rule) != rule:
       raise ValueError('Digraph should be acyclic')
-    partition += [leaves]
-    g.remove_nodes_from(leaves)
+  lhss = list(lhs_rules)
+  if feeding:
+    hard_edges = _containment_edges(lhss)
+    soft_edges = _feeding_edges(rules)
+    component = _strongly_connected_components(len(rules),
+                                               hard_edges + soft_edges)
+    soft_edges = [(u, v) for u, v in soft_edges
+                  if component[u] != component[v]]
+    if max_rule_sets is None:
+      depth = _longest_paths_to_leaves(len(rules), hard_edges + soft_edges)
+    else:
+      depth = _bounded_depths(len(rules), hard_edges, soft_edges,
+                              max_rule_sets)
+      # Drops the empty rule-sets.
+      rule_set = {d: i for i, d in enumerate(sorted(set(depth)))}
+      depth = [rule_set[d] for d in depth]
+  else:
+    automaton = aho_corasick.Automaton(lhss)
+    depth = [0] * len(lhss)
+    for i in sorted(range(len(lhss)), key=lambda i: len(lhss[i]),
+                    reverse=True):
+      for j in automaton.find_all(lhss[i]):
+        if j != i:
+          depth[j] = max(depth[j], depth[i] + 1)
+  partition = [[] for _ in range(max(depth, default=-1) + 1)]
+  for rule, rule_set in zip(rules, depth):
+    partition[rule_set].append(rule)
   return partition
 
 
-def fst_from_rules(rules: RuleSet, sigma: pynini.Fst) -> pynini.Fst:
+@build_profile.Profiled
+def _rule_set_fst(rule_set: RuleSet) -> pynini.Fst:
+  return pynini.optimize(pynini.string_map(rule_set))
+
+
+@build_profile.Profiled
+def fst_from_rules(rules: RuleSet,
+                   sigma: pynini.Fst,
+                   feeding: bool = False,
+                   max_rule_sets: Optional[int] = None) -> pynini.Fst:
   """Gets rewrite FST from given rule set representing rewrites.
 
   Args:
     rules: String rules representing a set of rewrites.
     sigma: Fst to consider the complete alphabet for CDRewrites.
+    feeding: Whether to also order the rules by the feeding relations.
+    max_rule_sets: Maximum number of rule-sets; see `partition_unordered`.
 
   Returns:
     The Rewrite FST for the specified rule file.
   """
 
-  fsts = [pynini.optimize(pynini.string_map(rule_set))
-          for rule_set in partition_unordered(rules)]
+  fsts = [_rule_set_fst(rule_set)
+          for rule_set in partition_unordered(rules, feeding, max_rule_sets)]
   return ur.RewriteAndComposeFsts(fsts, sigma)
 
 
+@build_profile.Profiled
 def fst_from_rule_file(
-    rule_file: os.PathLike[str], sigma: pynini.Fst
+    rule_file: os.PathLike[str],
+    sigma: pynini.Fst,
+    feeding: bool = False,
+    max_rule_sets: Optional[int] = None,
 ) -> pynini.Fst:
   """Gets rewrite FST from a given rewrite rule file.
 
   Args:
     rule_file: Path relative to depot for a rule file specifying rewrite rules.
     sigma: Fst to consider the complete alphabet for CDRewrites.
+    feeding: Whether to also order the rules by the feeding relations.
+    max_rule_sets: Maximum number of rule-sets; see `partition_unordered`.
 
   Returns:
     The Rewrite FST for the specified rule file. If the rule file is missing
     then an FST accepting everything is returned.
   """
-  return fst_from_rules(list(rules_from_string_file(rule_file)), sigma)
+  return fst_from_rules(list(rules_from_string_file(rule_file)), sigma,
+                        feeding, max_rule_sets)
 
 
+@build_profile.Profiled
 def _fst_from_cascading_rules(rules: RuleSet, sigma: pynini.Fst) -> pynini.Fst:
   """Gets rewrite FST from given rule set representing rewrites.
 
@@ -0,0 +1,99 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Benchmarks the partitioning of unordered rules on synthetic rule sets.
+
+Compares `rule.partition_unordered` with the former pairwise implementation,
+which builds the digraph of all the rule pairs and peels off its leaves; the
+latter is only run up to `--max_pairwise_rules`, as it takes quadratic time.
+
+```sh
+bazel run -c opt //nisaba/scripts/utils:rule_benchmark -- \
+  --num_rules=1000,10000,100000
+```
+"""
+
+from collections.abc import Sequence
+import itertools as it
+import random
+import time
+
+from absl import app
+from absl import flags
+import networkx as nx
+from nisaba.scripts.utils import benchmark
+from nisaba.scripts.utils import rule as r
+
+_NUM_RULES = flags.DEFINE_list(
+    'num_rules', ['1000', '10000', '100000'], 'Numbers of the rules.')
+_MAX_PAIRWISE_RULES = flags.DEFINE_integer(
+    'max_pairwise_rules', 5000,
+    'Maximum number of the rules partitioned by the pairwise implementation.')
+_ALPHABET_SIZE = flags.DEFINE_integer(
+    'alphabet_size', 50, 'Number of the distinct characters in the rules.')
+_MAX_LHS_LENGTH = flags.DEFINE_integer(
+    'max_lhs_length', 6, 'Maximum length of the LHS of the rules.')
+
+
+def _partition_pairwise(rules: r.RuleSet) -> list[r.RuleSet]:
+  """The former implementation of `rule.partition_unordered`."""
+  g = nx.DiGraph()
+  g.add_nodes_from(rules)
+  g.add_edges_from((p1, p2) for p1, p2 in it.product(rules, rules)
+                   if p1 != p2 and p1.lhs in p2.lhs)
+  partition = []
+  while g.number_of_nodes() > 0:
+    leaves = [node for node in g.nodes if g.out_degree(node) == 0]
+    if not leaves:
+      raise ValueError('Digraph should be acyclic')
+    partition += [leaves]
+    g.remove_nodes_from(leaves)
+  return partition
+
+
+def _synthetic_rules(num_rules: int, rand: random.Random) -> list[r.Rule]:
+  """Returns rules with distinct LHSs over a small alphabet."""
+  alphabet = [chr(0x0900 + i) for i in range(_ALPHABET_SIZE.value)]
+  lhss = {}
+  while len(lhss) < num_rules:
+    lhs = ''.join(rand.choices(
+        alphabet, k=rand.randint(1, _MAX_LHS_LENGTH.value)))
+    lhss[lhs] = None
+  return [r.Rule(lhs, lhs[::-1]) for lhs in lhss]
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  rand = random.Random(0)
+  rows = []
+  for num_rules in map(int, _NUM_RULES.value):
+    rules = _synthetic_rules(num_rules, rand)
+    start = time.perf_counter()
+    partition = r.partition_unordered(rules)
+    seconds = time.perf_counter() - start
+    pairwise_seconds = 'n/a'
+    if num_rules <= _MAX_PAIRWISE_RULES.value:
+      start = time.perf_counter()
+      pairwise_partition = _partition_pairwise(rules)
+      pairwise_seconds = time.perf_counter() - start
+      if pairwise_partition != partition:
+        raise AssertionError(f'Different partitions of {num_rules} rules.')
+    rows.append((num_rules, len(partition), seconds, pairwise_seconds))
+  print(benchmark.FormatTable(
+      ('rules', 'rule_sets', 'seconds', 'pairwise_seconds'), rows))
+
+
+if __name__ == '__main__':
+  app.run(main)
@@ -0,0 +1,73 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Reports the build cost of the unordered rule files under each ordering.
+
+For each rule file, the FST is built with only the LHS substring relation,
+with the feeding relations as well, and with the feeding relations under
+`--max_rule_sets`. The number of rule-sets, the build time and the size of
+the FST are reported, so that the effect of the rule updates and of the
+feeding relations on the FAR builds can be checked.
+
+The rule files of the scripts are generated from their textprotos, e.g.:
+
+```sh
+bazel build //nisaba/scripts/brahmic/data/Deva:nfc.tsv
+bazel run -c opt //nisaba/scripts/utils:rule_report -- \
+  --rule_files=$PWD/bazel-bin/nisaba/scripts/brahmic/data/Deva/nfc.tsv
+```
+"""
+
+from collections.abc import Sequence
+import time
+
+from absl import app
+from absl import flags
+from pynini.lib import byte
+from nisaba.scripts.utils import benchmark
+from nisaba.scripts.utils import rule as r
+
+_RULE_FILES = flags.DEFINE_list(
+    'rule_files', None, 'Paths of the unordered rule files.')
+_MAX_RULE_SETS = flags.DEFINE_integer(
+    'max_rule_sets', 2, 'Maximum number of the rule-sets of the bounded build.')
+
+flags.mark_flag_as_required('rule_files')
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  rows = []
+  for rule_file in _RULE_FILES.value:
+    rules = list(r.rules_from_string_path(rule_file))
+    for ordering, feeding, max_rule_sets in (
+        ('substring', False, None),
+        ('feeding', True, None),
+        (f'feeding<={_MAX_RULE_SETS.value}', True, _MAX_RULE_SETS.value)):
+      num_rule_sets = len(r.partition_unordered(rules, feeding, max_rule_sets))
+      start = time.perf_counter()
+      fst = r.fst_from_rules(rules, byte.BYTE, feeding, max_rule_sets)
+      seconds = time.perf_counter() - start
+      rows.append((rule_file, ordering, len(rules), num_rule_sets, seconds,
+                   fst.num_states(),
+                   sum(fst.num_arcs(state) for state in fst.states()),
+                   len(fst.write_to_string())))
+  print(benchmark.FormatTable(
+      ('rule_file', 'ordering', 'rules', 'rule_sets', 'seconds', 'states',
+       'arcs', 'bytes'), rows))
+
+
+if __name__ == '__main__':
+  app.run(main)
@@ -0,0 +1,113 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.rule."""
+
+import itertools
+import random
+
+from absl.testing import absltest
+from nisaba.scripts.utils import rule as r
+
+
+def _partition_by_peeling(rules):
+  """Reference partition, peeling off the rules not contained in others."""
+  remaining = list(dict.fromkeys(rules))
+  partition = []
+  while remaining:
+    leaves = [rule for rule in remaining
+              if not any(other != rule and rule.lhs in other.lhs
+                         for other in remaining)]
+    if not leaves:
+      raise ValueError('Digraph should be acyclic')
+    partition.append(leaves)
+    remaining = [rule for rule in remaining if rule not in leaves]
+  return partition
+
+
+class RuleTest(absltest.TestCase):
+
+  def test_partition_unordered(self):
+    rules = [r.Rule('xAy', 'C'), r.Rule('A', 'B'), r.Rule('zA', 'D'),
+             r.Rule('A', 'B'), r.Rule('q', 'Q')]
+    self.assertEqual(
+        [[r.Rule('xAy', 'C'), r.Rule('zA', 'D'), r.Rule('q', 'Q')],
+         [r.Rule('A', 'B')]],
+        r.partition_unordered(rules))
+    self.assertEqual([], r.partition_unordered([]))
+
+  def test_partition_unordered_matches_peeling(self):
+    rand = random.Random(0)
+    for _ in range(20):
+      lhss = {''.join(rand.choices('abcd', k=rand.randint(1, 5)))
+              for _ in range(60)}
+      rules = [r.Rule(lhs, lhs.upper()) for lhs in lhss]
+      rand.shuffle(rules)
+      self.assertEqual(_partition_by_peeling(rules),
+                       r.partition_unordered(rules))
+
+  def test_partition_unordered_rejects_conflicting_rules(self):
+    with self.assertRaises(ValueError):
+      r.partition_unordered([r.Rule('A', 'B'), r.Rule('A', 'C')])
+
+  def test_partition_unordered_feeding(self):
+    for rules in (
+        [r.Rule('xBy', 'C'), r.Rule('A', 'B')],  # 1.2
+        [r.Rule('yz', 'B'), r.Rule('A', 'xy')],  # 1.3
+        [r.Rule('xy', 'B'), r.Rule('A', 'yz')],  # 1.4
+    ):
+      with self.subTest(rules=rules):
+        self.assertEqual([rules], r.partition_unordered(rules))
+        self.assertEqual([[rules[1]], [rules[0]]],
+                         r.partition_unordered(rules, feeding=True))
+
+  def test_partition_unordered_feeding_cycle(self):
+    rules = [r.Rule('A', 'B'), r.Rule('B', 'A'), r.Rule('xAy', 'C')]
+    # The LHS substring relation is still obeyed within the cycle.
+    self.assertEqual([[r.Rule('B', 'A'), r.Rule('xAy', 'C')],
+                      [r.Rule('A', 'B')]],
+                     r.partition_unordered(rules, feeding=True))
+
+  def test_partition_unordered_max_rule_sets(self):
+    rules = [r.Rule('C', 'D'), r.Rule('B', 'C'), r.Rule('A', 'B'),
+             r.Rule('xAy', 'E')]
+    self.assertLen(r.partition_unordered(rules, feeding=True), 4)
+    self.assertEqual([[r.Rule('C', 'D'), r.Rule('xAy', 'E')],
+                      [r.Rule('A', 'B')], [r.Rule('B', 'C')]],
+                     r.partition_unordered(rules, feeding=True,
+                                           max_rule_sets=3))
+    # The LHS substring relation is kept even beyond the maximum.
+    self.assertLen(
+        r.partition_unordered(rules, feeding=True, max_rule_sets=1), 2)
+
+  def test_partition_unordered_max_rule_sets_random(self):
+    rand = random.Random(0)
+    lhss = {''.join(rand.choices('abc', k=rand.randint(1, 4)))
+            for _ in range(100)}
+    rules = [r.Rule(lhs, ''.join(rand.choices('abc', k=2))) for lhs in lhss]
+    min_rule_sets = len(r.partition_unordered(rules))
+    for max_rule_sets in range(1, 8):
+      partition = r.partition_unordered(rules, feeding=True,
+                                        max_rule_sets=max_rule_sets)
+      self.assertLessEqual(len(partition), max(min_rule_sets, max_rule_sets))
+      rule_set = {rule: i for i, rule_set_rules in enumerate(partition)
+                  for rule in rule_set_rules}
+      self.assertCountEqual(rules, rule_set)
+      for rule1, rule2 in itertools.permutations(rules, 2):
+        if rule1.lhs in rule2.lhs:
+          self.assertLess(rule_set[rule2], rule_set[rule1])
+
+
+if __name__ == '__main__':
+  absltest.main()
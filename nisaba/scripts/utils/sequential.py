@@ -0,0 +1,280 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Left-to-right application of an FST through an on-the-fly determinization.
+
+Most of the exported rules are functional, so composing every input string
+with the rule and then finding the shortest path is more general than what is
+needed. Instead, the FST can be applied as a subsequential transducer: each
+input label is consumed by a single table lookup, which emits the output that
+is certain at that point and moves to the next state.
+
+The subsequential transducer is built lazily, by the subset construction of
+weighted determinization, only for the states that are actually reached by
+the inputs. Each subset state keeps the best (tropical) weight and the pending
+output per FST state, so the result is that of the shortest path even when the
+FST is not functional. Determinization does not terminate for FSTs which are
+not subsequential; so the number of subset states is bounded and the caller is
+expected to fall back to composition once the bound is reached.
+
+When paths with the same weight but different outputs compete, the walk does
+not know which of them `pynini.shortestpath` would keep, so the inputs reaching
+such a tie fall back to composition as well.
+"""
+
+from collections.abc import Iterable
+import math
+import threading
+from typing import Optional
+
+import pynini
+
+# Weight differences are rounded to this number of digits when identifying the
+# subset states, similar to `delta` in OpenFst determinization.
+_WEIGHT_DIGITS = 6
+
+# Paths whose weights differ by less than this are tied. It is larger than the
+# rounding errors of the single precision weights summed by shortestpath.
+_TIE_DELTA = 1e-4
+
+# A subset state: FST state -> (weight relative to the best one, pending output
+# labels that are not yet emitted, or None if tied paths with different outputs
+# reach the state).
+_Subset = dict[int, tuple[float, Optional[tuple[int, ...]]]]
+
+# Marks the transitions and final outputs reached through tied paths with
+# different outputs.
+_TIED = 'tied'
+
+
+def _Relax(subset: _Subset, state: int, weight: float,
+           output: Optional[tuple[int, ...]]) -> bool:
+  """Keeps the best path to the state and returns whether it changed."""
+  if state in subset:
+    best_weight, best_output = subset[state]
+    if abs(weight - best_weight) < _TIE_DELTA:
+      if best_output is None or output == best_output:
+        return False
+      subset[state] = (best_weight, None)
+      return True
+    if weight > best_weight:
+      return False
+  subset[state] = (weight, output)
+  return True
+
+
+def _Extend(output: Optional[tuple[int, ...]],
+            olabel: int) -> Optional[tuple[int, ...]]:
+  """Returns the output followed by the label, if any."""
+  if output is None or not olabel:
+    return output
+  return output + (olabel,)
+
+
+class FallbackError(Exception):
+  """The input cannot be applied by the walk; use composition instead."""
+
+
+class SequentialTransducer:
+  """Applies an FST by walking its lazily determinized subset states."""
+
+  def __init__(self, fst: pynini.Fst, max_states: int = 100_000) -> None:
+    """Prepares the FST for the left-to-right application.
+
+    Args:
+      fst: FST over the tropical semiring to be applied.
+      max_states: Maximum number of subset states to be built.
+
+    Raises:
+      ValueError: If the FST is not over the tropical semiring.
+    """
+    if fst.weight_type() != 'tropical':
+      raise ValueError(f'Unsupported weight type: {fst.weight_type()}')
+    self._fst = fst
+    self.max_states = max_states
+    self._lock = threading.Lock()
+    # FST state -> (epsilon input arcs, input label -> arcs); filled lazily.
+    self._arcs = {}
+    # Subset states and their ids.
+    self._subsets: list[_Subset] = []
+    self._subset_ids = {}
+    # Per subset state: input label -> (emitted labels, next subset id), where
+    # a rejected input label maps to None and a tie to `_TIED`.
+    self._transitions: list[dict[int, Optional[tuple[tuple[int, ...], int]]]]
+    self._transitions = []
+    # Per subset state: the labels emitted at the end of the input, if final,
+    # or `_TIED`.
+    self._finals: list[Optional[tuple[int, ...]]] = []
+    self._start = None
+    start = fst.start()
+    if start != pynini.NO_STATE_ID:
+      self._start = self._AddSubset(self._Closure({start: (0.0, ())}))
+
+  @property
+  def num_states(self) -> int:
+    """Number of the subset states built so far."""
+    return len(self._subsets)
+
+  def _StateArcs(self, state: int):
+    """Returns the epsilon and the non-epsilon input arcs of an FST state."""
+    if state not in self._arcs:
+      epsilon_arcs = []
+      label_arcs = {}
+      for arc in self._fst.arcs(state):
+        weight = float(arc.weight)
+        if weight < 0:
+          # Closures may not terminate with negative weights.
+          raise FallbackError(f'Negative arc weight at state {state}')
+        entry = (arc.olabel, weight, arc.nextstate)
+        if arc.ilabel:
+          label_arcs.setdefault(arc.ilabel, []).append(entry)
+        else:
+          epsilon_arcs.append(entry)
+      self._arcs[state] = (epsilon_arcs, label_arcs)
+    return self._arcs[state]
+
+  def _Closure(self, subset: _Subset) -> _Subset:
+    """Follows the epsilon input arcs, keeping the best path to each state."""
+    queue = list(subset)
+    while queue:
+      state = queue.pop()
+      weight, output = subset[state]
+      for olabel, arc_weight, nextstate in self._StateArcs(state)[0]:
+        if _Relax(subset, nextstate, weight + arc_weight,
+                  _Extend(output, olabel)):
+          queue.append(nextstate)
+    return subset
+
+  def _AddSubset(self, subset: _Subset):
+    """Normalizes the subset and returns its certain output and its id.
+
+    The output common to all the states is emitted and the weights are made
+    relative to the best one, so that the subsets reached through different
+    inputs can be shared.
+
+    Args:
+      subset: Subset state with the absolute weights and outputs.
+
+    Returns:
+      The emitted output labels and the id of the normalized subset state, or
+      `_TIED` if tied paths with different outputs reach one of its states.
+
+    Raises:
+      FallbackError: If the maximum number of subset states is reached.
+    """
+    if any(output is None for _, output in subset.values()):
+      return _TIED
+    best = min(weight for weight, _ in subset.values())
+    outputs = [output for _, output in subset.values()]
+    prefix_len = 0
+    for labels in zip(*outputs):
+      if any(label != labels[0] for label in labels):
+        break
+      prefix_len += 1
+    emitted = outputs[0][:prefix_len]
+    normalized = {
+        state: (round(weight - best, _WEIGHT_DIGITS), output[prefix_len:])
+        for state, (weight, output) in subset.items()
+    }
+    key = tuple(sorted(normalized.items()))
+    subset_id = self._subset_ids.get(key)
+    if subset_id is None:
+      if len(self._subsets) >= self.max_states:
+        raise FallbackError(
+            f'Reached the maximum number of subset states: {self.max_states}')
+      subset_id = len(self._subsets)
+      self._subsets.append(normalized)
+      self._subset_ids[key] = subset_id
+      self._transitions.append({})
+      self._finals.append(self._FinalOutput(normalized))
+    return emitted, subset_id
+
+  def _FinalOutput(self, subset: _Subset):
+    """Returns the pending output of the best final state, if any.
+
+    Args:
+      subset: Normalized subset state.
+
+    Returns:
+      The pending output labels, None if no state is final, or `_TIED` if
+      final states with tied weights have different outputs.
+    """
+    final_subset = {}
+    for state, (weight, output) in subset.items():
+      final_weight = float(self._fst.final(state))
+      if final_weight != math.inf:
+        # The paths end in a common superfinal state, here -1.
+        _Relax(final_subset, -1, weight + final_weight, output)
+    if not final_subset:
+      return None
+    _, output = final_subset[-1]
+    return _TIED if output is None else output
+
+  def _AddTransition(self, subset_id: int, label: int):
+    """Builds the transition from a subset state on an input label."""
+    with self._lock:
+      transitions = self._transitions[subset_id]
+      if label in transitions:
+        return transitions[label]
+      next_subset = {}
+      for state, (weight, output) in self._subsets[subset_id].items():
+        for olabel, arc_weight, nextstate in (
+            self._StateArcs(state)[1].get(label, ())):
+          _Relax(next_subset, nextstate, weight + arc_weight,
+                 _Extend(output, olabel))
+      if next_subset:
+        transition = self._AddSubset(self._Closure(next_subset))
+      else:
+        transition = None
+      transitions[label] = transition
+      return transition
+
+  def Apply(self, labels: Iterable[int]) -> Optional[list[int]]:
+    """Applies the FST on the input labels.
+
+    Args:
+      labels: Input labels.
+
+    Returns:
+      Output labels of the shortest path, or None if the input is rejected.
+
+    Raises:
+      FallbackError: If the input cannot be applied by the walk, e.g. if it
+        reaches tied paths with different outputs.
+    """
+    if self._start is None:
+      return None
+    if self._start == _TIED:
+      raise FallbackError('Tied paths with different outputs')
+    output, subset_id = self._start
+    output = list(output)
+    for label in labels:
+      transitions = self._transitions[subset_id]
+      if label in transitions:
+        transition = transitions[label]
+      else:
+        transition = self._AddTransition(subset_id, label)
+      if transition is None:
+        return None
+      if transition == _TIED:
+        raise FallbackError('Tied paths with different outputs')
+      emitted, subset_id = transition
+      output.extend(emitted)
+    final = self._finals[subset_id]
+    if final is None:
+      return None
+    if final == _TIED:
+      raise FallbackError('Tied paths with different outputs')
+    output.extend(final)
+    return output
@@ -0,0 +1,104 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the left-to-right application of FSTs."""
+
+import itertools
+
+import pynini
+from pynini.lib import byte
+from absl.testing import absltest
+from absl.testing import parameterized
+from nisaba.scripts.utils import sequential
+
+
+def _Rewrite(*rules: tuple[str, str], right: str = '') -> pynini.Fst:
+  return pynini.cdrewrite(pynini.string_map(rules), '', right,
+                          byte.BYTE.star).optimize()
+
+
+def _ShortestPath(fst: pynini.Fst, text: str):
+  try:
+    return pynini.shortestpath(pynini.escape(text) @ fst).string()
+  except pynini.FstOpError:
+    return None
+
+
+_FSTS = [
+    ('rewrite', _Rewrite(('ab', 'x'), ('b', 'yy'), ('abc', ''))),
+    ('right_context', _Rewrite(('ab', 'x'), ('b', 'yy'), right='c')),
+    ('weighted', pynini.union(
+        pynini.cross('a', '1'),
+        pynini.cross('ab', '2') + pynini.accep('', weight=1),
+        pynini.cross('b', '3'),
+        pynini.cross('', 'q') + pynini.accep('', weight=3)).star.optimize()),
+    ('rejecting', pynini.cross('ab', 'ba').plus.optimize()),
+]
+
+
+class SequentialTransducerTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(_FSTS)
+  def testAgreesWithShortestPath(self, fst: pynini.Fst):
+    transducer = sequential.SequentialTransducer(fst)
+    for length in range(6):
+      for letters in itertools.product('abc', repeat=length):
+        text = ''.join(letters)
+        try:
+          labels = transducer.Apply(text.encode('utf8'))
+        except sequential.FallbackError:
+          # Only the inputs with tied outputs are left to composition.
+          lattice = pynini.escape(text) @ fst
+          self.assertGreater(len(set(lattice.paths().ostrings())), 1,
+                             f'Input: {text}')
+          continue
+        output = None if labels is None else bytes(labels).decode('utf8')
+        self.assertEqual(_ShortestPath(fst, text), output, f'Input: {text}')
+
+  def testFallsBackOnTooManyStates(self):
+    # Not subsequential: the output of the first label depends on the last.
+    fst = pynini.union(
+        pynini.cross('a', 'b') + pynini.accep('a').star + 'x',
+        pynini.cross('a', 'c') + pynini.accep('a').star + 'y').optimize()
+    transducer = sequential.SequentialTransducer(fst, max_states=5)
+    self.assertEqual(list(b'baax'), transducer.Apply(b'aaax'))
+    with self.assertRaises(sequential.FallbackError):
+      transducer.Apply(b'a' * 10 + b'y')
+
+  def testFallsBackOnTies(self):
+    tied = pynini.union(pynini.cross('a', 'x'), pynini.cross('a', 'y'))
+    with self.assertRaises(sequential.FallbackError):
+      sequential.SequentialTransducer(tied.optimize()).Apply(b'a')
+    with self.assertRaises(sequential.FallbackError):
+      sequential.SequentialTransducer(tied + 'b').Apply(b'ab')
+    # Ties of paths with the same output, or not of the best paths, are fine.
+    same_output = pynini.union(pynini.cross('a', 'x'),
+                               pynini.cross('a', '') + pynini.cross('', 'x'))
+    self.assertEqual(list(b'x'),
+                     sequential.SequentialTransducer(same_output).Apply(b'a'))
+    weighted = pynini.union(
+        pynini.cross('a', 'x'),
+        pynini.cross('a', 'y') + pynini.accep('', weight=1),
+        pynini.cross('a', 'z') + pynini.accep('', weight=1))
+    self.assertEqual(list(b'x'),
+                     sequential.SequentialTransducer(weighted).Apply(b'a'))
+
+  def testUnsupportedWeightType(self):
+    with self.assertRaises(ValueError):
+      sequential.SequentialTransducer(pynini.arcmap(pynini.accep('a'),
+                                                    map_type='to_log'))
+
+
+if __name__ == '__main__':
+  absltest.main()
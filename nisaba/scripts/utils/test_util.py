@@ -150,6 +150,40 @@ def AssertIdentity(input_str_fsa: pynini.Fst, fst: pynini.Fst):
         f" produced output string(s): `{', '.join(outstrs)}`")
 
 
+def _StrIoFailures(fst_builder: Callable[[], pynini.Fst],
+                   test_pairs: list[tuple[str, str]],
+                   token_type: pynini.TokenType) -> list[str]:
+  """Returns the failures of the input / output test string pairs of an FST.
+
+  The FST is built and sorted for the composition once, rather than for each
+  test pair.
+
+  Args:
+    fst_builder: Function building the FST, with the default token type.
+    test_pairs: Input and expected output strings.
+    token_type: The default token type, for the messages.
+
+  Returns:
+    The messages of the failed test pairs.
+  """
+  fst = fst_builder()
+  if not fst.properties(pynini.I_LABEL_SORTED, True):
+    fst = fst.copy().arcsort("ilabel")
+  name = getattr(fst_builder, "__qualname__", repr(fst_builder))
+  failures = []
+  for input_str, expected_str in test_pairs:
+    try:
+      actual_output = (pynini.accep(input_str) @ fst).optimize().string()
+    except pynini.FstOpError:
+      actual_output = None
+    if actual_output != expected_str:
+      actual = ("no single output" if actual_output is None else
+                f"`{actual_output}`")
+      failures.append(f"{name} ({token_type}): `{input_str}` produced "
+                      f"{actual}, expected `{expected_str}`")
+  return failures
+
+
 class FstPropertiesTestCase(absltest.TestCase):
 
   def AssertFstCompliesWithProperties(
@@ -322,6 +356,9 @@ class FstTestCase(absltest.TestCase):
       list[tuple[Callable[[], pynini.Fst], list[tuple[str, str]]]]) -> None:
     """Asserts on every test in a list of FST input-ouput testcases.
 
+    Each FST is built once per token type and applied on all of its test
+    pairs, as in `AssertFstStrIO`. All the failures are reported at once.
+
     Args:
       test_cases: It is a list of tuples which carry an FST builder function
       and a list of input / output test string tuples. Example:
@@ -339,11 +376,13 @@ class FstTestCase(absltest.TestCase):
           ```
     """
 
+    failures = []
     for fst_builder, test_pairs in test_cases:
       for token_type in ("utf8", "byte"):
         with pynini.default_token_type(token_type):
-          for test_pair in test_pairs:
-            self.AssertFstStrIO(fst_builder(), *test_pair)
+          failures += _StrIoFailures(fst_builder, test_pairs, token_type)
+    if failures:
+      self.fail(f"{len(failures)} failed test cases:\n" + "\n".join(failures))
 
   def _FstLikeString(self, fstlike: pynini.FstLike) -> str:
     return fstlike.string() if isinstance(fstlike, pynini.Fst) else fstlike
@@ -0,0 +1,52 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.test_util."""
+
+import pynini
+from absl.testing import absltest
+from nisaba.scripts.utils import test_util
+
+
+class FstTestCaseTest(test_util.FstTestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._num_builds = 0
+
+  def _Build(self) -> pynini.Fst:
+    self._num_builds += 1
+    return pynini.union(pynini.cross("a", "b"), pynini.cross("c", "dd"),
+                        pynini.cross("e", "f"), pynini.cross("e", "g"))
+
+  def testAssertFstStrIoTestCases(self):
+    self.AssertFstStrIoTestCases([(self._Build, [("a", "b"), ("c", "dd")])])
+    # The FST is built once per token type.
+    self.assertEqual(self._num_builds, 2)
+
+  def testAssertFstStrIoTestCasesFailures(self):
+    with self.assertRaises(AssertionError) as error:
+      self.AssertFstStrIoTestCases(
+          [(self._Build, [("a", "x"), ("c", "dd"), ("e", "f"), ("z", "z")])])
+    message = str(error.exception)
+    self.assertIn("6 failed test cases", message)
+    self.assertIn("(utf8): `a` produced `b`, expected `x`", message)
+    self.assertIn("(byte): `e` produced no single output, expected `f`",
+                  message)
+    self.assertIn("(byte): `z` produced no single output, expected `z`",
+                  message)
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,379 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Checks the rules of a FAR against textproto tests, in worker processes.
+
+This is the Python counterpart of `//nisaba/interim/testing:test_textproto`,
+with the same flags and rewrite modes, for the large sets of golden rewrites:
+
+  * the FAR is opened once per worker process, and the cascade of each list of
+    rules is built once per worker;
+  * the rewrites are grouped by their rules and sent to the workers in blocks;
+  * under a test runner sharding the test, such as Bazel with `shard_count`,
+    each shard only checks its share of the rewrites;
+  * the number of the rewrites and the time spent on them are reported per
+    list of rules.
+
+All the failures are reported, and the program fails if there are any.
+
+```sh
+bazel run -c opt //nisaba/scripts/utils:textproto_runner -- \
+  --far_path=$PWD/bazel-bin/nisaba/scripts/brahmic/iso.far \
+  --textproto_path=$PWD/nisaba/scripts/brahmic/testdata/iso.textproto \
+  --mode=one_top
+```
+"""
+
+import collections
+from collections.abc import Iterable, Iterator, Sequence
+import os
+import pathlib
+import sys
+import time
+from typing import NamedTuple, Optional
+
+from absl import app
+from absl import flags
+from google.protobuf import text_format
+import pynini
+from nisaba.interim.testing import testdata_pb2
+from nisaba.scripts.utils import benchmark
+from nisaba.scripts.utils import cascade
+from nisaba.scripts.utils import parallel
+import nisaba.scripts.utils.file as uf
+
+MODES = ('exact', 'one_top', 'subset', 'top')
+
+# Environment variables of the test sharding protocol, as set by Bazel.
+_TOTAL_SHARDS_ENV = 'TEST_TOTAL_SHARDS'
+_SHARD_INDEX_ENV = 'TEST_SHARD_INDEX'
+_SHARD_STATUS_FILE_ENV = 'TEST_SHARD_STATUS_FILE'
+
+
+class Rewrite(NamedTuple):
+  """Rewrite of a textproto test."""
+  # Position of the rewrite in the tests, for sharding and reporting.
+  index: int
+  rules: tuple[str, ...]
+  input: str
+  # The expected outputs; none if the rewrite is expected to fail.
+  outputs: tuple[str, ...]
+
+
+class RuleReport(NamedTuple):
+  """Rewrites checked with a list of rules, and the time spent on them."""
+  rules: str
+  rewrites: int
+  failures: int
+  # Time to read and prepare the FSTs of the rules, summed over the workers.
+  load_seconds: float
+  check_seconds: float
+
+
+class _BlockResult(NamedTuple):
+  rules: tuple[str, ...]
+  failures: list[tuple[int, str]]
+  load_seconds: float
+  check_seconds: float
+
+
+def ReadRewrites(
+    textproto_paths: Iterable[os.PathLike[str]]) -> list[Rewrite]:
+  """Returns the rewrites of the textproto tests, in their order."""
+  rewrites = []
+  for path in textproto_paths:
+    tests = text_format.Parse(
+        uf.AsResourcePath(path).read_text(encoding='utf8'),
+        testdata_pb2.Rewrites())
+    rewrites += [
+        Rewrite(len(rewrites) + i, tuple(rewrite.rule), rewrite.input,
+                tuple(rewrite.output))
+        for i, rewrite in enumerate(tests.rewrite)
+    ]
+  return rewrites
+
+
+def Shard(rewrites: Sequence[Rewrite], total_shards: int,
+          shard_index: int) -> list[Rewrite]:
+  """Returns the rewrites of a shard, dealt round robin by their indices."""
+  if not 0 <= shard_index < total_shards:
+    raise ValueError(
+        f'Invalid shard {shard_index} of {total_shards} shards.')
+  return [rewrite for rewrite in rewrites
+          if rewrite.index % total_shards == shard_index]
+
+
+def ShardFromEnv(rewrites: Sequence[Rewrite]) -> list[Rewrite]:
+  """Returns the rewrites of the shard set by the test runner, if any.
+
+  The test runner sets the number of the shards and the index of this one in
+  the environment. Per the protocol, the status file is touched to let the
+  runner know that the sharding is supported.
+
+  Args:
+    rewrites: All the rewrites of the test.
+
+  Returns:
+    The rewrites of this shard, or all of them if the test is not sharded.
+  """
+  status_file = os.environ.get(_SHARD_STATUS_FILE_ENV)
+  if status_file:
+    pathlib.Path(status_file).touch()
+  total_shards = os.environ.get(_TOTAL_SHARDS_ENV)
+  if not total_shards:
+    return list(rewrites)
+  return Shard(rewrites, int(total_shards),
+               int(os.environ.get(_SHARD_INDEX_ENV, '0')))
+
+
+class _Grammar:
+  """Cascades of the rules of a FAR, built on their first use."""
+
+  def __init__(self, far_path: os.PathLike[str], token_type: str) -> None:
+    self.token_type = token_type
+    self._far = pynini.Far(os.fspath(uf.AsResourcePath(far_path)))
+    self._rule_names = None
+    self._cascades = {}
+
+  def _RuleNames(self) -> list[str]:
+    if self._rule_names is None:
+      self._rule_names = []
+      self._far.reset()
+      while not self._far.done():
+        self._rule_names.append(self._far.get_key())
+        self._far.next()
+    return self._rule_names
+
+  def _Fsts(self, rule: str) -> list[pynini.Fst]:
+    """Returns the FST of the rule, or the components of its cascade."""
+    if rule in self._RuleNames():
+      return [self._far[rule]]
+    # A cascade exported by `cascade.Export` is applied component-wise.
+    stage_names = cascade.StageNames(self._RuleNames(), rule)
+    if not stage_names:
+      raise KeyError(f'Rule not found in the FAR: {rule}')
+    return [self._far[stage_name] for stage_name in stage_names]
+
+  def Cascade(self, rules: tuple[str, ...]) -> cascade.Cascade:
+    """Returns the cascade of the rules, in their order.
+
+    Raises:
+      KeyError: If a rule is not in the FAR.
+      ValueError: If there are no rules.
+    """
+    if rules not in self._cascades:
+      self._cascades[rules] = cascade.Cascade(
+          [fst for rule in rules for fst in self._Fsts(rule)])
+    return self._cascades[rules]
+
+
+def _Strings(lattice: pynini.Fst, token_type: str) -> list[str]:
+  """Returns the distinct outputs of an acyclic lattice, sorted."""
+  if lattice.properties(pynini.CYCLIC, True):
+    raise pynini.FstOpError('The output lattice is cyclic.')
+  return sorted(set(lattice.paths(output_token_type=token_type).ostrings()))
+
+
+def CheckRewrite(rules: cascade.Cascade, rewrite: Rewrite, token_type: str,
+                 mode: str) -> Optional[str]:
+  """Checks a rewrite as in `test_textproto`.
+
+  Args:
+    rules: Cascade of the rules of the rewrite.
+    rewrite: Rewrite to be checked.
+    token_type: Token type of the rules: `byte` or `utf8`.
+    mode: How the outputs of the rules are compared with the expected ones:
+      `exact` for all of them, `subset` for a superset of the expected ones,
+      `one_top` for a single best output and `top` for the shortest path. A
+      rewrite without any expected output should be rejected in all the modes.
+
+  Returns:
+    The description of the failure, or None if the rewrite is as expected.
+
+  Raises:
+    ValueError: If the mode is unknown.
+  """
+  if mode not in MODES:
+    raise ValueError(f'Unknown mode: {mode}')
+  expected = list(rewrite.outputs)
+  header = (f'Rule(s): {", ".join(rewrite.rules)}\n'
+            f'Input: {rewrite.input}\n'
+            f'Expected output: {", ".join(expected)}\n')
+  if mode in ('one_top', 'top') and len(expected) > 1:
+    return f'{header}Expected a single output in the {mode} mode.'
+  try:
+    lattice = rules.Lattice(
+        pynini.accep(pynini.escape(rewrite.input), token_type=token_type))
+    if lattice.start() == pynini.NO_STATE_ID:
+      return None if not expected else f'{header}Unexpected rewrite failure.'
+    if not expected:
+      actual = [pynini.shortestpath(lattice).string(token_type)]
+    elif mode in ('exact', 'subset'):
+      actual = _Strings(lattice, token_type)
+    elif mode == 'one_top':
+      # Only the optimal outputs are kept by the determinization.
+      actual = _Strings(
+          pynini.determinize(lattice, weight=pynini.Weight.one(
+              lattice.weight_type())), token_type)
+      if len(actual) > 1:
+        return f'{header}Several top outputs: {", ".join(actual)}'
+    else:
+      actual = [pynini.shortestpath(lattice).string(token_type)]
+  except (pynini.FstOpError, pynini.FstStringCompilationError) as error:
+    return f'{header}Unexpected rewrite failure: {error}'
+  if not expected:
+    return f'{header}Expected a rewrite failure; actual output: {actual[0]}'
+  if mode == 'subset':
+    missing = sorted(set(expected) - set(actual))
+    if missing:
+      return (f'{header}Actual output: {", ".join(actual)}\n'
+              f'Missing elements: {", ".join(missing)}')
+    return None
+  if sorted(expected) != actual:
+    return f'{header}Actual output: {", ".join(actual)}'
+  return None
+
+
+# State of the worker processes, set by `_InitWorker`.
+_GRAMMAR: Optional[_Grammar] = None
+_MODE = 'exact'
+
+
+def _InitWorker(far_path: os.PathLike[str], token_type: str,
+                mode: str) -> None:
+  global _GRAMMAR, _MODE
+  _GRAMMAR = _Grammar(far_path, token_type)
+  _MODE = mode
+
+
+def _CheckBlock(
+    task: tuple[tuple[str, ...], list[Rewrite]]) -> _BlockResult:
+  """Checks a block of the rewrites of a list of rules."""
+  rules, rewrites = task
+  start = time.perf_counter()
+  try:
+    rule_cascade = _GRAMMAR.Cascade(rules)
+  except (KeyError, ValueError) as error:
+    return _BlockResult(
+        rules, [(rewrite.index, f'Rule(s): {", ".join(rules)}\n{error}')
+                for rewrite in rewrites], time.perf_counter() - start, 0.0)
+  load_seconds = time.perf_counter() - start
+  start = time.perf_counter()
+  failures = []
+  for rewrite in rewrites:
+    failure = CheckRewrite(rule_cascade, rewrite, _GRAMMAR.token_type, _MODE)
+    if failure is not None:
+      failures.append((rewrite.index, failure))
+  return _BlockResult(rules, failures, load_seconds,
+                      time.perf_counter() - start)
+
+
+def _Tasks(rewrites: Iterable[Rewrite], block_size: int
+          ) -> Iterator[tuple[tuple[str, ...], list[Rewrite]]]:
+  """Yields the blocks of the rewrites, grouped by their rules."""
+  groups = collections.defaultdict(list)
+  for rewrite in rewrites:
+    groups[rewrite.rules].append(rewrite)
+  for rules, group in groups.items():
+    for block in parallel.ReadBlocks(group, block_size):
+      yield rules, block
+
+
+def RunRewrites(far_path: os.PathLike[str],
+                rewrites: Sequence[Rewrite],
+                token_type: str = 'byte',
+                mode: str = 'exact',
+                num_workers: Optional[int] = None,
+                block_size: int = 64) -> tuple[list[str], list[RuleReport]]:
+  """Checks the rewrites against the rules of a FAR.
+
+  Args:
+    far_path: Path of the FAR, relative to the runfiles directory or absolute.
+    rewrites: Rewrites to be checked.
+    token_type: Token type of the rules: `byte` or `utf8`.
+    mode: Rewrite mode; see `CheckRewrite`.
+    num_workers: Number of the worker processes; by default, as given by
+      `parallel.NumWorkers`.
+    block_size: Number of the rewrites sent to a worker at once.
+
+  Returns:
+    The descriptions of the failures, in the order of the rewrites, and the
+    reports of the lists of rules, in the order of their first rewrites.
+
+  Raises:
+    ValueError: If the mode is unknown.
+  """
+  if mode not in MODES:
+    raise ValueError(f'Unknown mode: {mode}')
+  if num_workers is None:
+    num_workers = parallel.NumWorkers(-(-len(rewrites) // block_size))
+  counts = collections.Counter(rewrite.rules for rewrite in rewrites)
+  failures = []
+  stats = {rules: [0, 0.0, 0.0] for rules in counts}
+  for result in parallel.OrderedMap(
+      _CheckBlock, _Tasks(rewrites, block_size), num_workers, _InitWorker,
+      (far_path, token_type, mode)):
+    failures += result.failures
+    stats[result.rules][0] += len(result.failures)
+    stats[result.rules][1] += result.load_seconds
+    stats[result.rules][2] += result.check_seconds
+  reports = [
+      RuleReport(', '.join(rules), counts[rules], *stats[rules])
+      for rules in counts
+  ]
+  return [failure for _, failure in sorted(failures)], reports
+
+
+_FAR_PATH = flags.DEFINE_string(
+    'far_path', None, 'Path of FAR to read rules from.')
+_TEXTPROTO_PATH = flags.DEFINE_list(
+    'textproto_path', None, 'Rewrites textproto paths.')
+_TOKEN_TYPE = flags.DEFINE_enum(
+    'token_type', 'byte', ['byte', 'utf8'], 'Token type.')
+_MODE_FLAG = flags.DEFINE_enum(
+    'mode', 'exact', MODES, 'Rewrite mode; see `CheckRewrite`.')
+_NUM_WORKERS = flags.DEFINE_integer(
+    'num_workers', None,
+    'Number of the worker processes; by default, the value of the '
+    'NISABA_NUM_WORKERS environment variable, or else the number of cores, at '
+    'most four under Bazel.')
+_BLOCK_SIZE = flags.DEFINE_integer(
+    'block_size', 64, 'Number of the rewrites sent to a worker at once.')
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  rewrites = ShardFromEnv(ReadRewrites(_TEXTPROTO_PATH.value))
+  start = time.perf_counter()
+  failures, reports = RunRewrites(
+      _FAR_PATH.value, rewrites, _TOKEN_TYPE.value, _MODE_FLAG.value,
+      _NUM_WORKERS.value, _BLOCK_SIZE.value)
+  seconds = time.perf_counter() - start
+  print(benchmark.FormatTable(
+      RuleReport._fields + ('check_us',),
+      (report + (report.check_seconds / report.rewrites * 1e6,)
+       for report in reports)))
+  print(f'\n{len(rewrites)} rewrites checked in {seconds:.2f} s, '
+        f'{len(failures)} failed.')
+  if failures:
+    print('\n\n'.join(failures), file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+  # The flags are only required by the binary, so that the tests importing
+  # this module can run with their own flags.
+  flags.mark_flags_as_required(['far_path', 'textproto_path'])
+  app.run(main)
@@ -0,0 +1,180 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.scripts.utils.textproto_runner."""
+
+import os
+import pathlib
+import tempfile
+from unittest import mock
+
+from absl.testing import absltest
+import pynini
+from nisaba.scripts.utils import cascade
+from nisaba.scripts.utils import textproto_runner
+
+_TEXTPROTO = """
+rewrite {
+  rule: "AB"
+  input: "aa"
+  output: "bb"
+}
+rewrite {
+  rule: "AB"
+  rule: "BC"
+  input: "ab"
+  output: "cc"
+}
+rewrite {
+  rule: "OPTIONAL"
+  input: "a"
+  output: "a"
+  output: "b"
+}
+rewrite {
+  rule: "AB"
+  input: "c"
+}
+"""
+
+
+class TextprotoRunnerTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    self._dir = pathlib.Path(temp_dir.name)
+    self._far_path = self._dir / 'test.far'
+    sigma = pynini.union('a', 'b', 'c').star
+    fsts = {
+        'AB': pynini.cdrewrite(pynini.cross('a', 'b'), '', '',
+                               pynini.union('a', 'b').star),
+        'BC': pynini.cdrewrite(pynini.cross('b', 'c'), '', '', sigma),
+        # Rewrites `a` as itself or, at a higher cost, as `b`.
+        'OPTIONAL': pynini.union('a', pynini.cross('a', 'b') + pynini.accep(
+            '', weight=1)),
+        'TIE': pynini.union('a', pynini.cross('a', 'b')),
+    }
+    # The cascade of AB and BC, exported by components.
+    cascade.Export(fsts, 'AB_BC', [fsts['AB'], fsts['BC']])
+    # The rules of the archive are written in the order of their names.
+    with pynini.Far(os.fspath(self._far_path), 'w') as far:
+      for name, fst in sorted(fsts.items()):
+        far[name] = fst.optimize()
+    self._textproto_path = self._dir / 'test.textproto'
+    self._textproto_path.write_text(_TEXTPROTO, encoding='utf8')
+    self._rewrites = textproto_runner.ReadRewrites([self._textproto_path])
+
+  def _Run(self, rewrites, mode, **kwargs):
+    return textproto_runner.RunRewrites(
+        self._far_path, rewrites, mode=mode, **kwargs)
+
+  def test_read_rewrites(self):
+    self.assertEqual([0, 1, 2, 3], [r.index for r in self._rewrites])
+    self.assertEqual(('AB', 'BC'), self._rewrites[1].rules)
+    self.assertEqual(('a', 'b'), self._rewrites[2].outputs)
+    self.assertEqual((), self._rewrites[3].outputs)
+
+  def test_exact(self):
+    failures, reports = self._Run(self._rewrites, 'exact', num_workers=1)
+    self.assertEmpty(failures)
+    self.assertEqual([('AB', 2, 0), ('AB, BC', 1, 0), ('OPTIONAL', 1, 0)],
+                     [report[:3] for report in reports])
+
+  def test_subset(self):
+    rewrites = [self._rewrites[2]._replace(outputs=('b',))]
+    self.assertEmpty(self._Run(rewrites, 'subset', num_workers=1)[0])
+    failures, _ = self._Run(rewrites, 'exact', num_workers=1)
+    self.assertLen(failures, 1)
+    self.assertIn('Actual output: a, b', failures[0])
+
+  def test_top(self):
+    rewrites = [self._rewrites[2]._replace(outputs=('a',))]
+    self.assertEmpty(self._Run(rewrites, 'top', num_workers=1)[0])
+    self.assertEmpty(self._Run(rewrites, 'one_top', num_workers=1)[0])
+    failures, _ = self._Run(self._rewrites[2:3], 'top', num_workers=1)
+    self.assertIn('Expected a single output', failures[0])
+
+  def test_one_top_ties(self):
+    rewrites = [textproto_runner.Rewrite(0, ('TIE',), 'a', ('a',))]
+    failures, _ = self._Run(rewrites, 'one_top', num_workers=1)
+    self.assertIn('Several top outputs: a, b', failures[0])
+
+  def test_expected_failure(self):
+    rewrites = [self._rewrites[0]._replace(outputs=())]
+    failures, _ = self._Run(rewrites, 'exact', num_workers=1)
+    self.assertIn('Expected a rewrite failure; actual output: bb', failures[0])
+
+  def test_cascade_export(self):
+    rewrites = [self._rewrites[1]._replace(rules=('AB_BC',))]
+    self.assertEmpty(self._Run(rewrites, 'exact', num_workers=1)[0])
+
+  def test_missing_rule(self):
+    rewrites = [self._rewrites[0]._replace(rules=('MISSING',))]
+    failures, reports = self._Run(rewrites, 'exact', num_workers=1)
+    self.assertIn('Rule not found in the FAR: MISSING', failures[0])
+    self.assertEqual(1, reports[0].failures)
+
+  def test_missing_far(self):
+    for num_workers in (1, 2):
+      with self.subTest(num_workers=num_workers):
+        with self.assertRaises(OSError):
+          textproto_runner.RunRewrites(
+              self._dir / 'missing.far', self._rewrites, mode='exact',
+              num_workers=num_workers)
+
+  def test_unknown_mode(self):
+    with self.assertRaises(ValueError):
+      self._Run(self._rewrites, 'all')
+
+  def test_workers(self):
+    rewrites = [
+        rewrite._replace(index=index)
+        for index, rewrite in enumerate(self._rewrites * 10)
+    ]
+    rewrites[5] = rewrites[5]._replace(outputs=('b',))
+    failures, reports = self._Run(
+        rewrites, 'exact', num_workers=2, block_size=3)
+    self.assertEqual(
+        self._Run(rewrites, 'exact', num_workers=1, block_size=3)[0],
+        failures)
+    self.assertLen(failures, 1)
+    self.assertIn('Input: ab', failures[0])
+    self.assertEqual([20, 10, 10], [report.rewrites for report in reports])
+
+  def test_shard(self):
+    shards = [textproto_runner.Shard(self._rewrites, 3, index)
+              for index in range(3)]
+    self.assertEqual([[0, 3], [1], [2]],
+                     [[r.index for r in shard] for shard in shards])
+    with self.assertRaises(ValueError):
+      textproto_runner.Shard(self._rewrites, 3, 3)
+
+  def test_shard_from_env(self):
+    status_file = self._dir / 'shard_status'
+    with mock.patch.dict(os.environ, {
+        'TEST_TOTAL_SHARDS': '2',
+        'TEST_SHARD_INDEX': '1',
+        'TEST_SHARD_STATUS_FILE': os.fspath(status_file),
+    }):
+      shard = textproto_runner.ShardFromEnv(self._rewrites)
+    self.assertEqual([1, 3], [rewrite.index for rewrite in shard])
+    self.assertTrue(status_file.exists())
+    with mock.patch.dict(os.environ, clear=True):
+      self.assertLen(textproto_runner.ShardFromEnv(self._rewrites), 4)
+
+
+if __name__ == '__main__':
+  absltest.main()
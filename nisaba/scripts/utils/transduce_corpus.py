@@ -0,0 +1,94 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Transduces a corpus by a cascade of FAR rules over a pool of processes.
+
+Each worker process loads the rules once, and the lines are transduced in
+blocks and written in their input order.
+
+```sh
+bazel-bin/nisaba/scripts/utils/transduce_corpus \
+  --rule=nisaba/scripts/brahmic/nfc.far:BRAHMIC \
+  --rule=nisaba/scripts/brahmic/iso.far:FROM_BRAHMIC \
+  --policy=passthrough < input.txt > output.txt
+```
+"""
+
+from collections.abc import Sequence
+import time
+
+from absl import app
+from absl import flags
+from absl import logging
+from nisaba.scripts.utils import far_pool
+from nisaba.scripts.utils import normalize_stream
+
+_RULES = flags.DEFINE_multi_string(
+    'rule', None,
+    'Rule of the cascade as `FAR_PATH:RULE_NAME`, repeated in the order of '
+    'application.', required=True)
+_INPUT = flags.DEFINE_string(
+    'input', '-', 'Input text file, or `-` for the standard input.')
+_OUTPUT = flags.DEFINE_string(
+    'output', '-', 'Output text file, or `-` for the standard output.')
+_POLICY = flags.DEFINE_enum(
+    'policy', 'reject', normalize_stream.POLICIES,
+    'Handling of the lines which cannot be transduced: fail on the first one, '
+    'write an empty line, or write the input line as it is.')
+_TOKEN_TYPE = flags.DEFINE_enum('token_type', 'byte', ['byte', 'utf8'],
+                                'Token type of the rules.')
+_NUM_WORKERS = flags.DEFINE_integer(
+    'num_workers', None, 'Number of worker processes; all the cores if unset.')
+_BLOCK_SIZE = flags.DEFINE_integer(
+    'block_size', 1000, 'Number of lines sent to a worker at once.')
+_PRELOAD = flags.DEFINE_boolean(
+    'preload', True,
+    'Load the rules before forking the workers, which then share the FSTs '
+    'instead of each loading its own copy.')
+_SEQUENTIAL = flags.DEFINE_boolean(
+    'sequential', False,
+    'Apply the rules by a left-to-right walk where possible, instead of by '
+    'composition.')
+
+
+def _ParseRule(rule: str) -> far_pool.Rule:
+  far_path, sep, rule_name = rule.rpartition(':')
+  if not sep or not far_path or not rule_name:
+    raise app.UsageError(f'Expected FAR_PATH:RULE_NAME, got: {rule}')
+  return far_path, rule_name
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  rules = [_ParseRule(rule) for rule in _RULES.value]
+  num_lines = 0
+  start = time.perf_counter()
+  with normalize_stream.OpenText(
+      _INPUT.value, 'r') as input_file, normalize_stream.OpenText(
+          _OUTPUT.value, 'w') as output_file:
+    for line in far_pool.TransduceLines(
+        rules, (line.rstrip('\n') for line in input_file), _POLICY.value,
+        _TOKEN_TYPE.value, _NUM_WORKERS.value, _BLOCK_SIZE.value,
+        _PRELOAD.value, _SEQUENTIAL.value):
+      output_file.write(line)
+      output_file.write('\n')
+      num_lines += 1
+  seconds = time.perf_counter() - start
+  logging.info('Transduced %d lines in %.2fs: %.0f lines/sec.', num_lines,
+               seconds, num_lines / seconds if seconds else float('inf'))
+
+
+if __name__ == '__main__':
+  app.run(main)
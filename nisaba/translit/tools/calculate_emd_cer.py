@@ -14,38 +14,84 @@
 
 # -*- coding: utf-8 -*-
 r"""Calculate Earth movers distance.
+
+The inputs are either the json lines of the pairwise edits, or the TSV files
+of the k-best references and system outputs, whose distances are computed
+here.
+
+The json lines or examples are streamed in blocks, so that the memory does not
+grow with the size of the input, and the blocks can be scored by a pool of
+worker processes. The scores are printed in the order of the lines.
 """
 
 import io
 import json
 import re
+import sys
 
 from absl import app
 from absl import flags
 
 import numpy as np
 import pyemd
+from nisaba.scripts.utils import parallel
 from nisaba.translit.tools import emd_cer
 
 FLAGS = flags.FLAGS
 flags.DEFINE_string('json_path', '', 'Input file')
+flags.DEFINE_string('reference_tsv', '',
+                    'TSV file of the k-best references, used instead of '
+                    '--json_path with --test_tsv.')
+flags.DEFINE_string('test_tsv', '', 'TSV file of the k-best system outputs.')
+flags.DEFINE_integer('num_workers', 1,
+                     'Number of worker processes scoring the inputs; all the '
+                     'cores if 0.')
+flags.DEFINE_integer('block_size', 256,
+                     'Number of inputs sent to a worker process at once.')
 
-def main(unused_argv):
-  parsed_json = []
+# Returns the edits and reference lengths of a block of json lines.
+def score_lines(lines):
+  return emd_cer.emd_errors_and_lengths([json.loads(line) for line in lines])
+
+# Returns the edits and reference lengths of a block of hyp and ref k-best
+# lists.
+def score_examples(examples):
+  return emd_cer.kbest_errors_and_lengths(examples)
+
+# Yields the non-empty json lines of the file.
+def read_json_lines(json_path):
+  with io.open(json_path, mode='r', encoding='UTF-8',
+               closefd=True) as data_json:
+    for line in data_json:
+      if line.strip():
+        yield line
+
+# Prints the edits and reference length of each input, in order, and their
+# totals. The blocks of inputs are scored by score_fn in num_workers processes.
+def print_scores(inputs, score_fn, num_workers, block_size, out=sys.stdout):
   TotEdits = 0
   TotLen = 0
-  with io.open(FLAGS.json_path, mode='r',
-               encoding='UTF-8', closefd=True) as data_json:
-    parsed_json.extend([json.loads(line) for line in data_json.readlines()])
-    for jline in parsed_json:
-      [Edits, RefLen] = emd_cer.emd_error_and_length(jline)
+  blocks = parallel.ReadBlocks(inputs, block_size)
+  for scores in parallel.OrderedMap(score_fn, blocks, num_workers):
+    for [Edits, RefLen] in scores:
       # We don't separate subst/ins/del, hence the two zero columns in output.
-      print(str(RefLen) + '\t' + str(Edits) + '\t0\t0\t' + str(Edits/RefLen))
+      print(str(RefLen) + '\t' + str(Edits) + '\t0\t0\t' + str(Edits/RefLen),
+            file=out)
       TotEdits += Edits
       TotLen += RefLen
-  print('Total edits:\t' + str(TotEdits))
-  print('Total reference length:\t' + str(TotLen))
-  print('Overall CER:\t' + str(TotEdits/TotLen))
+  print('Total edits:\t' + str(TotEdits), file=out)
+  print('Total reference length:\t' + str(TotLen), file=out)
+  print('Overall CER:\t' + str(TotEdits/TotLen), file=out)
+
+def main(unused_argv):
+  if FLAGS.reference_tsv:
+    inputs = emd_cer.read_kbest_examples(FLAGS.reference_tsv, FLAGS.test_tsv)
+    score_fn = score_examples
+  else:
+    inputs = read_json_lines(FLAGS.json_path)
+    score_fn = score_lines
+  num_workers = FLAGS.num_workers or parallel.DefaultNumWorkers()
+  print_scores(inputs, score_fn, num_workers, FLAGS.block_size)
 
 if __name__ == '__main__':
   app.run(main)
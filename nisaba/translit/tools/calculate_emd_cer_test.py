@@ -0,0 +1,66 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.translit.tools.calculate_emd_cer."""
+
+from nisaba.translit.tools import calculate_emd_cer
+from absl.testing import absltest
+import io
+import json
+import os
+import tempfile
+
+# One best hyp with 1 edit to a ref of length 4.
+JLINE1 = {'p1': [1.0, 0], 'p2': [0, 1.0], 'D': [[0, 1], [1, 0]], 'L': [0, 4]}
+
+# Hyps with 1 and 2 edits to a ref of length 5: 1.6 edits on average.
+JLINE2 = {'p1': [0.4, 0.6, 0], 'p2': [0, 0, 1.0],
+          'D': [[0, 0, 1], [0, 0, 2], [1, 2, 0]], 'L': [0, 0, 5]}
+
+class CalculateEmdCerTest(absltest.TestCase):
+
+  # Should print the scores of the json lines in their order, skipping the
+  # blank lines, and their totals, with any number of workers.
+  def testPrintScores(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    json_path = os.path.join(temp_dir.name, 'emd.json')
+    with open(json_path, 'w', encoding='utf8') as f:
+      for jline in (JLINE1, JLINE2, JLINE1, JLINE2, JLINE2):
+        f.write(json.dumps(jline) + '\n\n')
+    for num_workers in (1, 2):
+      out = io.StringIO()
+      calculate_emd_cer.print_scores(
+          calculate_emd_cer.read_json_lines(json_path),
+          calculate_emd_cer.score_lines, num_workers, 2, out)
+      lines = out.getvalue().splitlines()
+      self.assertLen(lines, 8)
+      scores = [[float(field) for field in line.split('\t')[:2]]
+                for line in lines[:5]]
+      for [reflen, edits], [exp_reflen, exp_edits] in zip(
+          scores, [[4, 1], [5, 1.6], [4, 1], [5, 1.6], [5, 1.6]]):
+        self.assertAlmostEqual(reflen, exp_reflen)
+        self.assertAlmostEqual(edits, exp_edits)
+      [name, value] = lines[5].split('\t')
+      self.assertEqual(name, 'Total edits:')
+      self.assertAlmostEqual(float(value), 6.8)
+      [name, value] = lines[6].split('\t')
+      self.assertEqual(name, 'Total reference length:')
+      self.assertAlmostEqual(float(value), 23.0)
+      [name, value] = lines[7].split('\t')
+      self.assertEqual(name, 'Overall CER:')
+      self.assertAlmostEqual(float(value), 6.8 / 23)
+
+if __name__ == '__main__':
+  absltest.main()
@@ -12,10 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Calculates earth mover's distance from json line."""
+"""Calculates earth mover's distance from json line or k-best lists.
+
+The json lines hold the precomputed distributions, distance matrix and lengths
+of the hypotheses and references. The k-best lists are the strings with their
+probabilities, whose distances are computed here: the strings are split into
+characters, after normalizing their whitespace, and the Levenshtein distances
+of all the hypotheses to a reference are computed at once by the bit-parallel
+algorithm of Myers (1999), as formulated by Hyyro (2001).
+
+The EMD of the hypotheses and references is solved as a transportation problem
+over their bipartite graph by the `transportation` module, for batches of
+examples at once.
+"""
+
+import itertools
+import math
 
 import numpy as np
 import pyemd
+from nisaba.translit.tools import transportation
 
 # Returns the edits, flow, and length from EMD.
 def earth_movers_distance(jline):
@@ -26,10 +42,178 @@ def earth_movers_distance(jline):
   R = pyemd.emd_with_flow(p1, p2, D)
   return [R[0], R[1], L]
 
-# Returns the edits and reference length from EMD.
-def emd_error_and_length(jline):
+# Largest difference of the total masses of the hyps and refs of a json line
+# which is solved as a balanced transportation problem.
+_MASS_TOLERANCE = 1e-12
+
+# Returns the edits and reference length from EMD with pyemd, which moves as
+# much mass as the lighter side has and charges the rest at the largest
+# distance, so that the reference length depends on the flows.
+def _pyemd_error_and_length(jline):
   [Edits, Flows, Len] = earth_movers_distance(jline)
   RefLen = 0
   for flow in Flows:
     RefLen += np.dot(flow, Len)
   return [Edits, RefLen]
+
+# Returns the transportation problem of the hyps and refs of a json line, which
+# are the nodes with some mass in p1 and p2 respectively, and its reference
+# length, or None if the masses are not balanced, as the json step rounds them.
+def _json_problem(jline):
+  p1 = np.array(jline['p1'], dtype=np.float64)
+  p2 = np.array(jline['p2'], dtype=np.float64)
+  if abs(p1.sum() - p2.sum()) > _MASS_TOLERANCE:
+    return None
+  D = np.array(jline['D'], dtype=np.float64)
+  L = np.array(jline['L'], dtype=np.float64)
+  Hyps = p1 > 0
+  Refs = p2 > 0
+  return (p1[Hyps], p2[Refs], D[np.ix_(Hyps, Refs)]), np.dot(p2[Refs], L[Refs])
+
+# Returns the edits and reference lengths from EMD of a batch of problems and
+# their reference lengths. All the probability of the refs flows from the hyps,
+# so the reference length is independent of the flows.
+def _errors_and_lengths(problems_and_lengths):
+  Problems = [problem for problem, _ in problems_and_lengths]
+  Edits = transportation.transport_costs(Problems)
+  return [[float(edits), float(RefLen)]
+          for edits, (_, RefLen) in zip(Edits, problems_and_lengths)]
+
+# Returns the edits and reference lengths from EMD of a batch of json lines.
+# The lines with balanced masses are solved in one batch, and the others by
+# pyemd, as their scores depend on its handling of the extra mass.
+def emd_errors_and_lengths(jlines):
+  Problems = [_json_problem(jline) for jline in jlines]
+  Balanced = [problem for problem in Problems if problem is not None]
+  Scores = iter(_errors_and_lengths(Balanced))
+  return [next(Scores) if problem is not None
+          else _pyemd_error_and_length(jline)
+          for jline, problem in zip(jlines, Problems)]
+
+# Returns the edits and reference length from EMD.
+def emd_error_and_length(jline):
+  return emd_errors_and_lengths([jline])[0]
+
+# Returns the characters of the string, with its whitespace normalized to single
+# spaces, as tokenized for the character error rate.
+def split_chars(string):
+  return list(' '.join(string.split()))
+
+# Returns the Levenshtein distances of the token lists in hyps to the ref list.
+# Bit i of the vectors is the difference of the distances of the ref prefixes
+# of lengths i + 1 and i to the hyp prefix, so that each hyp token updates the
+# column of the dynamic programming matrix in a few bitwise operations, for all
+# hyps at once. Refs longer than 64 tokens use Python integers as bit vectors.
+def levenshtein_distances(hyps, ref):
+  Lens = np.array([len(hyp) for hyp in hyps], dtype=np.int64)
+  m = len(ref)
+  if not m or not hyps:
+    return Lens
+  dtype = np.uint64 if m <= 64 else object
+  const = lambda value: np.asarray(value, dtype=dtype)
+  # Positions of each token in the ref.
+  Peq = {}
+  for i, token in enumerate(ref):
+    Peq[token] = Peq.get(token, 0) | 1 << i
+  Eqs = np.zeros((len(hyps), Lens.max()), dtype=dtype)
+  for k, hyp in enumerate(hyps):
+    Eqs[k, :len(hyp)] = [Peq.get(token, 0) for token in hyp]
+  Mask = const((1 << m) - 1)
+  Top = const(1 << (m - 1))
+  One = const(1)
+  Pv = np.full(len(hyps), Mask, dtype=dtype)
+  Mv = np.zeros(len(hyps), dtype=dtype)
+  Dists = np.full(len(hyps), m, dtype=np.int64)
+  for j in range(Eqs.shape[1]):
+    Eq = Eqs[:, j]
+    Xv = Eq | Mv
+    Xh = ((((Eq & Pv) + Pv) & Mask) ^ Pv) | Eq
+    Ph = Mv | (~(Xh | Pv) & Mask)
+    Mh = Pv & Xh
+    # The distances of the hyps which are shorter than j are final.
+    Active = j < Lens
+    Dists += (Active & ((Ph & Top) != 0).astype(bool)).astype(np.int64)
+    Dists -= (Active & ((Mh & Top) != 0).astype(bool)).astype(np.int64)
+    Ph = ((Ph << One) | One) & Mask
+    Mh = (Mh << One) & Mask
+    Pv = Mh | (~(Xv | Ph) & Mask)
+    Mv = Ph & Xv
+  return Dists
+
+# Returns the matrix of the character Levenshtein distances of the hyp strings
+# (rows) to the ref strings (columns).
+def levenshtein_matrix(hyps, refs):
+  HypChars = [split_chars(hyp) for hyp in hyps]
+  D = np.zeros((len(hyps), len(refs)), dtype=np.int64)
+  for j, ref in enumerate(refs):
+    D[:, j] = levenshtein_distances(HypChars, split_chars(ref))
+  return D
+
+# Returns the strings and normalized probabilities of a k-best list of
+# (string, probability) pairs, which should have some probability.
+def _normalize_kbest(kbest):
+  Strings = [string for string, _ in kbest]
+  Probs = np.array([prob for _, prob in kbest], dtype=np.float64)
+  Total = Probs.sum()
+  if not Total > 0:
+    raise ValueError(f'K-best list without probability: {Strings}')
+  return Strings, Probs / Total
+
+# Returns the transportation problem of the hyp and ref k-best lists, and its
+# reference length.
+def _kbest_problem(hyps, refs):
+  Hyps, P1 = _normalize_kbest(hyps)
+  Refs, P2 = _normalize_kbest(refs)
+  RefLen = np.dot(P2, [len(split_chars(ref)) for ref in Refs])
+  return (P1, P2, levenshtein_matrix(Hyps, Refs)), RefLen
+
+# Returns the edits and reference lengths from EMD of a batch of examples, which
+# are pairs of hyp and ref k-best lists of (string, probability) pairs, e.g.
+# the items of dicts. The probabilities of each list are normalized to sum to
+# one.
+def kbest_errors_and_lengths(examples):
+  return _errors_and_lengths(
+      [_kbest_problem(hyps, refs) for hyps, refs in examples])
+
+# Returns the edits and reference length from EMD of the hyp and ref k-best
+# lists; see kbest_errors_and_lengths.
+def kbest_error_and_length(hyps, refs):
+  return kbest_errors_and_lengths([(hyps, refs)])[0]
+
+# Yields the example indices and k-best lists of (string, probability) pairs of
+# a TSV file of k-best lists, whose lines are the example index, the string and
+# an optional value: a count for the references (1 by default), and a -log
+# probability for the hypotheses (0 by default). The examples should be sorted
+# by their indices, as read_kbest_examples merges the files.
+def read_kbest_tsv(path, is_reference):
+  with open(path, encoding='utf8') as f:
+    Fields = (line.rstrip('\n').split('\t') for line in f if line.strip())
+    Previous = None
+    for Index, Items in itertools.groupby(Fields, key=lambda row: int(row[0])):
+      if Previous is not None and Index <= Previous:
+        raise ValueError(
+            f'Example {Index} follows example {Previous}, the examples are '
+            f'not sorted by their indices: {path}')
+      Previous = Index
+      Kbest = []
+      for row in Items:
+        if len(row) > 2:
+          Value = float(row[2])
+        else:
+          Value = 1.0 if is_reference else 0.0
+        Kbest.append((row[1], Value if is_reference else math.exp(-Value)))
+      yield Index, Kbest
+
+# Yields the hyp and ref k-best lists of the examples with references, from
+# the TSV files of the references and of the system outputs. The examples
+# without hypotheses have the empty string as their hypothesis.
+def read_kbest_examples(reference_tsv, test_tsv):
+  Tests = read_kbest_tsv(test_tsv, is_reference=False)
+  Test = next(Tests, None)
+  for Index, Refs in read_kbest_tsv(reference_tsv, is_reference=True):
+    while Test is not None and Test[0] < Index:
+      Test = next(Tests, None)
+    if Test is not None and Test[0] == Index:
+      yield Test[1], Refs
+    else:
+      yield [('', 1.0)], Refs
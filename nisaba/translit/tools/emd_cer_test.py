@@ -17,6 +17,8 @@
 from nisaba.translit.tools import emd_cer
 from absl.testing import absltest
 import json
+import os
+import tempfile
 
 # Precision tolerance for floating-point value tests.
 ERROR_TOLERANCE = 1.0e-6
@@ -155,5 +157,93 @@ class EmdTest(absltest.TestCase):
     self.assertNear(edits, 1.437)
     self.assertNear(reflen, 2.0)
 
+  # Should score the json lines with unbalanced masses as pyemd does, as their
+  # masses are rounded: only the 0.9 of the hyps flows, 0.6 to 'sieberling'
+  # and 0.1 + 0.2 to 'zeeberlin' (0.6 * 2 + 0.1 * 3 + 0.2 * 4 = 2.3 edits), and
+  # the extra 0.1 of the refs costs the largest distance, 4. The reference
+  # length only counts the moved mass: RefLen = 0.7 * 10 + 0.2 * 9 = 8.8.
+  def testCalcEditsUnbalanced(self):
+    jline = {'p1': [0.6, 0.3, 0, 0], 'p2': [0, 0, 0.7, 0.3],
+             'D': [[0, 0, 2, 3], [0, 0, 3, 4], [2, 3, 0, 0], [3, 4, 0, 0]],
+             'L': [0, 0, 10, 9]}
+    [edits, reflen] = emd_cer.emd_error_and_length(jline)
+    self.assertNear(edits, 2.7)
+    self.assertNear(reflen, 8.8)
+    balanced = dict(jline, p1=[0.6, 0.4, 0, 0])
+    scores = emd_cer.emd_errors_and_lengths([jline, balanced, jline])
+    self.assertNear(scores[1][0], 2.7)
+    self.assertNear(scores[1][1], 9.7)
+    self.assertEqual(scores[0], scores[2])
+    self.assertNear(scores[2][1], 8.8)
+
+  # Should match the distances of the examples above, for refs shorter and
+  # longer than 64 characters.
+  def testLevenshteinMatrix(self):
+    hyps = ['seeverling', 'siefelin', '', 'sie  ber ling']
+    refs = ['sieberling', 'zeeberlin', '']
+    self.assertEqual(emd_cer.levenshtein_matrix(hyps, refs).tolist(),
+                     [[2, 3, 10], [3, 4, 8], [10, 9, 0], [2, 5, 12]])
+    long_ref = 'ab' * 40
+    long_hyps = ['ab' * 39 + 'ba', 'b' * 80, 'ab' * 41]
+    self.assertEqual(
+        emd_cer.levenshtein_matrix(long_hyps, [long_ref]).tolist(),
+        [[2], [40], [2]])
+
+  # Should compute the same edits and reference length as the json lines.
+  def testKbestErrorAndLength(self):
+    [edits, reflen] = emd_cer.kbest_error_and_length(
+        [('seeverling', 0.6), ('siefelin', 0.4)],
+        [('sieberling', 0.7), ('zeeberlin', 0.3)])
+    self.assertNear(edits, 2.7)
+    self.assertNear(reflen, 9.7)
+    hyps = {'asa': 0.41, 'asha': 0.228, 'osh': 0.106, 'ash': 0.08, 'os': 0.052,
+            'as': 0.045, 'aso': 0.043, 'oso': 0.036}
+    # The probabilities are normalized.
+    [edits, reflen] = emd_cer.kbest_error_and_length(
+        hyps.items(), [('as', 2), ('os', 2)])
+    self.assertNear(edits, 1.437)
+    self.assertNear(reflen, 2.0)
+
+  # Should read the k-best lists of the examples with references, as the
+  # inputs of calculate_error_rate.
+  def testReadKbestExamples(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    reference_tsv = os.path.join(temp_dir.name, 'ref.tsv')
+    test_tsv = os.path.join(temp_dir.name, 'test.tsv')
+    with open(reference_tsv, 'w', encoding='utf8') as f:
+      f.write('0\tsieberling\t7\n0\tzeeberlin\t3\n2\tas\n')
+    with open(test_tsv, 'w', encoding='utf8') as f:
+      f.write('0\tseeverling\t1.0\n1\tos\n2\tasa\t0.5\n2\tas\t1.5\n')
+    examples = list(emd_cer.read_kbest_examples(reference_tsv, test_tsv))
+    self.assertLen(examples, 2)
+    [hyps, refs] = examples[0]
+    self.assertEqual(refs, [('sieberling', 7.0), ('zeeberlin', 3.0)])
+    self.assertLen(hyps, 1)
+    self.assertNear(hyps[0][1], 0.36787944)
+    [hyps, refs] = examples[1]
+    self.assertEqual(refs, [('as', 1.0)])
+    self.assertEqual([hyp for hyp, _ in hyps], ['asa', 'as'])
+    # Examples without hypotheses have the empty string as hypothesis.
+    with open(test_tsv, 'w', encoding='utf8') as f:
+      f.write('2\tasa\n')
+    examples = list(emd_cer.read_kbest_examples(reference_tsv, test_tsv))
+    self.assertEqual(examples[0][0], [('', 1.0)])
+    # The examples should be sorted by their indices.
+    with open(test_tsv, 'w', encoding='utf8') as f:
+      f.write('1\tos\n0\tseeverling\n')
+    with self.assertRaisesRegex(ValueError, 'not sorted'):
+      list(emd_cer.read_kbest_examples(reference_tsv, test_tsv))
+
+  # The reference length counts the characters with normalized whitespace, and
+  # a k-best list without probability is an error.
+  def testKbestErrorAndLengthEdgeCases(self):
+    [edits, reflen] = emd_cer.kbest_error_and_length(
+        [('a b', 1.0)], [('a  b ', 1.0)])
+    self.assertNear(edits, 0.0)
+    self.assertNear(reflen, 3.0)
+    with self.assertRaisesRegex(ValueError, 'without probability'):
+      emd_cer.kbest_error_and_length([('a', 0.0)], [('a', 1.0)])
+
 if __name__ == '__main__':
   absltest.main()
@@ -0,0 +1,213 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Solver of small transportation problems, for the EMD of k-best lists.
+
+The EMD of a hypothesis and a reference k-best list is the minimum cost of
+moving the probabilities of the n hypotheses onto those of the m references,
+where moving a unit from hypothesis i to reference j costs their distance
+C[i, j]. Both distributions sum to one, so this is a balanced transportation
+problem over the n x m bipartite graph.
+
+These problems are tiny, so instead of the general EMD of a padded square
+problem, they are solved by shape:
+
+  * with a single hypothesis or reference, all the flows are fixed;
+  * with two hypotheses, the flow of the first one to each reference is
+    bounded by the reference probability, and the other hypothesis takes the
+    remainder, so the cheapest assignment fills the references in the order of
+    the cost differences of the two hypotheses, as a fractional knapsack; and
+    symmetrically with two references;
+  * the larger problems are solved as min-cost flows, by successive shortest
+    paths.
+
+The problems of the same shape are solved at once with NumPy.
+"""
+
+import collections
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+# Masses and flows below this are considered exhausted by the successive
+# shortest paths.
+_EPSILON = 1e-12
+
+Problem = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _single_costs(supplies: np.ndarray, demands: np.ndarray,
+                  costs: np.ndarray) -> np.ndarray:
+  """Returns the costs of the problems with a single supply node."""
+  del supplies  # All the flows are the demands.
+  return np.einsum('bj,bj->b', demands, costs[:, 0, :])
+
+
+def _pair_costs(supplies: np.ndarray, demands: np.ndarray,
+                costs: np.ndarray) -> np.ndarray:
+  """Returns the costs of the problems with two supply nodes.
+
+  The flow of the first supply node to demand node j is f[j] in [0, d[j]], and
+  the second one sends the rest d[j] - f[j]. The cost is that of sending
+  everything from the second node plus sum_j f[j] (C[0, j] - C[1, j]), which is
+  minimized by filling f in the increasing order of the cost differences up to
+  the first supply.
+
+  Args:
+    supplies: Supplies of the problems, of shape [batch, 2].
+    demands: Demands of the problems, of shape [batch, m].
+    costs: Costs of the problems, of shape [batch, 2, m].
+
+  Returns:
+    The minimum costs of the problems.
+  """
+  deltas = costs[:, 0, :] - costs[:, 1, :]
+  order = np.argsort(deltas, axis=1, kind='stable')
+  deltas = np.take_along_axis(deltas, order, axis=1)
+  bounds = np.take_along_axis(demands, order, axis=1)
+  filled = np.cumsum(bounds, axis=1) - bounds
+  flows = np.clip(supplies[:, :1] - filled, 0, bounds)
+  return (np.einsum('bj,bj->b', demands, costs[:, 1, :]) +
+          np.einsum('bj,bj->b', flows, deltas))
+
+
+def _min_cost_flows(supplies: np.ndarray, demands: np.ndarray,
+                    costs: np.ndarray) -> np.ndarray:
+  """Returns the costs of the problems, by successive shortest paths.
+
+  Each step sends as much as possible along a cheapest path from a supply node
+  with some supply left to a demand node with some demand left, in the residual
+  graph: the edges from the supply to the demand nodes, and the reverse edges
+  of their positive flows, with the opposite costs. The shortest paths are
+  found by the Bellman-Ford algorithm, as the reverse edges have negative
+  costs. Each step exhausts a supply, a demand or a flow. The steps of all the
+  problems are run at once.
+
+  Args:
+    supplies: Supplies of the problems, of shape [batch, n].
+    demands: Demands of the problems, of shape [batch, m].
+    costs: Costs of the problems, of shape [batch, n, m].
+
+  Returns:
+    The minimum costs of the problems.
+  """
+  batch, n, m = costs.shape
+  supplies = supplies.copy()
+  demands = demands.copy()
+  flows = np.zeros_like(costs)
+  problems = np.arange(batch)
+  while True:
+    active = (supplies.max(axis=1) > _EPSILON) & (
+        demands.max(axis=1) > _EPSILON)
+    if not active.any():
+      break
+    supply_dists = np.where(supplies > _EPSILON, 0.0, np.inf)
+    supply_preds = np.full((batch, n), -1)
+    demand_dists = np.full((batch, m), np.inf)
+    demand_preds = np.full((batch, m), -1)
+    # The distances are only updated on strict improvements, so that the
+    # predecessors of equal distances do not form cycles.
+    for _ in range(n + m):
+      candidates = supply_dists[:, :, None] + costs
+      preds = candidates.argmin(axis=1)
+      dists = np.take_along_axis(candidates, preds[:, None, :], axis=1)[:, 0]
+      improved = dists < demand_dists - _EPSILON
+      demand_dists = np.where(improved, dists, demand_dists)
+      demand_preds = np.where(improved, preds, demand_preds)
+      candidates = np.where(flows > _EPSILON,
+                            demand_dists[:, None, :] - costs, np.inf)
+      preds = candidates.argmin(axis=2)
+      dists = np.take_along_axis(candidates, preds[:, :, None], axis=2)[..., 0]
+      improved = dists < supply_dists - _EPSILON
+      if not improved.any():
+        break
+      supply_dists = np.where(improved, dists, supply_dists)
+      supply_preds = np.where(improved, preds, supply_preds)
+    sinks = np.where(demands > _EPSILON, demand_dists, np.inf).argmin(axis=1)
+    # The paths are traced back from the demand nodes: each demand node j is
+    # reached by the flow of supply node i, which is either reached from the
+    # source or by decreasing its flow to the next demand node of the path.
+    amounts = np.where(active, demands[problems, sinks], 0.0)
+    sources = np.zeros(batch, dtype=np.int64)
+    forward_edges = []
+    reverse_edges = []
+    tracing = active
+    j = sinks
+    while tracing.any():
+      i = np.where(tracing, demand_preds[problems, j], 0)
+      forward_edges.append((tracing, i, j))
+      next_j = supply_preds[problems, i]
+      ends = tracing & (next_j < 0)
+      sources = np.where(ends, i, sources)
+      amounts = np.where(ends, np.minimum(amounts, supplies[problems, i]),
+                         amounts)
+      tracing = tracing & (next_j >= 0)
+      j = np.where(tracing, next_j, 0)
+      amounts = np.where(tracing, np.minimum(amounts, flows[problems, i, j]),
+                         amounts)
+      reverse_edges.append((tracing, i, j))
+    for edges, sign in ((forward_edges, 1.0), (reverse_edges, -1.0)):
+      for mask, i, j in edges:
+        flows[problems[mask], i[mask], j[mask]] += sign * amounts[mask]
+    supplies[problems, sources] -= amounts
+    demands[problems, sinks] -= amounts
+  return np.einsum('bij,bij->b', flows, costs)
+
+
+def transport_costs(problems: Iterable[Problem]) -> np.ndarray:
+  """Returns the minimum costs of balanced transportation problems.
+
+  Args:
+    problems: Supplies of shape [n], demands of shape [m] and costs of shape
+      [n, m] of each problem. The supplies and demands should have the same
+      sums.
+
+  Returns:
+    The minimum costs of the problems, in their order.
+  """
+  problems = list(problems)
+  # Indices of the problems, by their shapes.
+  shapes = collections.defaultdict(list)
+  for index, (_, _, costs) in enumerate(problems):
+    shapes[np.shape(costs)].append(index)
+  results = np.zeros(len(problems))
+  for (n, m), indices in shapes.items():
+    if not n or not m:
+      continue
+    supplies, demands, costs = (
+        np.array([problems[index][k] for index in indices], dtype=np.float64)
+        for k in range(3))
+    if n == 1:
+      results[indices] = _single_costs(supplies, demands, costs)
+    elif m == 1:
+      results[indices] = _single_costs(
+          demands, supplies, costs.transpose(0, 2, 1))
+    elif n == 2:
+      results[indices] = _pair_costs(supplies, demands, costs)
+    elif m == 2:
+      results[indices] = _pair_costs(
+          demands, supplies, costs.transpose(0, 2, 1))
+    else:
+      results[indices] = _min_cost_flows(supplies, demands, costs)
+  return results
+
+
+def transport_cost(supplies: Sequence[float], demands: Sequence[float],
+                   costs: Sequence[Sequence[float]]) -> float:
+  """Returns the minimum cost of a transportation problem.
+
+  See `transport_costs`.
+  """
+  return float(transport_costs(
+      [(np.asarray(supplies), np.asarray(demands), np.asarray(costs))])[0])
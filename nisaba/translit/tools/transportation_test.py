@@ -0,0 +1,74 @@
+# Copyright 2026 Nisaba Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for nisaba.translit.tools.transportation."""
+
+from absl.testing import absltest
+import numpy as np
+import pyemd
+from nisaba.translit.tools import transportation
+
+
+def _PyemdCost(supplies, demands, costs):
+  n, m = costs.shape
+  distances = np.zeros((n + m, n + m))
+  distances[:n, n:] = costs
+  distances[n:, :n] = costs.T
+  return pyemd.emd(np.concatenate([supplies, np.zeros(m)]),
+                   np.concatenate([np.zeros(n), demands]), distances)
+
+
+class TransportationTest(absltest.TestCase):
+
+  def testSingleNode(self):
+    self.assertAlmostEqual(
+        transportation.transport_cost([1.0], [0.25, 0.75], [[4, 8]]), 7.0)
+    self.assertAlmostEqual(
+        transportation.transport_cost([0.25, 0.75], [1.0], [[4], [8]]), 7.0)
+
+  def testTwoNodes(self):
+    # The 0.6 of the first hyp flows to the first ref, leaving 0.1 of that ref
+    # for the second hyp; see emd_cer_test.
+    self.assertAlmostEqual(
+        transportation.transport_cost([0.6, 0.4], [0.7, 0.3],
+                                      [[2, 3], [3, 4]]), 2.7)
+    self.assertAlmostEqual(
+        transportation.transport_cost([0.4, 0.3, 0.2, 0.1], [0.6, 0.4],
+                                      [[1, 7], [6, 5], [3, 8], [9, 3]]), 2.8)
+
+  def testEmpty(self):
+    self.assertEqual(
+        transportation.transport_cost([], [1.0], np.zeros((0, 1))), 0.0)
+
+  def testAgreesWithPyemd(self):
+    rng = np.random.default_rng(0)
+    problems = []
+    for _ in range(200):
+      n, m = rng.integers(1, 7, size=2)
+      supplies = rng.random(n)
+      demands = rng.random(m)
+      # Some masses are zero, as for the hyps of the json lines.
+      supplies[rng.random(n) < 0.2] = 0
+      supplies[0] += 0.1
+      costs = rng.integers(0, 6, (n, m)).astype(np.float64)
+      problems.append(
+          (supplies / supplies.sum(), demands / demands.sum(), costs))
+    costs = transportation.transport_costs(problems)
+    self.assertLen(costs, len(problems))
+    for cost, problem in zip(costs, problems):
+      self.assertAlmostEqual(cost, _PyemdCost(*problem))
+
+
+if __name__ == '__main__':
+  absltest.main()